@@ -62,6 +62,7 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
         ('Study Streak', {
             'fields': (
                 'current_study_streak', 'longest_study_streak', 'last_study_date',
+                'time_zone',
             ),
             'classes': ('collapse',),
         }),
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-17 19:25
+
+import accounts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_remove_user_daily_reading_goal_minutes_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='time_zone',
+            field=models.CharField(default='UTC', help_text='IANA time zone (e.g. Europe/London). Study days start at local midnight.', max_length=63, validators=[accounts.models.validate_time_zone]),
+        ),
+    ]
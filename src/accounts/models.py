@@ -1,11 +1,23 @@
 import random
 import uuid
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 
+def validate_time_zone(value):
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(f'{value!r} is not a known time zone.')
+
+
 class UserManager(BaseUserManager):
     """Custom user manager — email as the unique identifier."""
 
@@ -31,6 +43,38 @@ class UserManager(BaseUserManager):
 
         return self.create_user(email, password, **extra_fields)
 
+    # ── Study streak ────────────────────────────────
+    def record_study_day(self, user_id, day):
+        """
+        Count `day` (the user's local date) in the study streak with one
+        conditional UPDATE: the streak continues from yesterday or restarts
+        at 1. Returns False when that day (or a later one) was already counted.
+        """
+        streak = models.Case(
+            models.When(
+                last_study_date=day - timedelta(days=1),
+                then=models.F('current_study_streak') + 1,
+            ),
+            default=models.Value(1),
+            output_field=models.PositiveIntegerField(),
+        )
+        return bool(
+            self.filter(pk=user_id)
+            .filter(models.Q(last_study_date__isnull=True) | models.Q(last_study_date__lt=day))
+            .update(
+                current_study_streak=streak,
+                longest_study_streak=Greatest('longest_study_streak', streak),
+                last_study_date=day,
+            )
+        )
+
+    def broken_streaks(self, time_zone, today):
+        """Users in `time_zone` whose streak ended before yesterday (their local `today`)."""
+        return self.filter(time_zone=time_zone, current_study_streak__gt=0).filter(
+            models.Q(last_study_date__isnull=True)
+            | models.Q(last_study_date__lt=today - timedelta(days=1))
+        )
+
 
 class User(AbstractBaseUser, PermissionsMixin):
     """
@@ -119,6 +163,10 @@ class User(AbstractBaseUser, PermissionsMixin):
         null=True, blank=True,
         help_text='Date of last study activity. Used to calculate streak continuity.'
     )
+    time_zone = models.CharField(
+        max_length=63, default='UTC', validators=[validate_time_zone],
+        help_text='IANA time zone (e.g. Europe/London). Study days start at local midnight.'
+    )
 
     # Django auth fields
     is_active = models.BooleanField(default=True)
@@ -148,6 +196,30 @@ class User(AbstractBaseUser, PermissionsMixin):
     def get_short_name(self):
         return self.first_name or self.email.split('@')[0]
 
+    # ── Local day boundary ──────────────────────────
+    @property
+    def tzinfo(self):
+        try:
+            return ZoneInfo(self.time_zone)
+        except (ZoneInfoNotFoundError, ValueError):
+            return timezone.get_default_timezone()
+
+    def local_date(self, value=None):
+        """The user's calendar date at `value` (default: now)."""
+        return timezone.localdate(value or timezone.now(), self.tzinfo)
+
+    def next_local_midnight(self, value=None):
+        """When the user's day after `value` (default: now) begins."""
+        day = self.local_date(value) + timedelta(days=1)
+        return datetime.combine(day, time.min, tzinfo=self.tzinfo)
+
+    @property
+    def active_study_streak(self):
+        """current_study_streak, or 0 once a day has been missed (before reset_broken_streaks runs)."""
+        if not self.last_study_date or self.last_study_date < self.local_date() - timedelta(days=1):
+            return 0
+        return self.current_study_streak
+
     @property
     def purchased_books_count(self):
         return self.book_access.count()
@@ -15,7 +15,7 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = [
             'id', 'email', 'first_name', 'last_name', 'profile_picture',
-            'role', 'theme', 'font_size',
+            'role', 'theme', 'font_size', 'time_zone',
             # Notification preferences
             'email_notifications', 'push_notifications',
             'weekly_reports', 'study_reminders',
@@ -112,7 +112,7 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         model = User
         fields = [
             'first_name', 'last_name', 'email', 'profile_picture',
-            'theme', 'font_size',
+            'theme', 'font_size', 'time_zone',
             # Notification preferences
             'email_notifications', 'push_notifications',
             'weekly_reports', 'study_reminders',
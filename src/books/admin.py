@@ -5,6 +5,9 @@ from django.db.models import Count
 from unfold.admin import ModelAdmin, TabularInline, StackedInline
 from unfold.decorators import display
 
+from core import background
+
+from . import ingestion
 from .models import Book, Specialty, Topic, UserBookAccess
 
 
@@ -65,8 +68,12 @@ class BookAdmin(ModelAdmin):
             'fields': ('title', 'slug', 'product_id', 'cover_image'),
         }),
         ('PDF Content', {
-            'fields': ('pdf_file', 'total_pages', 'estimated_pages'),
-            'description': 'Upload the full book PDF. Set total pages for validation. '
+            'fields': (
+                'pdf_file', 'total_pages', 'estimated_pages',
+                'ingestion_status', 'ingestion_error',
+            ),
+            'description': 'Upload the full book PDF. Total pages, page text and the '
+                           'outline are read from it in the background after saving. '
                            'Estimated pages is used for progress display.',
         }),
         ('Pricing & Status', {
@@ -78,7 +85,25 @@ class BookAdmin(ModelAdmin):
         }),
     )
 
+    readonly_fields = ('ingestion_status', 'ingestion_error')
     inlines = [SpecialtyInline]
+    actions = ('reingest_pdf', 'apply_outline_ranges')
+
+    # ── Actions ──
+    @admin.action(description='Re-read PDF (pages, text, outline)')
+    def reingest_pdf(self, request, queryset):
+        # Parsing a large PDF takes minutes: queue it like Book.save() does
+        books = queryset.exclude(pdf_file='').exclude(pdf_file__isnull=True)
+        book_ids = list(books.values_list('pk', flat=True))
+        books.update(ingestion_status=Book.IngestionStatus.PENDING)
+        for book_id in book_ids:
+            background.run_after_commit(ingestion.ingest_book, book_id, force=True)
+        self.message_user(request, f"Queued {len(book_ids)} book PDF(s) for ingestion.")
+
+    @admin.action(description='Fill empty page ranges from the PDF outline')
+    def apply_outline_ranges(self, request, queryset):
+        count = sum(ingestion.apply_proposed_ranges(book) for book in queryset)
+        self.message_user(request, f"{count} specialty/topic page range(s) set.")
 
     # ── Custom Columns ──
     @display(header=True, description="Book")
@@ -105,9 +130,11 @@ class BookAdmin(ModelAdmin):
 
     @display(description='PDF')
     def pdf_badge(self, obj):
-        if obj.has_pdf:
-            return f"✓ {obj.total_pages}pp"
-        return "—"
+        if not obj.has_pdf:
+            return "—"
+        if obj.ingestion_status != Book.IngestionStatus.READY:
+            return f"✓ {obj.get_ingestion_status_display()}"
+        return f"✓ {obj.total_pages}pp"
 
     @display(description='Specialties')
     def specialties_count(self, obj):
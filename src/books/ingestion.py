@@ -0,0 +1,211 @@
+"""
+PDF ingestion: parse a book PDF once and keep what later features need.
+
+When Book.pdf_file changes, Book.save() schedules ingest_book() after
+commit (core.background). The PDF is parsed in a child process — text
+extraction is CPU-bound and can take minutes for a large book — and the
+results are stored in side tables:
+  - Book.total_pages,
+  - BookPage: per-page text and page-object byte offset,
+  - BookOutlineEntry: the PDF outline (table of contents), from which
+    specialty/topic page ranges are proposed (propose_ranges()).
+Ingestion is skipped when the file's checksum matches the last ingested
+one. pdf_ingested is sent afterwards (the search index listens to it). Re-run or backfill with: python manage.py ingest_book_pdfs
+"""
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+# Sent (sender=Book, book_id=…) once a book's page table has been replaced
+pdf_ingested = Signal()
+
+
+# ─────────────────────────────────────────────
+# Parsing — runs in a child process, no Django access
+# ─────────────────────────────────────────────
+def parse_pdf(path, extract_text=True):
+    """
+    {'page_count', 'pages': [(byte_offset, text)], 'outline': [(level, title, page)]}
+    for the PDF at `path`. Pages are 1-indexed in the outline.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    offsets = getattr(reader, 'xref', {})
+    pages = []
+    for page in reader.pages:
+        ref = page.indirect_reference
+        offset = offsets.get(ref.generation, {}).get(ref.idnum) if ref else None
+        text = ''
+        if extract_text:
+            try:
+                text = page.extract_text() or ''
+            except Exception:  # malformed content stream: keep the page, skip its text
+                text = ''
+        pages.append((offset, text.replace('\x00', '')))
+
+    outline = []
+
+    def walk(items, level):
+        for item in items:
+            if isinstance(item, list):
+                walk(item, level + 1)
+                continue
+            try:
+                index = reader.get_destination_page_number(item)
+            except Exception:
+                index = None
+            if index is not None and index >= 0:
+                outline.append((level, str(item.title or '').strip()[:500], index + 1))
+
+    try:
+        walk(reader.outline, 0)
+    except Exception:  # broken outline tree: ingest the pages anyway
+        logger.warning('Could not read the outline of %s', path)
+
+    return {'page_count': len(reader.pages), 'pages': pages, 'outline': outline}
+
+
+def _parse_in_child(path):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(parse_pdf, path).result()
+
+
+# ─────────────────────────────────────────────
+# Ingestion
+# ─────────────────────────────────────────────
+def ingest_book(book_id, force=False):
+    """
+    Parse the book's PDF and replace its page / outline tables.
+    Returns True when the book was (re)ingested.
+    """
+    from books import slicing
+    from books.models import Book, BookOutlineEntry, BookPage
+
+    book = Book.objects.filter(pk=book_id).first()
+    if not book or not book.pdf_file:
+        return False
+    Status = Book.IngestionStatus
+
+    try:
+        checksum = slicing.book_checksum(book)
+        if (
+            not force
+            and book.ingested_checksum == checksum
+            and book.ingestion_status == Status.READY
+        ):
+            return False
+        Book.objects.filter(pk=book.pk).update(ingestion_status=Status.PROCESSING)
+        result = _parse_in_child(book.pdf_file.path)
+    except Exception as e:
+        logger.exception('PDF ingestion failed for book %s', book_id)
+        Book.objects.filter(pk=book.pk).update(
+            ingestion_status=Status.FAILED, ingestion_error=str(e)[:2000],
+        )
+        return False
+
+    with transaction.atomic():
+        # The file may have been replaced while it was being parsed
+        current = Book.objects.select_for_update().filter(pk=book.pk).first()
+        if not current or current.pdf_file.name != book.pdf_file.name:
+            return False
+        BookPage.objects.filter(book=book).delete()
+        BookOutlineEntry.objects.filter(book=book).delete()
+        BookPage.objects.bulk_create([
+            BookPage(book=book, page_number=number, byte_offset=offset, text=text)
+            for number, (offset, text) in enumerate(result['pages'], start=1)
+        ], batch_size=500)
+        BookOutlineEntry.objects.bulk_create([
+            BookOutlineEntry(
+                book=book, position=position, level=level, title=title, page_number=page,
+            )
+            for position, (level, title, page) in enumerate(result['outline'])
+        ], batch_size=500)
+        Book.objects.filter(pk=book.pk).update(
+            total_pages=result['page_count'],
+            ingested_checksum=checksum,
+            ingestion_status=Status.READY,
+            ingestion_error='',
+        )
+    pdf_ingested.send(sender=Book, book_id=book.pk)
+    return True
+
+
+# ─────────────────────────────────────────────
+# Page range proposals from the outline
+# ─────────────────────────────────────────────
+_NUMBERING = re.compile(r'^\s*(?:\d+(?:\.\d+)*\.?|[IVXLC]+[.)])\s+')
+
+
+def _normalize(title):
+    # "3.1 Heart Failure" / "IV. Heart Failure" → "heart-failure"
+    return slugify(_NUMBERING.sub('', title)) or slugify(title)
+
+
+def outline_ranges(book):
+    """
+    Outline entries with their page span: [(level, title, start, end)].
+    An entry ends the page before the next entry at the same or a
+    shallower level (or at the last page of the book).
+    """
+    entries = list(book.outline_entries.values_list('level', 'title', 'page_number'))
+    ranges = []
+    for index, (level, title, start) in enumerate(entries):
+        end = book.total_pages or start
+        for next_level, _, next_start in entries[index + 1:]:
+            if next_level <= level:
+                end = max(start, next_start - 1)
+                break
+        ranges.append((level, title, start, end))
+    return ranges
+
+
+def propose_ranges(book):
+    """
+    Page ranges for the book's specialties and topics, matched to outline
+    entries by title: {specialty: (start, end), topic: (start, end)}.
+    Topics are only matched inside their specialty's outline section.
+    """
+    ranges = outline_ranges(book)
+    proposals = {}
+    for specialty in book.specialties.prefetch_related('topics'):
+        keys = {_normalize(specialty.name), specialty.slug}
+        match = next(
+            (i for i, r in enumerate(ranges) if _normalize(r[1]) in keys), None,
+        )
+        if match is None:
+            continue
+        level, _, start, end = ranges[match]
+        proposals[specialty] = (start, end)
+
+        section = []
+        for entry in ranges[match + 1:]:
+            if entry[0] <= level:
+                break
+            section.append(entry)
+        for topic in specialty.topics.all():
+            keys = {_normalize(topic.title), topic.slug}
+            found = next((r for r in section if _normalize(r[1]) in keys), None)
+            if found:
+                proposals[topic] = (found[2], found[3])
+    return proposals
+
+
+def apply_proposed_ranges(book, overwrite=False):
+    """Save proposed ranges on specialties/topics (only unset ones unless overwrite)."""
+    updated = 0
+    for obj, (start, end) in propose_ranges(book).items():
+        if obj.start_page and obj.end_page and not overwrite:
+            continue
+        if (obj.start_page, obj.end_page) == (start, end):
+            continue
+        obj.start_page, obj.end_page = start, end
+        obj.save(update_fields=['start_page', 'end_page', 'updated_at'])
+        updated += 1
+    return updated
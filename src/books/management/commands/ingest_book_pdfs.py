@@ -0,0 +1,65 @@
+"""
+Read book PDFs into the page / outline tables (backfill, or after a failure).
+Usage: python manage.py ingest_book_pdfs [--book slug] [--force] [--apply-ranges [--overwrite]]
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from books import ingestion
+from books.models import Book
+
+
+class Command(BaseCommand):
+    help = "Extract page count, page text and outline from every book PDF."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--book',
+            help="Only ingest the book with this slug.",
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help="Re-read PDFs even if they are unchanged since the last ingestion.",
+        )
+        parser.add_argument(
+            '--apply-ranges',
+            action='store_true',
+            help="Fill empty specialty/topic page ranges from the PDF outline.",
+        )
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help="With --apply-ranges, also replace page ranges that are already set.",
+        )
+
+    def handle(self, *args, **options):
+        if options['overwrite'] and not options['apply_ranges']:
+            raise CommandError('--overwrite requires --apply-ranges.')
+
+        books = Book.objects.exclude(pdf_file='').exclude(pdf_file__isnull=True)
+        if options['book']:
+            books = books.filter(slug=options['book'])
+            if not books.exists():
+                raise CommandError(f"No book with slug {options['book']} and a PDF.")
+
+        ingested = ranges = 0
+        for book in books:
+            if ingestion.ingest_book(book.pk, force=options['force']):
+                ingested += 1
+            book.refresh_from_db()
+            if book.ingestion_status == Book.IngestionStatus.FAILED:
+                self.stdout.write(self.style.WARNING(
+                    f"  {book.slug}: failed — {book.ingestion_error}"
+                ))
+                continue
+            line = f"  {book.slug}: {book.total_pages} pages, {book.outline_entries.count()} outline entries"
+            if options['apply_ranges']:
+                count = ingestion.apply_proposed_ranges(book, overwrite=options['overwrite'])
+                ranges += count
+                line += f", {count} page ranges set"
+            self.stdout.write(line)
+
+        message = f"✅ Ingested {ingested} book PDFs."
+        if options['apply_ranges']:
+            message += f" Set {ranges} page ranges."
+        self.stdout.write(self.style.SUCCESS(message))
@@ -739,9 +739,11 @@ class Command(BaseCommand):
                 defaults={
                     "mode": "practice",
                     "total_questions": min(8, len(questions)),
+                    "answered_count": min(8, len(questions)),
                     "correct_count": 6,
                     "total_time_seconds": 720,
                     "is_completed": True,
+                    "final_score": 75,
                     "show_explanations": True,
                     "completed_at": now - timedelta(hours=2),
                 }
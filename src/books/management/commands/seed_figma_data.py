@@ -2,6 +2,7 @@ import json
 import os
 import random
 from datetime import timedelta
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.utils.text import slugify
@@ -43,6 +44,9 @@ class Command(BaseCommand):
             self._create_cme(student)
             self._create_student_activity(student)
 
+        # Questions and flashcards were bulk-created: fill their search text and the index
+        call_command('rebuild_search_index', stdout=self.stdout)
+
         self.stdout.write(self.style.SUCCESS(
             f"\n✅ Figma demo data seeded successfully!\n"
             f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
@@ -278,9 +282,11 @@ class Command(BaseCommand):
                 defaults={
                     "mode": "practice",
                     "total_questions": 10,
+                    "answered_count": 10,
                     "correct_count": 8 if i < 5 else 9,
                     "total_time_seconds": 600,
                     "is_completed": True,
+                    "final_score": 80 if i < 5 else 90,
                     "completed_at": now - timedelta(days=i),
                 }
             )
@@ -319,9 +325,11 @@ class Command(BaseCommand):
             defaults={
                 "mode": "practice",
                 "total_questions": 15,
+                "answered_count": 15,
                 "correct_count": 15,
                 "total_time_seconds": 900,
                 "is_completed": True,
+                "final_score": 100,
                 "completed_at": now,
             }
         )
@@ -0,0 +1,55 @@
+"""
+Pre-build the topic and specialty PDF slices of book PDFs (e.g. after an upload).
+Usage: python manage.py slice_book_pdfs [--book slug] [--prune]
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from books import slicing
+from books.models import Book
+
+
+class Command(BaseCommand):
+    help = "Build missing topic/specialty page-range PDFs for every book with a PDF."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--book',
+            help="Only slice the book with this slug.",
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help="Also delete slices of PDFs that are no longer attached to a book.",
+        )
+
+    def handle(self, *args, **options):
+        if options['prune'] and options['book']:
+            raise CommandError('--prune cannot be combined with --book.')
+
+        books = Book.objects.exclude(pdf_file='').exclude(pdf_file__isnull=True)
+        if options['book']:
+            books = books.filter(slug=options['book'])
+            if not books.exists():
+                raise CommandError(f"No book with slug {options['book']} and a PDF.")
+
+        totals = [0, 0, 0]
+        checksums = set()
+        for book in books:
+            try:
+                counts = slicing.build_slices(book, slicing.section_ranges(book))
+            except FileNotFoundError:
+                self.stdout.write(self.style.WARNING(f"  {book.slug}: PDF file missing, skipped"))
+                continue
+            checksums.add(book.pdf_checksum)
+            totals = [a + b for a, b in zip(totals, counts)]
+            self.stdout.write(
+                f"  {book.slug}: {counts[0]} built, {counts[1]} cached, {counts[2]} skipped"
+            )
+
+        if options['prune']:
+            removed = slicing.prune_slices(checksums)
+            self.stdout.write(f"  Removed {removed} stale slice directories.")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Built {totals[0]} slices ({totals[1]} already cached, {totals[2]} out of range)."
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0005_remove_topic_estimated_tasks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='pdf_checksum',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the PDF file; keys the cached topic/specialty slices.', max_length=64),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 6.0.2 on 2026-10-17 17:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0006_book_pdf_checksum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='ingested_checksum',
+            field=models.CharField(blank=True, editable=False, help_text='Checksum of the PDF the page/outline tables were built from.', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='ingestion_error',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='ingestion_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', editable=False, help_text='PDF ingestion (page count, outline, page text) — see books/ingestion.py.', max_length=12),
+        ),
+        migrations.CreateModel(
+            name='BookOutlineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(help_text='Order within the outline.')),
+                ('level', models.PositiveSmallIntegerField(help_text='Nesting depth, 0 = top level.')),
+                ('title', models.CharField(max_length=500)),
+                ('page_number', models.PositiveIntegerField(help_text='1-indexed target page.')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outline_entries', to='books.book')),
+            ],
+            options={
+                'verbose_name': 'Book Outline Entry',
+                'verbose_name_plural': 'Book Outline Entries',
+                'ordering': ['book', 'position'],
+                'unique_together': {('book', 'position')},
+            },
+        ),
+        migrations.CreateModel(
+            name='BookPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page_number', models.PositiveIntegerField(help_text='1-indexed.')),
+                ('byte_offset', models.BigIntegerField(blank=True, help_text='Offset of the page object in the PDF file (empty when it sits in an object stream).', null=True)),
+                ('text', models.TextField(blank=True, help_text='Extracted page text.')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pages', to='books.book')),
+            ],
+            options={
+                'verbose_name': 'Book Page',
+                'verbose_name_plural': 'Book Pages',
+                'ordering': ['book', 'page_number'],
+                'unique_together': {('book', 'page_number')},
+            },
+        ),
+    ]
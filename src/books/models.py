@@ -17,6 +17,12 @@ class Book(models.Model):
         COMING_SOON = 'coming_soon', 'Coming Soon'
         ARCHIVED = 'archived', 'Archived'
 
+    class IngestionStatus(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        PROCESSING = 'processing', 'Processing'
+        READY = 'ready', 'Ready'
+        FAILED = 'failed', 'Failed'
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     product_id = models.CharField(
         max_length=100, unique=True, db_index=True,
@@ -42,6 +48,20 @@ class Book(models.Model):
         default=0,
         help_text='Total number of pages in the PDF (auto-set or manually entered).'
     )
+    pdf_checksum = models.CharField(
+        max_length=64, blank=True, editable=False,
+        help_text='SHA-256 of the PDF file; keys the cached topic/specialty slices.'
+    )
+    ingestion_status = models.CharField(
+        max_length=12, choices=IngestionStatus.choices, default=IngestionStatus.PENDING,
+        editable=False,
+        help_text='PDF ingestion (page count, outline, page text) — see books/ingestion.py.'
+    )
+    ingested_checksum = models.CharField(
+        max_length=64, blank=True, editable=False,
+        help_text='Checksum of the PDF the page/outline tables were built from.'
+    )
+    ingestion_error = models.TextField(blank=True, editable=False)
 
     price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
     status = models.CharField(
@@ -69,6 +89,31 @@ class Book(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # A new PDF invalidates the checksum (and with it the cached slices)
+        # and is parsed again in the background
+        pdf_changed = self._pdf_changed()
+        if pdf_changed:
+            self.pdf_checksum = ''
+            self.ingestion_status = self.IngestionStatus.PENDING
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {
+                    *kwargs['update_fields'], 'pdf_checksum', 'ingestion_status',
+                }
+        super().save(*args, **kwargs)
+        if pdf_changed and self.pdf_file:
+            from books import ingestion
+            from core import background
+            background.run_after_commit(ingestion.ingest_book, self.pk)
+
+    def _pdf_changed(self):
+        if self._state.adding:
+            return bool(self.pdf_file)
+        stored_name = Book.objects.filter(pk=self.pk).values_list(
+            'pdf_file', flat=True,
+        ).first()
+        return (stored_name or '') != (self.pdf_file.name or '')
+
     @property
     def specialty_count(self):
         return self.specialties.count()
@@ -236,6 +281,53 @@ class Topic(models.Model):
         return 0
 
 
+class BookPage(models.Model):
+    """
+    One page of a book PDF, recorded by PDF ingestion (books/ingestion.py)
+    so page counts, text and offsets never require reparsing the file.
+    Uses an integer key: a book has hundreds of rows.
+    """
+
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='pages')
+    page_number = models.PositiveIntegerField(help_text='1-indexed.')
+    byte_offset = models.BigIntegerField(
+        null=True, blank=True,
+        help_text='Offset of the page object in the PDF file (empty when it sits in an object stream).'
+    )
+    text = models.TextField(blank=True, help_text='Extracted page text.')
+
+    class Meta:
+        verbose_name = 'Book Page'
+        verbose_name_plural = 'Book Pages'
+        ordering = ['book', 'page_number']
+        unique_together = ['book', 'page_number']
+
+    def __str__(self):
+        return f'{self.book_id} p.{self.page_number}'
+
+
+class BookOutlineEntry(models.Model):
+    """
+    A bookmark from the book PDF's outline (table of contents), recorded by
+    PDF ingestion. Used to propose specialty/topic page ranges.
+    """
+
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='outline_entries')
+    position = models.PositiveIntegerField(help_text='Order within the outline.')
+    level = models.PositiveSmallIntegerField(help_text='Nesting depth, 0 = top level.')
+    title = models.CharField(max_length=500)
+    page_number = models.PositiveIntegerField(help_text='1-indexed target page.')
+
+    class Meta:
+        verbose_name = 'Book Outline Entry'
+        verbose_name_plural = 'Book Outline Entries'
+        ordering = ['book', 'position']
+        unique_together = ['book', 'position']
+
+    def __str__(self):
+        return f'{"  " * self.level}{self.title} (p.{self.page_number})'
+
+
 class UserBookAccess(models.Model):
     """
     Tracks which books a user has purchased/been granted access to.
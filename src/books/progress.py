@@ -0,0 +1,59 @@
+"""
+Per-user reading progress laid over a cached book tree (books/tree.py).
+
+One query loads all of a user's UserTopicProgress rows for a book; topic,
+specialty and book completion are then computed in memory. The result is
+passed to the syllabus serializers through their context:
+  _progress_map_{user.pk}      {str(topic_id): UserTopicProgress}
+  _progress_overlay_{user.pk}  the ProgressOverlay itself
+Serializers fall back to per-object queries when these are missing.
+"""
+from learning.models import UserTopicProgress
+
+
+def _percentage(completed, total):
+    return round((completed / total) * 100) if total else 0
+
+
+class ProgressOverlay:
+    def __init__(self, user, book_tree):
+        self.book_tree = book_tree
+        self.progress_map = {
+            str(progress.topic_id): progress
+            for progress in UserTopicProgress.objects.filter(
+                user=user, topic__specialty__book_id=book_tree.book_id,
+            )
+        }
+
+        self.specialty_completed = {}
+        for specialty in book_tree.specialties:
+            self.specialty_completed[specialty.pk] = sum(
+                1 for topic in specialty.topics.all()
+                if self.is_completed(topic.pk)
+            )
+        self.book_completed = sum(self.specialty_completed.values())
+
+    def is_completed(self, topic_id):
+        progress = self.progress_map.get(str(topic_id))
+        return bool(progress and progress.is_completed)
+
+    def specialty_percentage(self, specialty):
+        return _percentage(
+            self.specialty_completed.get(specialty.pk, 0), len(specialty.topics.all()),
+        )
+
+    def book_percentage(self):
+        return _percentage(self.book_completed, self.book_tree.topic_count)
+
+
+def context_key(user):
+    return f'_progress_overlay_{user.pk}'
+
+
+def overlay_context(user, book_tree):
+    """Serializer context entries carrying `user`'s progress over `book_tree`."""
+    overlay = ProgressOverlay(user, book_tree)
+    return {
+        f'_progress_map_{user.pk}': overlay.progress_map,
+        context_key(user): overlay,
+    }
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
+from books import progress, slicing, tree
 from books.models import Book, Specialty, Topic, UserBookAccess
+from core import signed_urls
 from learning.models import (
     UserTopicProgress, UserBookmark, UserHighlight, UserNote,
 )
@@ -60,6 +62,9 @@ class SpecialtySerializer(serializers.ModelSerializer):
         user = self.context.get('request') and self.context['request'].user
         if not user or not user.is_authenticated:
             return 0
+        overlay = self.context.get(progress.context_key(user))
+        if overlay is not None:
+            return overlay.specialty_percentage(obj)
         total_topics = obj.topics.count()
         if total_topics == 0:
             return 0
@@ -138,7 +143,7 @@ class StoreBookSerializer(serializers.ModelSerializer):
 # 4.3  Book Detail
 # ─────────────────────────────────────────────
 class BookDetailSerializer(serializers.ModelSerializer):
-    specialties = SpecialtySerializer(many=True, read_only=True)
+    specialties = serializers.SerializerMethodField()
     progress_percentage = serializers.SerializerMethodField()
     has_access = serializers.SerializerMethodField()
     pdf_url = serializers.SerializerMethodField()
@@ -152,22 +157,30 @@ class BookDetailSerializer(serializers.ModelSerializer):
             'progress_percentage', 'specialties',
         ]
 
+    def get_specialties(self, obj):
+        # Content comes from the cached syllabus tree (books/tree.py)
+        book_tree = self.context.get('book_tree') or tree.get_tree(obj.pk)
+        return SpecialtySerializer(
+            book_tree.specialties, many=True, context=self.context,
+        ).data
+
     def get_has_access(self, obj):
-        user = self.context['request'].user
-        from books.models import UserBookAccess
-        return UserBookAccess.objects.filter(user=user, book=obj).exists()
+        if not hasattr(self, '_has_access'):
+            user = self.context['request'].user
+            self._has_access = UserBookAccess.objects.filter(user=user, book=obj).exists()
+        return self._has_access
 
     def get_pdf_url(self, obj):
-        has_access = self.get_has_access(obj)
-        if has_access and obj.has_pdf and obj.pdf_file:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.pdf_file.url)
-            return obj.pdf_file.url
+        # Short-lived signed URL, minted only for owners of the book
+        if self.get_has_access(obj) and obj.pdf_file:
+            return signed_urls.signed_url(obj.pdf_file.name, self.context.get('request'))
         return None
 
     def get_progress_percentage(self, obj):
         user = self.context['request'].user
+        overlay = self.context.get(progress.context_key(user))
+        if overlay is not None:
+            return overlay.book_percentage()
         total = Topic.objects.filter(specialty__book=obj).count()
         if total == 0:
             return 0
@@ -238,6 +251,7 @@ class TopicDetailSerializer(serializers.ModelSerializer):
     book = serializers.SerializerMethodField()
     is_completed = serializers.SerializerMethodField()
     is_bookmarked = serializers.SerializerMethodField()
+    pdf_url = serializers.SerializerMethodField()
     progress = serializers.SerializerMethodField()
     test_your_knowledge = serializers.SerializerMethodField()
     pagination = serializers.SerializerMethodField()
@@ -246,7 +260,7 @@ class TopicDetailSerializer(serializers.ModelSerializer):
         model = Topic
         fields = [
             'id', 'title', 'slug', 'specialty', 'book',
-            'start_page', 'end_page',
+            'start_page', 'end_page', 'pdf_url',
             'key_points', 'is_completed', 'is_bookmarked',
             'progress', 'test_your_knowledge', 'pagination',
         ]
@@ -282,6 +296,23 @@ class TopicDetailSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
         return UserBookmark.objects.filter(user=user, topic=obj).exists()
 
+    def get_pdf_url(self, obj):
+        """Signed URL of the topic's page-range PDF, for owners of the book."""
+        request = self.context['request']
+        book = obj.specialty.book
+        pages = slicing.page_range(obj)
+        if not pages or not book.pdf_file:
+            return None
+        if not UserBookAccess.objects.filter(user=request.user, book=book).exists():
+            return None
+        # The checksum is known once the PDF has been ingested; the slice
+        # itself is built in the background or by the signed-media view
+        if not book.pdf_checksum or (book.total_pages and pages[1] > book.total_pages):
+            return None
+        return signed_urls.signed_url(
+            slicing.slice_name(book.pdf_checksum, *pages), request,
+        )
+
     def get_progress(self, obj):
         return {}
 
@@ -295,31 +326,7 @@ class TopicDetailSerializer(serializers.ModelSerializer):
         return {'total_questions': total, 'answered_questions': answered}
 
     def get_pagination(self, obj):
-        siblings = list(
-            Topic.objects.filter(specialty=obj.specialty)
-            .order_by('display_order', 'title')
-            .values_list('slug', 'title')
-        )
-        slugs = [s[0] for s in siblings]
-        try:
-            idx = slugs.index(obj.slug)
-        except ValueError:
-            idx = 0
-
-        prev_topic = (
-            {'slug': siblings[idx - 1][0], 'title': siblings[idx - 1][1]}
-            if idx > 0 else None
-        )
-        next_topic = (
-            {'slug': siblings[idx + 1][0], 'title': siblings[idx + 1][1]}
-            if idx < len(siblings) - 1 else None
-        )
-        return {
-            'current_position': idx + 1,
-            'total_topics': len(siblings),
-            'previous_topic': prev_topic,
-            'next_topic': next_topic,
-        }
+        return tree.topic_pagination(obj)
 
 
 # ─────────────────────────────────────────────
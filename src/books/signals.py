@@ -0,0 +1,37 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from books import slicing, tree
+from books.ingestion import pdf_ingested
+from books.models import Book, Specialty, Topic
+from core import background
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Specialty)
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Specialty)
+@receiver(post_delete, sender=Topic)
+def invalidate_book_trees(sender, **kwargs):
+    """Any content edit changes the cached syllabus trees."""
+    tree.invalidate()
+
+
+@receiver(pdf_ingested, sender=Book)
+def prebuild_book_slices(sender, book_id, **kwargs):
+    background.run_after_commit(slicing.prebuild_slices, book_id)
+
+
+@receiver(post_save, sender=Specialty)
+@receiver(post_save, sender=Topic)
+def prebuild_section_slice(sender, instance, raw=False, **kwargs):
+    """A saved page range gets its slice (and only that one) built off the request."""
+    pages = None if raw else slicing.page_range(instance)
+    if not pages:
+        return
+    book_id = instance.book_id if sender is Specialty else (
+        Specialty.objects.filter(pk=instance.specialty_id).values_list('book_id', flat=True).first()
+    )
+    if book_id:
+        background.run_after_commit(slicing.prebuild_slices, book_id, ranges=[pages])
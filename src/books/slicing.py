@@ -0,0 +1,177 @@
+"""
+Standalone PDFs for topic / specialty page ranges of a book.
+
+Topics and specialties are page ranges inside Book.pdf_file. A slice is a
+small PDF holding only those pages, cached on disk at
+MEDIA_ROOT/books/slices/<book checksum>/<start>-<end>.pdf. Keying by the
+file's SHA-256 means a re-uploaded PDF never serves stale slices; old
+directories are removed with: python manage.py slice_book_pdfs --prune
+
+Slices are built in the background after a PDF is ingested or a page
+range is saved (books/signals.py), on first request otherwise, or in bulk
+with the same command. API responses only mint signed URLs for them; a
+slice that does not exist yet is built by the signed-media view.
+"""
+import hashlib
+import os
+import re
+import shutil
+import uuid
+
+from django.core.files.storage import default_storage
+from pypdf import PdfReader, PdfWriter
+from pypdf.errors import PyPdfError
+
+SLICE_DIR = 'books/slices'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def book_checksum(book):
+    """The book PDF's SHA-256, computed once and stored on the book."""
+    if not book.pdf_checksum:
+        digest = hashlib.sha256()
+        with book.pdf_file.open('rb') as fh:
+            for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        book.pdf_checksum = digest.hexdigest()
+        type(book).objects.filter(
+            pk=book.pk, pdf_file=book.pdf_file.name,
+        ).update(pdf_checksum=book.pdf_checksum)
+    return book.pdf_checksum
+
+
+def page_range(obj):
+    """(start, end) of a topic or specialty, or None when not mapped."""
+    if obj.start_page and obj.end_page and obj.start_page <= obj.end_page:
+        return obj.start_page, obj.end_page
+    return None
+
+
+def slice_name(checksum, start, end):
+    return f'{SLICE_DIR}/{checksum}/{start}-{end}.pdf'
+
+
+_SLICE_NAME = re.compile(
+    rf'^{SLICE_DIR}/(?P<checksum>[0-9a-f]{{64}})/(?P<start>\d+)-(?P<end>\d+)\.pdf$'
+)
+
+
+def section_ranges(book):
+    """Page ranges of all of the book's specialties and topics."""
+    ranges = []
+    for specialty in book.specialties.prefetch_related('topics'):
+        ranges.append(page_range(specialty))
+        ranges.extend(page_range(t) for t in specialty.topics.all())
+    return [r for r in ranges if r]
+
+
+def _write_slice(reader, path, start, end):
+    if end > len(reader.pages):
+        raise ValueError(
+            f'Pages {start}-{end} are outside the PDF ({len(reader.pages)} pages).'
+        )
+    writer = PdfWriter()
+    for index in range(start - 1, end):
+        writer.add_page(reader.pages[index])
+
+    # Write to a temporary name and rename, so concurrent requests for the
+    # same slice never see a partial file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    try:
+        with open(tmp_path, 'wb') as fh:
+            writer.write(fh)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def get_slice(book, start, end):
+    """
+    Path of the cached slice of pages start..end (1-indexed, inclusive),
+    building it from the book PDF on first use. Raises ValueError when the
+    range is outside the PDF.
+    """
+    if book.total_pages and end > book.total_pages:
+        # Known from ingestion: no need to open the PDF to reject the range
+        raise ValueError(
+            f'Pages {start}-{end} are outside the PDF ({book.total_pages} pages).'
+        )
+    path = default_storage.path(slice_name(book_checksum(book), start, end))
+    if not os.path.exists(path):
+        try:
+            _write_slice(PdfReader(book.pdf_file.path), path, start, end)
+        except PyPdfError as e:
+            raise ValueError('The book PDF could not be read.') from e
+    return path
+
+
+def build_slices(book, ranges):
+    """
+    Build every missing slice in `ranges` for one book, parsing its PDF
+    once. Returns (built, cached, skipped) counts; ranges outside the PDF
+    (or pages that cannot be read) are skipped.
+    """
+    checksum = book_checksum(book)
+    reader = None
+    built = cached = skipped = 0
+    for start, end in sorted(set(ranges)):
+        path = default_storage.path(slice_name(checksum, start, end))
+        if os.path.exists(path):
+            cached += 1
+            continue
+        if reader is None:
+            reader = PdfReader(book.pdf_file.path)
+        try:
+            _write_slice(reader, path, start, end)
+        except (ValueError, PyPdfError):
+            skipped += 1
+        else:
+            built += 1
+    return built, cached, skipped
+
+
+def prebuild_slices(book_id, ranges=None):
+    """
+    Background job: build the book's missing slices, or only those of
+    `ranges` (a list of (start, end) pairs) when given.
+    """
+    from books.models import Book
+
+    book = Book.objects.filter(pk=book_id).exclude(pdf_file='').first()
+    if book and book.pdf_checksum:
+        build_slices(book, section_ranges(book) if ranges is None else ranges)
+
+
+def slice_for_name(name):
+    """
+    Path of the slice with storage name `name`, building it if needed
+    (signed URLs are minted before their slice exists). None when `name`
+    is not a slice of a current book PDF or its range is outside the PDF.
+    """
+    from books.models import Book
+
+    match = _SLICE_NAME.match(name)
+    if not match:
+        return None
+    book = Book.objects.filter(pdf_checksum=match['checksum']).exclude(pdf_file='').first()
+    if not book:
+        return None
+    try:
+        return get_slice(book, int(match['start']), int(match['end']))
+    except (ValueError, OSError):
+        return None
+
+
+def prune_slices(keep_checksums):
+    """Delete slice directories of PDFs no longer in use. Returns the count."""
+    root = default_storage.path(SLICE_DIR)
+    if not os.path.isdir(root):
+        return 0
+    removed = 0
+    for entry in os.scandir(root):
+        if entry.is_dir() and entry.name not in keep_checksums:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
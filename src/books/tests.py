@@ -1,3 +1,55 @@
-from django.test import TestCase
+import os
+import tempfile
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from pypdf import PdfWriter
+
+from books import slicing
+from books.models import Book, Specialty
+
+
+class SectionSlicePrebuildTests(TestCase):
+    """Saving a page range builds that range's slice, not the whole book's."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        os.makedirs(os.path.join(tmp.name, 'books'))
+        writer = PdfWriter()
+        for _ in range(4):
+            writer.add_blank_page(width=72, height=72)
+        with open(os.path.join(tmp.name, 'books', 'book.pdf'), 'wb') as fh:
+            writer.write(fh)
+
+        book = Book.objects.create(product_id='cardio', title='Cardiology', slug='cardiology')
+        Book.objects.filter(pk=book.pk).update(
+            pdf_file='books/book.pdf', pdf_checksum='c' * 64, total_pages=4,
+        )
+        self.book = Book.objects.get(pk=book.pk)
+        # An existing section whose slice has not been built
+        Specialty.objects.bulk_create([Specialty(
+            book=self.book, name='Valves', slug='valves', start_page=3, end_page=4,
+        )])
+
+    def _slice_exists(self, start, end):
+        return os.path.exists(slicing.default_storage.path(
+            slicing.slice_name(self.book.pdf_checksum, start, end)
+        ))
+
+    def test_saved_range_only(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Specialty.objects.create(
+                book=self.book, name='Heart Failure', slug='heart-failure',
+                start_page=1, end_page=2,
+            )
+        self.assertTrue(self._slice_exists(1, 2))
+        self.assertFalse(self._slice_exists(3, 4))
+
+    def test_unmapped_section_builds_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Specialty.objects.create(book=self.book, name='Misc', slug='misc')
+        self.assertFalse(self._slice_exists(3, 4))
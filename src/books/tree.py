@@ -0,0 +1,141 @@
+"""
+Versioned cache of each book's syllabus tree: its specialties and their
+topics in display order (page ranges, topic counts), plus prev/next links
+between the topics of a specialty.
+
+The tree only changes when admins edit content, so it is read from
+  1. process memory, while its version matches the shared content version,
+  2. the shared cache (see CACHES), keyed by book and content version,
+  3. the database, storing the result in both.
+The content version is bumped after commit whenever a Book, Specialty or
+Topic is saved or deleted (books/signals.py). TREE_TTL_SECONDS bounds
+staleness when the cache backend is not shared between processes or a
+bulk update skipped signals.
+
+Trees hold model instances shared between requests: read them, never
+modify them. Per-user data (progress, access) is never part of a tree.
+"""
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+CONTENT_VERSION_KEY = 'books:tree:version'
+TREE_KEY = 'books:tree:{}:{}'
+TREE_TTL_SECONDS = 300
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def invalidate():
+    """Mark all book trees as changed (after the current transaction commits)."""
+    transaction.on_commit(lambda: cache.set(CONTENT_VERSION_KEY, _new_version(), None))
+
+
+def current_version():
+    """Shared content version, creating the key if missing."""
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        cache.add(CONTENT_VERSION_KEY, _new_version(), None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+def _load_specialties(book_id):
+    from books.models import Specialty
+
+    # Specialty / Topic Meta.ordering give the display order
+    return list(Specialty.objects.filter(book_id=book_id).prefetch_related('topics'))
+
+
+class BookTree:
+    """Specialties of one book, each with its topics prefetched."""
+
+    def __init__(self, book_id, version, specialties):
+        self.book_id = book_id
+        self.version = version
+        self.built_at = time.monotonic()
+        self.specialties = specialties
+
+        self.topic_count = 0
+        self._pagination = {}
+        for specialty in specialties:
+            topics = list(specialty.topics.all())
+            self.topic_count += len(topics)
+            for index, topic in enumerate(topics):
+                self._pagination[topic.pk] = _paginate(topics, index)
+
+    @property
+    def is_expired(self):
+        return time.monotonic() - self.built_at > TREE_TTL_SECONDS
+
+    def pagination(self, topic_id):
+        """
+        Position of a topic within its specialty, with prev/next topic links;
+        None when the topic is not in this tree.
+        """
+        return self._pagination.get(topic_id)
+
+
+def _link(topic):
+    return {'slug': topic.slug, 'title': topic.title}
+
+
+def _paginate(topics, index):
+    return {
+        'current_position': index + 1,
+        'total_topics': len(topics),
+        'previous_topic': _link(topics[index - 1]) if index > 0 else None,
+        'next_topic': _link(topics[index + 1]) if index < len(topics) - 1 else None,
+    }
+
+
+_trees = {}
+_trees_lock = threading.Lock()
+
+
+def get_tree(book_id):
+    """The cached syllabus tree of a book."""
+    version = current_version()
+    tree = _trees.get(book_id)
+    if tree is not None and tree.version == version and not tree.is_expired:
+        return tree
+
+    key = TREE_KEY.format(book_id, version)
+    specialties = cache.get(key)
+    if specialties is None:
+        specialties = _load_specialties(book_id)
+        cache.set(key, specialties, TREE_TTL_SECONDS)
+    tree = BookTree(book_id, version, specialties)
+    with _trees_lock:
+        _trees[book_id] = tree
+    return tree
+
+
+def discard(book_id):
+    """Drop a book's tree from this process and the shared cache."""
+    with _trees_lock:
+        _trees.pop(book_id, None)
+    cache.delete(TREE_KEY.format(book_id, current_version()))
+
+
+def topic_pagination(topic):
+    """
+    Pagination of a topic from its book's tree. A topic missing from the
+    tree means the tree is stale (e.g. built before a version bump by
+    another process): it is discarded and the siblings read from the
+    database instead.
+    """
+    from books.models import Topic
+
+    pagination = get_tree(topic.specialty.book_id).pagination(topic.pk)
+    if pagination is None:
+        discard(topic.specialty.book_id)
+        topics = list(Topic.objects.filter(specialty_id=topic.specialty_id).only('slug', 'title'))
+        index = next((i for i, t in enumerate(topics) if t.pk == topic.pk), None)
+        pagination = _paginate(topics, index) if index is not None else _paginate([topic], 0)
+    return pagination
@@ -5,6 +5,7 @@ from .views import (
     StoreBooksView,
     BookDetailView,
     BookPDFView,
+    SpecialtyPDFView,
     BookmarkListCreateView,
     BookmarkDeleteView,
     NotesHighlightsListView,
@@ -16,6 +17,7 @@ from .views import (
     NoteDeleteView,
     TopicDetailView,
     TopicProgressUpdateView,
+    TopicPDFView,
 )
 
 app_name = 'books'
@@ -26,6 +28,7 @@ urlpatterns = [
     path('syllabus/store/', StoreBooksView.as_view(), name='store'),
     path('syllabus/books/<slug:book_slug>/', BookDetailView.as_view(), name='book-detail'),
     path('syllabus/books/<slug:book_slug>/pdf/', BookPDFView.as_view(), name='book-pdf'),
+    path('syllabus/books/<slug:book_slug>/specialties/<slug:specialty_slug>/pdf/', SpecialtyPDFView.as_view(), name='specialty-pdf'),
 
     # ── Bookmarks ───────────────────────────────────────
     path('syllabus/bookmarks/', BookmarkListCreateView.as_view(), name='bookmark-list-create'),
@@ -43,4 +46,5 @@ urlpatterns = [
     # ── Reading Interface ───────────────────────────────
     path('syllabus/topics/<slug:topic_slug>/', TopicDetailView.as_view(), name='topic-detail'),
     path('syllabus/topics/<slug:topic_slug>/progress/', TopicProgressUpdateView.as_view(), name='topic-progress'),
+    path('syllabus/topics/<slug:topic_slug>/pdf/', TopicPDFView.as_view(), name='topic-pdf'),
 ]
@@ -1,12 +1,13 @@
 import os
 
 from django.db.models import Count
-from django.http import FileResponse
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from books.models import Book, Topic, UserBookAccess
+from books import progress, slicing, tree
+from books.models import Book, Specialty, Topic, UserBookAccess
+from core.file_serving import serve_file
 from learning.models import (
     UserTopicProgress, UserBookmark, UserHighlight, UserNote,
 )
@@ -27,75 +28,88 @@ from .serializers import (
 # ─────────────────────────────────────────────
 def _build_stats(user):
     """Reusable stats block for Dashboard, Syllabus, Board Basics, etc."""
-    from questions.models import UserQuestionAttempt, QuizSession
-    from learning.models import UserStudySession
-    from django.utils import timezone
-    from datetime import timedelta
-
-    # Overall progress: pages read / total pages across owned books
-    owned_book_ids = UserBookAccess.objects.filter(
-        user=user
-    ).values_list('book_id', flat=True)
-
-    owned_books = Book.objects.filter(id__in=owned_book_ids)
-    completed_progress = UserTopicProgress.objects.filter(
-        user=user, topic__specialty__book_id__in=owned_book_ids,
-        is_completed=True,
-    )
-    completed_topics = completed_progress.count()
+    from learning.models import UserStatsSnapshot
 
-    total_topics = Topic.objects.filter(
-        specialty__book_id__in=owned_book_ids
-    ).count()
+    # One primary-key read; recomputed only after a write invalidated it
+    snapshot = UserStatsSnapshot.for_user(user)
 
+    # Overall progress: completed / total topics across owned books
+    completed_topics = snapshot.completed_topics
+    total_topics = snapshot.total_topics
     progress_pct = round((completed_topics / total_topics) * 100) if total_topics else 0
     detail = f'{completed_topics} / {total_topics} topics'
 
-    # Quiz average: last 10 quiz sessions
-    recent_sessions = QuizSession.objects.filter(
-        user=user, is_completed=True,
-    ).order_by('-completed_at')[:10]
-    if recent_sessions:
-        scores = []
-        for s in recent_sessions:
-            total = s.attempts.count()
-            correct = s.attempts.filter(is_correct=True).count()
-            if total > 0:
-                scores.append(round((correct / total) * 100))
-        quiz_avg = round(sum(scores) / len(scores)) if scores else 0
-    else:
-        quiz_avg = 0
-
-    # Study time this week
-    week_start = timezone.now() - timedelta(days=7)
-    weekly_seconds = (
-        UserStudySession.objects.filter(
-            user=user, started_at__gte=week_start,
-        ).values_list('duration_seconds', flat=True)
-    )
-    total_secs = sum(weekly_seconds)
-    study_hours = round(total_secs / 3600, 1)
-
     return {
         'overall_progress': {
             'percentage': progress_pct,
             'detail': detail,
         },
         'bank_average_score': {
-            'percentage': quiz_avg,
+            'percentage': snapshot.quiz_average,
             'detail': 'Last 10 quizzes',
         },
         'study_time': {
-            'hours': study_hours,
+            'hours': round(snapshot.weekly_study_seconds / 3600, 1),
             'detail': 'This week',
         },
         'study_streak': {
-            'days': user.current_study_streak,
-            'detail': 'Keep it up!' if user.current_study_streak > 0 else 'Start studying!',
+            'days': snapshot.study_streak,
+            'detail': 'Keep it up!' if snapshot.study_streak > 0 else 'Start studying!',
         },
     }
 
 
+# ─────────────────────────────────────────────
+# Helper: PDF access checks and slice serving
+# ─────────────────────────────────────────────
+def _book_pdf_error(user, book):
+    """Error response when `user` cannot read the book PDF, else None."""
+    # Verify the user owns this book
+    has_access = UserBookAccess.objects.filter(user=user, book=book).exists()
+    if not has_access:
+        return Response(
+            {'detail': 'You do not have access to this book.'},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    # Verify a PDF file exists
+    if not book.pdf_file:
+        return Response(
+            {'detail': 'No PDF file available for this book.'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    if not os.path.exists(book.pdf_file.path):
+        return Response(
+            {'detail': 'PDF file not found on server.'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    return None
+
+
+def _serve_slice(request, book, section, kind):
+    """Serve the cached page-range PDF of a topic or specialty of `book`."""
+    error = _book_pdf_error(request.user, book)
+    if error:
+        return error
+
+    pages = slicing.page_range(section)
+    if not pages:
+        return Response(
+            {'detail': f'No page range is defined for this {kind}.'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    try:
+        path = slicing.get_slice(book, *pages)
+    except ValueError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+    return serve_file(
+        request, path, 'application/pdf',
+        filename=f'{book.slug}-{section.slug}.pdf',
+        name=slicing.slice_name(book.pdf_checksum, *pages),
+    )
+
+
 # ═════════════════════════════════════════════
 # 4.1  My Books
 # ═════════════════════════════════════════════
@@ -145,7 +159,19 @@ class BookDetailView(generics.RetrieveAPIView):
     lookup_url_kwarg = 'book_slug'
 
     def get_queryset(self):
-        return Book.objects.prefetch_related('specialties__topics')
+        # Specialties and topics come from the cached syllabus tree (books/tree.py)
+        return Book.objects.all()
+
+    def retrieve(self, request, *args, **kwargs):
+        book = self.get_object()
+        book_tree = tree.get_tree(book.pk)
+        # All of the user's progress for the book in one query (books/progress.py)
+        context = {
+            **self.get_serializer_context(),
+            **progress.overlay_context(request.user, book_tree),
+            'book_tree': book_tree,
+        }
+        return Response(self.get_serializer_class()(book, context=context).data)
 
 
 # ═════════════════════════════════════════════
@@ -158,6 +184,9 @@ class BookPDFView(APIView):
     Streams the book PDF through an authenticated endpoint.
     The user must own the book (have UserBookAccess) to access the PDF.
     This prevents exposing the raw file URL to the frontend.
+    Supports byte ranges (206 / multipart) and ETag revalidation (304), so
+    PDF readers can load pages lazily and reuse their cached copy; the
+    response is `private`, so shared caches never store it.
     """
 
     permission_classes = [permissions.IsAuthenticated]
@@ -170,42 +199,62 @@ class BookPDFView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Verify the user owns this book
-        has_access = UserBookAccess.objects.filter(
-            user=request.user, book=book,
-        ).exists()
-        if not has_access:
-            return Response(
-                {'detail': 'You do not have access to this book.'},
-                status=status.HTTP_403_FORBIDDEN,
-            )
+        error = _book_pdf_error(request.user, book)
+        if error:
+            return error
+
+        # Inline display (not download), with the book slug as filename
+        return serve_file(
+            request, book.pdf_file.path, 'application/pdf',
+            filename=f'{book.slug or "book"}.pdf',
+            name=book.pdf_file.name,
+        )
 
-        # Verify a PDF file exists
-        if not book.pdf_file:
+
+# ═════════════════════════════════════════════
+# 4.3c  Topic / Specialty PDF Slices
+# ═════════════════════════════════════════════
+class SpecialtyPDFView(APIView):
+    """
+    GET /api/v1/syllabus/books/{book_slug}/specialties/{specialty_slug}/pdf/
+
+    Only the specialty's pages of the book PDF, as a standalone PDF.
+    Slices are built on first request and cached (see books/slicing.py).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, book_slug, specialty_slug):
+        specialty = Specialty.objects.select_related('book').filter(
+            book__slug=book_slug, slug=specialty_slug,
+        ).first()
+        if not specialty:
             return Response(
-                {'detail': 'No PDF file available for this book.'},
+                {'detail': 'Specialty not found.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        return _serve_slice(request, specialty.book, specialty, 'specialty')
+
 
-        # Stream the file
-        file_path = book.pdf_file.path
-        if not os.path.exists(file_path):
+class TopicPDFView(APIView):
+    """
+    GET /api/v1/syllabus/topics/{topic_slug}/pdf/
+
+    Only the topic's pages of the book PDF, as a standalone PDF.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, topic_slug):
+        topic = Topic.objects.select_related('specialty__book').filter(
+            slug=topic_slug,
+        ).first()
+        if not topic:
             return Response(
-                {'detail': 'PDF file not found on server.'},
+                {'detail': 'Topic not found.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
-
-        response = FileResponse(
-            open(file_path, 'rb'),
-            content_type='application/pdf',
-        )
-        # Inline display (not download), with the book title as filename
-        safe_title = book.slug or 'book'
-        response['Content-Disposition'] = f'inline; filename="{safe_title}.pdf"'
-        # Prevent caching for content protection
-        response['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
-        response['Pragma'] = 'no-cache'
-        return response
+        return _serve_slice(request, topic.specialty.book, topic, 'topic')
 
 
 # ═════════════════════════════════════════════
@@ -0,0 +1,149 @@
+"""
+CME credit accrual from question attempts.
+
+Each question a user answers correctly earns the credits of the active
+"Individual Question" CMEActivity (0.25 by default), provided the user's
+accuracy over all attempts in that calendar year is at least 50%. Credits
+are capped at YEARLY_CAP per user and year. A question earns credit at
+most once per user, enforced by a unique constraint, so accrual can be
+re-run at any time: it only inserts credits that are missing.
+
+Runs after each answer submission via core.background, scoped to the
+questions just answered, and in bulk (full scan) from
+`python manage.py accrue_cme_credits` for backfill and catch-up.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Min, Q, Sum
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+YEARLY_CAP = Decimal('300')
+PASSING_RATIO = Decimal('0.5')
+
+
+def _question_activities():
+    """Active per-question activities keyed by specialty (None = any specialty)."""
+    from certificates.models import CMEActivity
+
+    activities = {}
+    for activity in CMEActivity.objects.filter(
+        activity_type=CMEActivity.ActivityType.QUESTION, is_active=True,
+    ).order_by('created_at'):
+        activities.setdefault(activity.specialty_id, activity)
+    return activities
+
+
+def _year_range(year):
+    start = timezone.make_aware(datetime(year, 1, 1))
+    return start, timezone.make_aware(datetime(year + 1, 1, 1))
+
+
+def accrue_for_user(user_id, since=None, question_ids=None):
+    """
+    Create the missing question credits for one user and return how many
+    were created. `since` limits the scan to attempts from that datetime on;
+    `question_ids` to those questions (the answer path passes the questions
+    just answered correctly, so it never rescans the user's history).
+    """
+    from certificates.models import CMECreditLedger, UserCMECredit
+    from questions.models import UserQuestionAttempt
+
+    activities = _question_activities()
+    if not activities:
+        return 0
+
+    with transaction.atomic():
+        # Serialize accrual per user so concurrent runs cannot overshoot the cap
+        get_user_model().objects.select_for_update().filter(pk=user_id).first()
+
+        # First correct answer of every question that has not earned credit yet
+        candidates = UserQuestionAttempt.objects.filter(
+            user_id=user_id, is_correct=True,
+        ).exclude(question__cme_credits__user_id=user_id)
+        if since:
+            candidates = candidates.filter(attempted_at__gte=since)
+        if question_ids is not None:
+            candidates = candidates.filter(question_id__in=question_ids)
+        candidates = list(
+            candidates.values('question_id', 'question__specialty_id')
+            .annotate(first_correct_at=Min('attempted_at'))
+            .order_by('first_correct_at')
+        )
+        if not candidates:
+            return 0
+
+        years = {timezone.localtime(c['first_correct_at']).year for c in candidates}
+        used = dict(
+            CMECreditLedger.objects.filter(user_id=user_id, credit_year__in=years)
+            .values_list('credit_year')
+            .annotate(total=Sum('total_credits'))
+            .order_by()
+        )
+        # Years already at the cap need no accuracy check
+        years = {year for year in years if (used.get(year) or 0) < YEARLY_CAP}
+        if not years:
+            return 0
+        # attempted_at ranges rather than __year so (user, attempted_at) is used
+        in_years = Q()
+        for year in years:
+            start, end = _year_range(year)
+            in_years |= Q(attempted_at__gte=start, attempted_at__lt=end)
+        accuracy = {
+            row['year']: (row['correct'], row['total'])
+            for row in UserQuestionAttempt.objects.filter(in_years, user_id=user_id)
+            .annotate(year=ExtractYear('attempted_at'))
+            .values('year')
+            .annotate(
+                total=Count('id'),
+                correct=Count('id', filter=Q(is_correct=True)),
+            )
+            .order_by()
+        }
+
+        new_credits = []
+        for candidate in candidates:
+            year = timezone.localtime(candidate['first_correct_at']).year
+            if year not in years:
+                continue
+            correct, total = accuracy.get(year, (0, 0))
+            if not total or Decimal(correct) / total < PASSING_RATIO:
+                continue
+            activity = (
+                activities.get(candidate['question__specialty_id'])
+                or activities.get(None)
+            )
+            if activity is None:
+                continue
+            year_total = used.get(year) or Decimal('0')
+            if year_total + activity.credits > YEARLY_CAP:
+                continue
+            used[year] = year_total + activity.credits
+            new_credits.append(UserCMECredit(
+                user_id=user_id,
+                activity=activity,
+                question_id=candidate['question_id'],
+                credits_earned=activity.credits,
+                credit_year=year,
+            ))
+
+        UserCMECredit.objects.bulk_create(new_credits, ignore_conflicts=True)
+        # A credit written meanwhile by another path (admin, signal) makes
+        # its insert a no-op: only rows that were inserted reach the ledger
+        inserted = set(UserCMECredit.objects.filter(
+            pk__in=[credit.pk for credit in new_credits],
+        ).values_list('pk', flat=True))
+        new_credits = [credit for credit in new_credits if credit.pk in inserted]
+
+        # New credits are all EARNED: they only add to the ledger totals
+        earned = {}
+        for credit in new_credits:
+            key = (credit.credit_year, credit.activity.activity_type)
+            earned[key] = earned.get(key, Decimal('0')) + credit.credits_earned
+        CMECreditLedger.apply(user_id, {
+            key: (total, Decimal('0'), Decimal('0')) for key, total in earned.items()
+        })
+    return len(new_credits)
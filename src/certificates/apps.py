@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class CertificatesConfig(AppConfig):
     name = 'certificates'
+
+    def ready(self):
+        from certificates import signals  # noqa: F401
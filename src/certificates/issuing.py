@@ -0,0 +1,236 @@
+"""
+Certificate issuance: eligibility, rendering off the request path and storage.
+
+PDFs are rendered by certificates.rendering in a process pool (rendering is
+CPU-bound, so threads would serialize on the GIL) and stored
+content-addressed under certificates/pdfs/<hash[:2]>/<hash>.pdf, where the
+hash covers everything that appears on the certificate. Re-issuing a
+certificate whose content has not changed is a cache hit: nothing is
+rendered or written.
+
+CORE certificates are issued automatically (in the background) when a user
+completes their last CORE badge; yearly CME certificates are issued in bulk
+with: python manage.py issue_certificates --type cme --year 2026
+"""
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max, Sum
+
+from certificates.accrual import YEARLY_CAP
+from certificates.models import Certificate, CMECreditLedger, UserCOREProgress
+from certificates.rendering import payload_hash, render_certificate
+
+logger = logging.getLogger(__name__)
+
+STORAGE_DIR = 'certificates/pdfs'
+
+UPDATE_FIELDS = [
+    'credit_year', 'title', 'description', 'total_credits', 'content_hash', 'pdf_file',
+]
+
+_pool = None
+
+
+def _get_pool():
+    """Shared render pool; None (render inline) when CERTIFICATE_RENDER_WORKERS is 0."""
+    global _pool
+    workers = getattr(settings, 'CERTIFICATE_RENDER_WORKERS', 2)
+    if _pool is None and workers > 0:
+        _pool = ProcessPoolExecutor(max_workers=workers)
+    return _pool
+
+
+def storage_path(content_hash):
+    return f'{STORAGE_DIR}/{content_hash[:2]}/{content_hash}.pdf'
+
+
+# ─────────────────────────────────────────────
+# Payloads — everything printed on a certificate, as plain strings
+# ─────────────────────────────────────────────
+def _recipient(user):
+    return user.get_full_name().strip() or user.email
+
+
+def core_spec(user, completed_at):
+    """Certificate fields + render payload for CORE completion."""
+    return {
+        'user_id': user.id,
+        'certificate_type': Certificate.CertificateType.CORE,
+        'credit_year': completed_at.year,
+        'title': 'CORE Completion Certificate',
+        'description': 'Awarded for completing all CORE badges.',
+        'total_credits': Decimal('0'),
+        'payload': {
+            'title': 'CORE Completion Certificate',
+            'subtitle': 'of CORE Completion',
+            'recipient': _recipient(user),
+            'description': (
+                'has earned every CORE badge by scoring at least 50% on the '
+                'last 30 questions in each CORE specialty.'
+            ),
+            'credits': '',
+            'issued_on': completed_at.strftime('%B %d, %Y'),
+            'reference': f'CORE-{user.id.hex[:8].upper()}',
+        },
+    }
+
+
+def cme_spec(user, year, credits):
+    """Certificate fields + render payload for a year's CME credits."""
+    credits = min(Decimal(credits), YEARLY_CAP).quantize(Decimal('0.01'))
+    return {
+        'user_id': user.id,
+        'certificate_type': Certificate.CertificateType.CME,
+        'credit_year': year,
+        'title': f'CME Completion Certificate — {year}',
+        'description': f'Awarded for completing {credits} CME credits in {year}.',
+        'total_credits': credits,
+        'payload': {
+            'title': f'CME Completion Certificate — {year}',
+            'subtitle': 'of Continuing Medical Education',
+            'recipient': _recipient(user),
+            'description': (
+                f'has completed continuing medical education activities on the '
+                f'MEDIGEST Health platform during the {year} calendar year.'
+            ),
+            'credits': f'{credits} CME credits',
+            'issued_on': date(year, 12, 31).strftime('%B %d, %Y'),
+            'reference': f'CME-{year}-{user.id.hex[:8].upper()}',
+        },
+    }
+
+
+# ─────────────────────────────────────────────
+# Eligibility
+# ─────────────────────────────────────────────
+def core_completions(user_ids=None):
+    """{user_id: completed_at} for users holding every CORE badge."""
+    from books.models import Specialty
+
+    required = Specialty.objects.filter(is_core_specialty=True).count()
+    if not required:
+        return {}
+    rows = UserCOREProgress.objects.filter(
+        specialty__is_core_specialty=True,
+        badge_status=UserCOREProgress.BadgeStatus.COMPLETED,
+    )
+    if user_ids is not None:
+        rows = rows.filter(user_id__in=user_ids)
+    return dict(
+        rows.values('user_id')
+        .annotate(badges=Count('id'), completed_at=Max('badge_earned_at'))
+        .filter(badges=required, completed_at__isnull=False)
+        .values_list('user_id', 'completed_at')
+    )
+
+
+def cme_totals(year, user_ids=None):
+    """{user_id: credits earned in `year`} for users with any credits."""
+    rows = CMECreditLedger.objects.filter(credit_year=year)
+    if user_ids is not None:
+        rows = rows.filter(user_id__in=user_ids)
+    return dict(
+        rows.values('user_id')
+        .annotate(total=Sum('total_credits'))
+        .filter(total__gt=0)
+        .values_list('user_id', 'total')
+    )
+
+
+def core_specs(user_ids=None):
+    completions = core_completions(user_ids)
+    users = get_user_model().objects.in_bulk(list(completions))
+    return [core_spec(users[uid], at) for uid, at in completions.items()]
+
+
+def cme_specs(year, user_ids=None):
+    totals = cme_totals(year, user_ids)
+    users = get_user_model().objects.in_bulk(list(totals))
+    return [cme_spec(users[uid], year, total) for uid, total in totals.items()]
+
+
+# ─────────────────────────────────────────────
+# Issuing
+# ─────────────────────────────────────────────
+def _key(user_id, certificate_type, credit_year):
+    # A user has one CORE certificate, and one CME certificate per year
+    if certificate_type == Certificate.CertificateType.CORE:
+        credit_year = None
+    return user_id, certificate_type, credit_year
+
+
+def issue(specs, pool=None, chunksize=8):
+    """
+    Create or refresh the certificates described by `specs`.
+    Unchanged certificates are skipped; the rest are rendered on `pool`
+    (the shared process pool by default, inline when the pool is disabled)
+    and saved with one bulk insert and one bulk update.
+    Returns (issued, unchanged).
+    """
+    specs = list(specs)
+    if not specs:
+        return 0, 0
+
+    existing = {}
+    certs = Certificate.objects.filter(
+        user_id__in={spec['user_id'] for spec in specs},
+        certificate_type__in={spec['certificate_type'] for spec in specs},
+    ).order_by('issued_at')
+    for cert in certs:
+        existing[_key(cert.user_id, cert.certificate_type, cert.credit_year)] = cert
+
+    stale = []
+    for spec in specs:
+        spec['hash'] = payload_hash(spec['payload'])
+        cert = existing.get(_key(spec['user_id'], spec['certificate_type'], spec['credit_year']))
+        if not (cert and cert.content_hash == spec['hash'] and cert.pdf_file):
+            stale.append((spec, cert))
+    if not stale:
+        return 0, len(specs)
+
+    # A file already in storage (same content) is reused as-is
+    to_render = [
+        spec for spec, _ in stale
+        if not default_storage.exists(storage_path(spec['hash']))
+    ]
+    payloads = [spec['payload'] for spec in to_render]
+    pool = _get_pool() if pool is None else pool
+    if pool:
+        rendered = pool.map(render_certificate, payloads, chunksize=chunksize)
+    else:
+        rendered = map(render_certificate, payloads)
+    for spec, pdf in zip(to_render, rendered):
+        path = storage_path(spec['hash'])
+        if not default_storage.exists(path):
+            default_storage.save(path, ContentFile(pdf))
+
+    created, updated = [], []
+    for spec, cert in stale:
+        if cert is None:
+            cert = Certificate(user_id=spec['user_id'], certificate_type=spec['certificate_type'])
+            created.append(cert)
+        else:
+            updated.append(cert)
+        for field in UPDATE_FIELDS[:-2]:
+            setattr(cert, field, spec[field])
+        cert.content_hash = spec['hash']
+        cert.pdf_file.name = storage_path(spec['hash'])
+    Certificate.objects.bulk_create(created, batch_size=500)
+    Certificate.objects.bulk_update(updated, UPDATE_FIELDS, batch_size=500)
+    return len(stale), len(specs) - len(stale)
+
+
+def issue_core_certificate(user_id):
+    """Background job: issue the user's CORE certificate once every badge is earned."""
+    specs = core_specs([user_id])
+    if specs:
+        issued, _ = issue(specs)
+        if issued:
+            logger.info('Issued CORE certificate for user %s', user_id)
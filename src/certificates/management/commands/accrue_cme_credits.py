@@ -0,0 +1,62 @@
+"""
+Create missing CME credits from question attempts (backfill / catch-up).
+Usage: python manage.py accrue_cme_credits [--since 2026-01-01] [--user email]
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from certificates import accrual
+from questions.models import UserQuestionAttempt
+
+
+class Command(BaseCommand):
+    help = "Accrue CME credits for correctly answered questions that have not earned credit yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help="Only consider attempts on or after this date (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            '--user',
+            help="Only accrue credits for the user with this email.",
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help="Number of user IDs fetched per database round trip (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = timezone.make_aware(
+                    datetime.strptime(options['since'], '%Y-%m-%d')
+                )
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format.')
+
+        attempts = UserQuestionAttempt.objects.filter(is_correct=True)
+        if since:
+            attempts = attempts.filter(attempted_at__gte=since)
+        if options['user']:
+            attempts = attempts.filter(user__email=options['user'])
+        user_ids = (
+            attempts.order_by('user_id')
+            .values_list('user_id', flat=True)
+            .distinct()
+        )
+
+        users = 0
+        created = 0
+        for user_id in user_ids.iterator(chunk_size=options['chunk_size']):
+            created += accrual.accrue_for_user(user_id, since=since)
+            users += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Created {created} CME credits for {users} users."
+        ))
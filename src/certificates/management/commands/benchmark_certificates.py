@@ -0,0 +1,78 @@
+"""
+Measure certificate rendering throughput (certificates per second).
+Usage: python manage.py benchmark_certificates [--count 500] [--workers 1 2 4]
+Renders synthetic payloads only; nothing is written to the database or storage.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from certificates.rendering import payload_hash, render_certificate
+
+
+def _payload(n):
+    return {
+        'title': 'CME Completion Certificate — 2026',
+        'subtitle': 'of Continuing Medical Education',
+        'recipient': f'Dr. Benchmark User {n}',
+        'description': (
+            'has completed continuing medical education activities on the '
+            'MEDIGEST Health platform during the 2026 calendar year.'
+        ),
+        'credits': f'{n % 300}.50 CME credits',
+        'issued_on': 'December 31, 2026',
+        'reference': f'CME-2026-{n:08X}',
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark certificate PDF rendering with different process pool sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=500,
+            help="Certificates rendered per run (default: 500).",
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            nargs='+',
+            default=[0, os.cpu_count() or 1],
+            help="Pool sizes to compare; 0 renders in this process.",
+        )
+        parser.add_argument(
+            '--chunksize',
+            type=int,
+            default=8,
+            help="Payloads sent to a worker at a time (default: 8).",
+        )
+
+    def handle(self, *args, **options):
+        payloads = [_payload(n) for n in range(options['count'])]
+
+        started = time.perf_counter()
+        for payload in payloads:
+            payload_hash(payload)
+        hash_rate = len(payloads) / (time.perf_counter() - started)
+        self.stdout.write(f"Content hashing (cache check): {hash_rate:,.0f} certificates/s")
+
+        for workers in options['workers']:
+            started = time.perf_counter()
+            if workers > 0:
+                with ProcessPoolExecutor(workers) as pool:
+                    size = sum(map(len, pool.map(
+                        render_certificate, payloads, chunksize=options['chunksize'],
+                    )))
+            else:
+                size = sum(len(render_certificate(p)) for p in payloads)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"workers={workers}: {len(payloads) / elapsed:,.1f} certificates/s "
+                f"({elapsed:.2f}s, avg {size / len(payloads) / 1024:.1f} KB)"
+            )
+
+        self.stdout.write(self.style.SUCCESS("✅ Benchmark complete."))
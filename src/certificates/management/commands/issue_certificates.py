@@ -0,0 +1,76 @@
+"""
+Issue CORE completion and yearly CME certificates for every eligible user.
+Usage: python manage.py issue_certificates [--type cme|core|all] [--year 2026] [--workers 3] [--user email]
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from certificates import issuing
+
+
+class Command(BaseCommand):
+    help = "Render and store certificates for eligible users; unchanged certificates are skipped."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            choices=['cme', 'core', 'all'],
+            default='all',
+            help="Which certificates to issue (default: all).",
+        )
+        parser.add_argument(
+            '--year',
+            type=int,
+            default=timezone.now().year,
+            help="Credit year for CME certificates (default: current year).",
+        )
+        parser.add_argument(
+            '--user',
+            help="Only issue certificates for the user with this email.",
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=(os.cpu_count() or 1) - 1,
+            help="Render processes; 0 renders in this process (default: CPU count - 1).",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help="Certificates rendered and saved per batch (default: 200).",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = None
+        if options['user']:
+            user = get_user_model().objects.filter(email=options['user']).first()
+            if not user:
+                raise CommandError(f"No user with email {options['user']}.")
+            user_ids = [user.id]
+
+        specs = []
+        if options['type'] in ('core', 'all'):
+            specs += issuing.core_specs(user_ids)
+        if options['type'] in ('cme', 'all'):
+            specs += issuing.cme_specs(options['year'], user_ids)
+
+        pool = ProcessPoolExecutor(options['workers']) if options['workers'] > 0 else False
+        issued = unchanged = 0
+        try:
+            batch_size = options['batch_size']
+            for start in range(0, len(specs), batch_size):
+                done, skipped = issuing.issue(specs[start:start + batch_size], pool=pool)
+                issued += done
+                unchanged += skipped
+        finally:
+            if pool:
+                pool.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Issued {issued} certificates ({unchanged} unchanged)."
+        ))
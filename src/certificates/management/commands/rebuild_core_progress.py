@@ -0,0 +1,94 @@
+"""
+Rebuild UserCOREProgress counters and badges by replaying UserQuestionAttempt history.
+Usage: python manage.py rebuild_core_progress [--chunk-size 2000] [--user email]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from certificates.models import UserCOREProgress
+from questions.models import UserQuestionAttempt
+
+
+class Command(BaseCommand):
+    help = "Replay attempts in CORE specialties to recompute CORE progress and badges."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help="Number of attempts fetched per database round trip (default: 2000).",
+        )
+        parser.add_argument(
+            '--user',
+            help="Only rebuild progress for the user with this email.",
+        )
+
+    def handle(self, *args, **options):
+        attempts = UserQuestionAttempt.objects.filter(
+            question__specialty__is_core_specialty=True,
+        )
+        if options['user']:
+            attempts = attempts.filter(user__email=options['user'])
+        attempts = (
+            attempts.order_by('user_id', 'attempted_at', 'id')
+            .values_list(
+                'user_id', 'question_id', 'question__specialty_id',
+                'is_correct', 'attempted_at',
+            )
+        )
+
+        users = 0
+        replayed = 0
+        current_user = None
+        answers = []
+
+        for user_id, question_id, specialty_id, is_correct, at in attempts.iterator(
+            chunk_size=options['chunk_size'],
+        ):
+            if user_id != current_user:
+                if answers:
+                    self._rebuild_user(current_user, answers)
+                    users += 1
+                current_user = user_id
+                answers = []
+            answers.append((question_id, specialty_id, is_correct, at))
+            replayed += 1
+
+        if answers:
+            self._rebuild_user(current_user, answers)
+            users += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Replayed {replayed} attempts for {users} users."
+        ))
+
+    def _rebuild_user(self, user_id, answers):
+        """Reset the user's CORE rows and replay their answers in order."""
+        with transaction.atomic():
+            rows = {
+                p.specialty_id: p
+                for p in UserCOREProgress.objects.select_for_update().filter(user_id=user_id)
+            }
+            for progress in rows.values():
+                progress.reset_counters()
+
+            new_rows = []
+            seen = {}
+            for question_id, specialty_id, is_correct, at in answers:
+                progress = rows.get(specialty_id)
+                if progress is None:
+                    progress = rows[specialty_id] = UserCOREProgress(
+                        user_id=user_id, specialty_id=specialty_id,
+                    )
+                    new_rows.append(progress)
+                previous = seen.get(question_id, (0, None))
+                progress.apply_answer(is_correct, previous, at)
+                progress.updated_at = at
+                seen[question_id] = (previous[0] + 1, is_correct)
+
+            UserCOREProgress.objects.bulk_update(
+                [p for p in rows.values() if p not in new_rows],
+                UserCOREProgress.COUNTER_FIELDS,
+            )
+            UserCOREProgress.objects.bulk_create(new_rows)
@@ -0,0 +1,89 @@
+"""
+Verify the CME credit ledger against the raw UserCMECredit rows.
+Usage: python manage.py reconcile_cme_ledger [--fix]
+"""
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from certificates.models import CMECreditLedger, UserCMECredit
+
+ZERO = Decimal('0')
+
+
+class Command(BaseCommand):
+    help = "Compare CME ledger sums with the raw credits and optionally repair them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help="Rewrite mismatched ledger rows from the raw credits.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            expected = {}
+            rows = (
+                UserCMECredit.objects
+                .values('user_id', 'credit_year', 'activity__activity_type')
+                .annotate(
+                    total=Sum('credits_earned'),
+                    submitted=Sum('credits_earned', filter=Q(status=UserCMECredit.Status.SUBMITTED)),
+                    verified=Sum('credits_earned', filter=Q(status=UserCMECredit.Status.VERIFIED)),
+                )
+                .order_by()
+            )
+            for row in rows:
+                key = (row['user_id'], row['credit_year'], row['activity__activity_type'] or '')
+                expected[key] = (
+                    row['total'] or ZERO, row['submitted'] or ZERO, row['verified'] or ZERO,
+                )
+
+            ledger = {
+                (entry.user_id, entry.credit_year, entry.activity_type): entry
+                for entry in CMECreditLedger.objects.select_for_update()
+            }
+
+            mismatched = []
+            for key in expected.keys() | ledger.keys():
+                sums = expected.get(key, (ZERO, ZERO, ZERO))
+                entry = ledger.get(key)
+                actual = (
+                    (entry.total_credits, entry.submitted_credits, entry.verified_credits)
+                    if entry else (ZERO, ZERO, ZERO)
+                )
+                if sums != actual:
+                    mismatched.append((key, sums, actual))
+                    self.stdout.write(self.style.WARNING(
+                        f"⚠️  user={key[0]} year={key[1]} type={key[2] or '-'}: "
+                        f"ledger {actual} != credits {sums}"
+                    ))
+
+            if options['fix'] and mismatched:
+                to_create, to_update = [], []
+                for key, sums, _ in mismatched:
+                    entry = ledger.get(key)
+                    if entry is None:
+                        entry = CMECreditLedger(
+                            user_id=key[0], credit_year=key[1], activity_type=key[2],
+                        )
+                        to_create.append(entry)
+                    else:
+                        to_update.append(entry)
+                    entry.total_credits, entry.submitted_credits, entry.verified_credits = sums
+                CMECreditLedger.objects.bulk_update(to_update, CMECreditLedger.SUM_FIELDS)
+                CMECreditLedger.objects.bulk_create(to_create)
+
+        if not mismatched:
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Ledger matches credits ({len(expected)} user/year/type groups)."
+            ))
+        elif options['fix']:
+            self.stdout.write(self.style.SUCCESS(f"✅ Repaired {len(mismatched)} ledger rows."))
+        else:
+            self.stdout.write(self.style.ERROR(
+                f"❌ {len(mismatched)} ledger rows differ. Run with --fix to repair."
+            ))
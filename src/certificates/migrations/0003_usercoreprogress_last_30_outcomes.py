@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0002_certificate_credit_year_usercmecredit_credit_year_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usercoreprogress',
+            name='last_30_outcomes',
+            field=models.PositiveIntegerField(default=0, help_text='Outcomes of the last 30 answers as bits (1 = correct), newest in bit 0.'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-17 14:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0003_usercoreprogress_last_30_outcomes'),
+        ('questions', '0007_quizsession_answered_count_final_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='usercmecredit',
+            constraint=models.UniqueConstraint(condition=models.Q(('question__isnull', False)), fields=('user', 'question'), name='unique_cme_credit_per_user_question'),
+        ),
+    ]
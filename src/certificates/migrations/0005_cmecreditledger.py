@@ -0,0 +1,64 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:10
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+
+def build_ledger(apps, schema_editor):
+    """Populate the ledger from existing credits."""
+    UserCMECredit = apps.get_model('certificates', 'UserCMECredit')
+    CMECreditLedger = apps.get_model('certificates', 'CMECreditLedger')
+
+    rows = (
+        UserCMECredit.objects.values('user_id', 'credit_year', 'activity__activity_type')
+        .annotate(
+            total=Sum('credits_earned'),
+            submitted=Sum('credits_earned', filter=Q(status='submitted')),
+            verified=Sum('credits_earned', filter=Q(status='verified')),
+        )
+        .order_by()
+    )
+    CMECreditLedger.objects.bulk_create([
+        CMECreditLedger(
+            user_id=row['user_id'],
+            credit_year=row['credit_year'],
+            activity_type=row['activity__activity_type'] or '',
+            total_credits=row['total'] or 0,
+            submitted_credits=row['submitted'] or 0,
+            verified_credits=row['verified'] or 0,
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0004_usercmecredit_unique_question'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CMECreditLedger',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('credit_year', models.PositiveIntegerField()),
+                ('activity_type', models.CharField(blank=True, choices=[('syllabus', 'Syllabus Reading'), ('quiz', 'Quiz Completion'), ('board_basics', 'Board Basics'), ('question', 'Individual Question')], help_text='Blank for credits without an activity.', max_length=20)),
+                ('total_credits', models.DecimalField(decimal_places=2, default=0, help_text='All credits earned (any status).', max_digits=8)),
+                ('submitted_credits', models.DecimalField(decimal_places=2, default=0, help_text='Credits currently in "submitted" status.', max_digits=8)),
+                ('verified_credits', models.DecimalField(decimal_places=2, default=0, help_text='Credits currently in "verified" status.', max_digits=8)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cme_ledger', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'CME Credit Ledger',
+                'verbose_name_plural': 'CME Credit Ledger',
+                'unique_together': {('user', 'credit_year', 'activity_type')},
+            },
+        ),
+        migrations.RunPython(build_ledger, migrations.RunPython.noop),
+    ]
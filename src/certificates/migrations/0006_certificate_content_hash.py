@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0005_cmecreditledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the certificate content (and renderer version); names the stored PDF.', max_length=64),
+        ),
+    ]
@@ -1,6 +1,10 @@
 import uuid
-from django.db import models
+from decimal import Decimal
+
+from django.db import IntegrityError, models, transaction
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 
 class CMEActivity(models.Model):
@@ -42,6 +46,14 @@ class CMEActivity(models.Model):
     def __str__(self):
         return f'{self.title} ({self.credits} credits)'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The ledger files credits under their activity's type: a save that
+        # changes it moves the sums (certificates/signals.py)
+        instance._loaded_activity_type = instance.__dict__.get('activity_type')
+        return instance
+
 
 class UserCMECredit(models.Model):
     """
@@ -89,10 +101,186 @@ class UserCMECredit(models.Model):
         verbose_name = 'User CME Credit'
         verbose_name_plural = 'User CME Credits'
         ordering = ['-earned_at']
+        constraints = [
+            # A question earns CME credit at most once per user (accrual is idempotent)
+            models.UniqueConstraint(
+                fields=['user', 'question'],
+                condition=models.Q(question__isnull=False),
+                name='unique_cme_credit_per_user_question',
+            ),
+        ]
+
+    # Stored values that decide which ledger row a credit counts in, and how
+    LEDGER_FIELDS = ('user_id', 'credit_year', 'activity_id', 'status', 'credits_earned')
 
     def __str__(self):
         return f'{self.user.email}: {self.credits_earned} credits — {self.credit_year}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_ledger_state()
+        return instance
+
+    def remember_ledger_state(self, stored=None):
+        """
+        Keep the values the row is stored with, so a later save moves only
+        the difference in the ledger without reading the row again.
+        Deferred fields take their value from `stored` (an earlier state);
+        without one the state is unknown (None).
+        """
+        deferred = self.get_deferred_fields()
+        if stored is None and deferred.intersection(self.LEDGER_FIELDS):
+            self._ledger_state = None
+        else:
+            self._ledger_state = tuple(
+                stored[i] if field in deferred else getattr(self, field)
+                for i, field in enumerate(self.LEDGER_FIELDS)
+            )
+        return self._ledger_state
+
+
+class CMECreditLedger(models.Model):
+    """
+    Running CME credit sums per (user, year, activity type).
+    Maintained in the same transaction as every credit insert, status change
+    and delete (and activity type change or delete), so the CME dashboard, history totals and the yearly cap read
+    a handful of rows instead of aggregating every micro-credit.
+    Verify against the raw credits with: python manage.py reconcile_cme_ledger
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name='cme_ledger'
+    )
+    credit_year = models.PositiveIntegerField()
+    activity_type = models.CharField(
+        max_length=20, choices=CMEActivity.ActivityType.choices, blank=True,
+        help_text='Blank for credits without an activity.'
+    )
+    total_credits = models.DecimalField(
+        max_digits=8, decimal_places=2, default=0,
+        help_text='All credits earned (any status).'
+    )
+    submitted_credits = models.DecimalField(
+        max_digits=8, decimal_places=2, default=0,
+        help_text='Credits currently in "submitted" status.'
+    )
+    verified_credits = models.DecimalField(
+        max_digits=8, decimal_places=2, default=0,
+        help_text='Credits currently in "verified" status.'
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    SUM_FIELDS = ('total_credits', 'submitted_credits', 'verified_credits')
+
+    class Meta:
+        verbose_name = 'CME Credit Ledger'
+        verbose_name_plural = 'CME Credit Ledger'
+        unique_together = ['user', 'credit_year', 'activity_type']
+
+    def __str__(self):
+        return f'{self.user_id} — {self.credit_year} {self.activity_type or "other"}: {self.total_credits}'
+
+    @staticmethod
+    def contribution(status, credits):
+        """(total, submitted, verified) amounts a credit adds to its ledger row."""
+        credits = Decimal(credits or 0)
+        return (
+            credits,
+            credits if status == UserCMECredit.Status.SUBMITTED else Decimal('0'),
+            credits if status == UserCMECredit.Status.VERIFIED else Decimal('0'),
+        )
+
+    @classmethod
+    def apply(cls, user_id, deltas):
+        """
+        Add `deltas` — {(credit_year, activity_type): (total, submitted, verified)}
+        — to the user's ledger rows with database-side increments.
+        """
+        for (year, activity_type), amounts in deltas.items():
+            if not any(amounts):
+                continue
+            changes = {
+                field: models.F(field) + amount
+                for field, amount in zip(cls.SUM_FIELDS, amounts)
+            }
+            changes['updated_at'] = timezone.now()
+            rows = cls.objects.filter(
+                user_id=user_id, credit_year=year, activity_type=activity_type or '',
+            )
+            if rows.update(**changes) or all(amount <= 0 for amount in amounts):
+                # Nothing to subtract from a missing row (e.g. a cascade delete)
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        user_id=user_id, credit_year=year,
+                        activity_type=activity_type or '',
+                        **dict(zip(cls.SUM_FIELDS, amounts)),
+                    )
+            except IntegrityError:
+                # A concurrent request created the row first
+                rows.update(**changes)
+
+    @classmethod
+    def move_status(cls, user_id, credits, new_status):
+        """
+        Set `credits` (a queryset of one user's credits) to `new_status` and
+        move their amounts between the ledger's status columns.
+        """
+        deltas = {}
+        rows = (
+            credits.values('credit_year', 'activity__activity_type', 'status')
+            .annotate(amount=models.Sum('credits_earned'))
+            .order_by()
+        )
+        for row in rows:
+            key = (row['credit_year'], row['activity__activity_type'] or '')
+            before = cls.contribution(row['status'], row['amount'])
+            after = cls.contribution(new_status, row['amount'])
+            current = deltas.get(key, (Decimal('0'),) * 3)
+            deltas[key] = tuple(c + a - b for c, a, b in zip(current, after, before))
+        updated = credits.update(status=new_status)
+        cls.apply(user_id, deltas)
+        return updated
+
+    @classmethod
+    def move_activity(cls, activity_id, old_type, new_type=None):
+        """
+        Move the sums of one activity's credits from their `old_type` ledger
+        rows to `new_type` rows, or remove them when `new_type` is None (the
+        activity and its credits are being deleted).
+        """
+        rows = (
+            UserCMECredit.objects.filter(activity_id=activity_id)
+            .values('user_id', 'credit_year', 'status')
+            .annotate(amount=models.Sum('credits_earned'))
+            .order_by()
+        )
+        deltas = {}
+        for row in rows:
+            amounts = cls.contribution(row['status'], row['amount'])
+            user_deltas = deltas.setdefault(row['user_id'], {})
+            for activity_type, sign in ((old_type, -1), (new_type, 1)):
+                if activity_type is None:
+                    continue
+                key = (row['credit_year'], activity_type)
+                current = user_deltas.get(key, (Decimal('0'),) * 3)
+                user_deltas[key] = tuple(c + sign * a for c, a in zip(current, amounts))
+        for user_id, user_deltas in deltas.items():
+            cls.apply(user_id, user_deltas)
+
+    @classmethod
+    def year_summary(cls, user, year):
+        """Total credits and per-activity-type totals for a user's year (one query)."""
+        by_type = dict(
+            cls.objects.filter(user=user, credit_year=year)
+            .values_list('activity_type', 'total_credits')
+        )
+        return sum(by_type.values(), Decimal('0')), by_type
+
 
 class CMESubmission(models.Model):
     """
@@ -147,6 +335,62 @@ class CMESubmission(models.Model):
     def __str__(self):
         return f'{self.user.email}: {self.credits_claimed} credits → {self.get_accreditation_body_display()}'
 
+    @classmethod
+    def claim(cls, user, credit_ids, accreditation_body):
+        """
+        Claim the user's EARNED credits among `credit_ids` in one transaction.
+        The credit rows are locked first, so concurrent claims can never both
+        include a credit; credits that are already submitted are skipped.
+        Raises ValidationError when nothing is claimable, when the credits span
+        several years, or when the claim would exceed the yearly cap.
+        """
+        from certificates.accrual import YEARLY_CAP
+
+        with transaction.atomic():
+            claimable = list(
+                UserCMECredit.objects.select_for_update()
+                .filter(user=user, id__in=credit_ids, status=UserCMECredit.Status.EARNED)
+                .values_list('id', 'credits_earned', 'credit_year')
+            )
+            if not claimable:
+                raise ValidationError('No earned credits to submit.')
+            years = {year for _, _, year in claimable}
+            if len(years) > 1:
+                raise ValidationError('Credits from different years must be claimed separately.')
+            year = years.pop()
+            total = sum((amount for _, amount, _ in claimable), Decimal('0'))
+
+            already_claimed = CMECreditLedger.objects.filter(
+                user=user, credit_year=year,
+            ).aggregate(
+                submitted=models.Sum('submitted_credits'),
+                verified=models.Sum('verified_credits'),
+            )
+            claimed = (already_claimed['submitted'] or 0) + (already_claimed['verified'] or 0)
+            if claimed + total > YEARLY_CAP:
+                raise ValidationError(
+                    f'Claim exceeds the {YEARLY_CAP} credit cap for {year} '
+                    f'({claimed} already claimed).'
+                )
+
+            submission = cls.objects.create(
+                user=user,
+                accreditation_body=accreditation_body,
+                credits_claimed=total,
+                credit_year=year,
+            )
+            ids = [credit_id for credit_id, _, _ in claimable]
+            cls.credits.through.objects.bulk_create([
+                cls.credits.through(cmesubmission_id=submission.id, usercmecredit_id=credit_id)
+                for credit_id in ids
+            ], batch_size=500)
+            CMECreditLedger.move_status(
+                user.id,
+                UserCMECredit.objects.filter(id__in=ids, status=UserCMECredit.Status.EARNED),
+                UserCMECredit.Status.SUBMITTED,
+            )
+        return submission
+
 
 class UserCOREProgress(models.Model):
     """
@@ -160,6 +404,14 @@ class UserCOREProgress(models.Model):
         IN_PROGRESS = 'in_progress', 'In Progress'
         COMPLETED = 'completed', 'Completed'
 
+    WINDOW_SIZE = 30
+    WINDOW_MASK = (1 << WINDOW_SIZE) - 1
+    COUNTER_FIELDS = [
+        'badge_status', 'questions_answered', 'questions_correct',
+        'last_30_correct', 'last_30_total', 'last_30_outcomes',
+        'core_quiz_unlocked', 'badge_earned_at', 'last_accessed_at', 'updated_at',
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
@@ -190,6 +442,10 @@ class UserCOREProgress(models.Model):
         default=0,
         help_text='Total answers in the last 30 questions window.'
     )
+    last_30_outcomes = models.PositiveIntegerField(
+        default=0,
+        help_text='Outcomes of the last 30 answers as bits (1 = correct), newest in bit 0.'
+    )
     core_quiz_unlocked = models.BooleanField(
         default=False,
         help_text='True when user scores ≥50% on last 30 questions.'
@@ -220,8 +476,11 @@ class UserCOREProgress(models.Model):
     def progress_percentage(self):
         if self.questions_answered == 0:
             return 0
-        total_questions = self.specialty.questions.count()
-        if total_questions == 0:
+        return self.progress_percentage_of(self.specialty.questions.count())
+
+    def progress_percentage_of(self, total_questions):
+        """Progress against a known question total (avoids a COUNT per badge)."""
+        if self.questions_answered == 0 or total_questions == 0:
             return 0
         return round((self.questions_answered / total_questions) * 100, 1)
 
@@ -231,11 +490,134 @@ class UserCOREProgress(models.Model):
             return 0
         return round((self.questions_correct / self.questions_answered) * 100, 1)
 
+    def apply_answer(self, is_correct, previous, answered_at):
+        """
+        Fold one answer into the counters and the rolling 30-answer window.
+        `previous` is the user's prior (attempt_count, is_correct) for the
+        question, so questions_answered / questions_correct stay distinct.
+        Unlocks the CORE quiz and completes the badge once the last 30
+        answers are at least 50% correct; a completed badge is kept.
+        """
+        previous_count, previous_correct = previous
+        if not previous_count:
+            self.questions_answered += 1
+        self.questions_correct = max(
+            0, self.questions_correct + int(is_correct) - int(bool(previous_correct)),
+        )
+
+        self.last_30_outcomes = (
+            (self.last_30_outcomes << 1) | int(is_correct)
+        ) & self.WINDOW_MASK
+        self.last_30_total = min(self.last_30_total + 1, self.WINDOW_SIZE)
+        self.last_30_correct = self.last_30_outcomes.bit_count()
+        self.last_accessed_at = answered_at
+
+        if self.badge_status == self.BadgeStatus.PENDING:
+            self.badge_status = self.BadgeStatus.IN_PROGRESS
+        if (
+            not self.core_quiz_unlocked
+            and self.last_30_total == self.WINDOW_SIZE
+            and self.last_30_correct * 2 >= self.WINDOW_SIZE
+        ):
+            self.core_quiz_unlocked = True
+            self.badge_status = self.BadgeStatus.COMPLETED
+            self.badge_earned_at = answered_at
+
+    def reset_counters(self):
+        """Zero every derived field before a replay from history."""
+        self.badge_status = self.BadgeStatus.PENDING
+        self.questions_answered = self.questions_correct = 0
+        self.last_30_correct = self.last_30_total = self.last_30_outcomes = 0
+        self.core_quiz_unlocked = False
+        self.badge_earned_at = self.last_accessed_at = None
+
+    @classmethod
+    def for_user(cls, user):
+        """
+        The user's progress rows for every CORE specialty, in display order.
+        One read for the specialties and one for the rows; missing rows are
+        created with a single bulk insert.
+        """
+        from books.models import Specialty
+
+        specialties = list(
+            Specialty.objects.filter(is_core_specialty=True)
+            .order_by('core_display_order')
+        )
+        rows = {
+            p.specialty_id: p
+            for p in cls.objects.filter(user=user, specialty__in=specialties)
+        }
+        missing = [spec.id for spec in specialties if spec.id not in rows]
+        if missing:
+            cls.objects.bulk_create(
+                [cls(user=user, specialty_id=sid) for sid in missing],
+                ignore_conflicts=True,
+            )
+            rows.update(
+                (p.specialty_id, p)
+                for p in cls.objects.filter(user=user, specialty_id__in=missing)
+            )
+
+        badges = []
+        for spec in specialties:
+            progress = rows[spec.id]
+            progress.specialty = spec
+            badges.append(progress)
+        return badges
+
+    @classmethod
+    def record_answers(cls, user_id, answers, answered_at=None):
+        """
+        Apply answers to a user's CORE progress rows under a row lock.
+        `answers` is an ordered iterable of (specialty_id, is_correct, previous)
+        for questions in CORE specialties; missing rows are created.
+        Returns True when one of the badges was completed by these answers.
+        """
+        answered_at = answered_at or timezone.now()
+        by_specialty = {}
+        for specialty_id, is_correct, previous in answers:
+            by_specialty.setdefault(specialty_id, []).append((is_correct, previous))
+        if not by_specialty:
+            return False
+
+        with transaction.atomic():
+            locked = cls.objects.select_for_update().filter(user_id=user_id)
+            rows = {
+                p.specialty_id: p
+                for p in locked.filter(specialty_id__in=by_specialty)
+            }
+            missing = [sid for sid in by_specialty if sid not in rows]
+            if missing:
+                cls.objects.bulk_create(
+                    [cls(user_id=user_id, specialty_id=sid) for sid in missing],
+                    ignore_conflicts=True,
+                )
+                rows.update(
+                    (p.specialty_id, p)
+                    for p in locked.filter(specialty_id__in=missing)
+                )
+
+            completed = False
+            for specialty_id, outcomes in by_specialty.items():
+                progress = rows[specialty_id]
+                was_completed = progress.badge_status == cls.BadgeStatus.COMPLETED
+                for is_correct, previous in outcomes:
+                    progress.apply_answer(is_correct, previous, answered_at)
+                progress.updated_at = answered_at
+                completed |= (
+                    not was_completed
+                    and progress.badge_status == cls.BadgeStatus.COMPLETED
+                )
+            cls.objects.bulk_update(list(rows.values()), cls.COUNTER_FIELDS)
+        return completed
+
 
 class Certificate(models.Model):
     """
     A generated certificate (PDF) for a user.
     Can be for CORE completion, CME credits, or exam results.
+    CORE and CME certificates are rendered by certificates.issuing.
     """
 
     class CertificateType(models.TextChoices):
@@ -256,6 +638,10 @@ class Certificate(models.Model):
     pdf_file = models.FileField(
         upload_to='certificates/pdfs/', blank=True, null=True
     )
+    content_hash = models.CharField(
+        max_length=64, blank=True, editable=False,
+        help_text='SHA-256 of the certificate content (and renderer version); names the stored PDF.'
+    )
     total_credits = models.DecimalField(
         max_digits=5, decimal_places=2, default=0
     )
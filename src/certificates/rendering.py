@@ -0,0 +1,207 @@
+"""
+Pure-Python certificate PDF renderer.
+
+Produces a single landscape Letter page using the PDF base-14 Helvetica
+fonts, so no font files or third-party packages are needed. Rendering is
+deterministic — the same payload always yields the same bytes (no creation
+dates, fixed compression level) — which is what lets certificates be stored
+content-addressed by `payload_hash()`.
+
+This module must not import Django: it runs inside worker processes.
+"""
+import hashlib
+import json
+import textwrap
+import zlib
+
+RENDERER_VERSION = 2
+
+PAGE_WIDTH = 792
+PAGE_HEIGHT = 612
+
+# Advance widths (1/1000 em) of printable ASCII, from the Adobe AFM files
+_HELVETICA = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+_HELVETICA_BOLD = [
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+]
+_FONTS = {
+    'F1': ('Helvetica', _HELVETICA),
+    'F2': ('Helvetica-Bold', _HELVETICA_BOLD),
+}
+_WIDE_CHARS = {0x96: 556, 0x97: 1000, 0x99: 1000}  # en dash, em dash, ™
+_DEFAULT_WIDTH = 556
+
+NAVY = (0.106, 0.227, 0.420)
+GOLD = (0.737, 0.580, 0.243)
+GREY = (0.333, 0.333, 0.333)
+
+
+def payload_hash(payload):
+    """Content key of a certificate: SHA-256 of the payload and renderer version."""
+    canonical = json.dumps(
+        {'renderer': RENDERER_VERSION, 'payload': payload},
+        sort_keys=True, separators=(',', ':'), default=str,
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _encode(text):
+    return str(text).encode('cp1252', errors='replace')
+
+
+def _text_width(data, font, size):
+    widths = _FONTS[font][1]
+    units = 0
+    for byte in data:
+        if 32 <= byte <= 126:
+            units += widths[byte - 32]
+        else:
+            units += _WIDE_CHARS.get(byte, _DEFAULT_WIDTH)
+    return units * size / 1000
+
+
+def _escape(data):
+    return data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def _info_string(text):
+    """
+    A PDF text string for the document information dictionary: a literal
+    string when ASCII, else UTF-16BE with a byte order mark as a hex string
+    (cp1252 bytes would be read as PDFDocEncoding, e.g. "—" as "Š").
+    """
+    text = str(text)
+    if text.isascii():
+        return b'(' + _escape(text.encode('ascii')) + b')'
+    return b'<' + (b'\xfe\xff' + text.encode('utf-16-be')).hex().upper().encode('ascii') + b'>'
+
+
+class _Canvas:
+    """Collects PDF content-stream operators for one page."""
+
+    def __init__(self):
+        self.ops = []
+
+    def color(self, rgb, stroke=False):
+        self.ops.append('%.3f %.3f %.3f %s' % (*rgb, 'RG' if stroke else 'rg'))
+
+    def rect(self, x, y, width, height, line_width):
+        self.ops.append(f'{line_width} w {x} {y} {width} {height} re S')
+
+    def line(self, x1, y1, x2, y2, line_width):
+        self.ops.append(f'{line_width} w {x1} {y1} m {x2} {y2} l S')
+
+    def text(self, value, y, font='F1', size=12, x=None, align='center'):
+        data = _encode(value)
+        width = _text_width(data, font, size)
+        if align == 'center':
+            x = (PAGE_WIDTH - width) / 2
+        elif align == 'right':
+            x = x - width
+        self.ops.append(
+            f'BT /{font} {size} Tf {x:.2f} {y:.2f} Td ('
+            + _escape(data).decode('latin-1')
+            + ') Tj ET'
+        )
+
+    def stream(self):
+        return '\n'.join(self.ops).encode('latin-1')
+
+
+def _draw(payload):
+    canvas = _Canvas()
+
+    canvas.color(NAVY, stroke=True)
+    canvas.rect(30, 30, PAGE_WIDTH - 60, PAGE_HEIGHT - 60, 4)
+    canvas.color(GOLD, stroke=True)
+    canvas.rect(42, 42, PAGE_WIDTH - 84, PAGE_HEIGHT - 84, 1.5)
+
+    canvas.color(NAVY)
+    canvas.text('MEDIGEST HEALTH', 520, font='F2', size=14)
+    canvas.text('CERTIFICATE', 465, font='F2', size=40)
+    canvas.color(GOLD)
+    canvas.text(payload['subtitle'], 435, size=18)
+
+    canvas.color(GREY)
+    canvas.text('This certifies that', 385, size=14)
+    canvas.color(NAVY)
+    canvas.text(payload['recipient'], 340, font='F2', size=30)
+    canvas.color(GOLD, stroke=True)
+    canvas.line(196, 328, PAGE_WIDTH - 196, 328, 1)
+
+    canvas.color(GREY)
+    y = 295
+    for line in textwrap.wrap(payload.get('description', ''), width=90)[:4]:
+        canvas.text(line, y, size=13)
+        y -= 19
+
+    if payload.get('credits'):
+        canvas.color(NAVY)
+        canvas.text(payload['credits'], y - 12, font='F2', size=16)
+
+    canvas.color(GREY)
+    canvas.text(f"Issued {payload['issued_on']}", 90, x=80, size=11, align='left')
+    canvas.text(
+        f"Certificate no. {payload['reference']}", 90,
+        x=PAGE_WIDTH - 80, size=11, align='right',
+    )
+    return canvas.stream()
+
+
+def render_certificate(payload):
+    """
+    Render a certificate payload to PDF bytes.
+    `payload` keys: subtitle, recipient, description, credits (optional),
+    issued_on and reference — all plain strings.
+    """
+    content = zlib.compress(_draw(payload), 6)
+    fonts = ' '.join(f'/{key} {5 + i} 0 R' for i, key in enumerate(_FONTS))
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        (
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+            f'/Resources << /Font << {fonts} >> >> /Contents 4 0 R >>'
+        ).encode('ascii'),
+        b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(content)
+        + content + b'\nendstream',
+    ]
+    for name, _ in _FONTS.values():
+        objects.append(
+            f'<< /Type /Font /Subtype /Type1 /BaseFont /{name} '
+            f'/Encoding /WinAnsiEncoding >>'.encode('ascii')
+        )
+    objects.append(
+        b'<< /Title ' + _info_string(payload.get('title', 'Certificate'))
+        + b' /Producer (MEDIGEST) >>'
+    )
+
+    out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+
+    xref_at = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    file_id = hashlib.md5(content).hexdigest().encode('ascii')
+    out += (
+        b'trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R /ID [<%s> <%s>] >>\n'
+        % (len(objects) + 1, len(objects), file_id, file_id)
+    )
+    out += b'startxref\n%d\n%%%%EOF\n' % xref_at
+    return bytes(out)
@@ -4,6 +4,7 @@ from certificates.models import (
     CMEActivity, UserCMECredit, CMESubmission,
     UserCOREProgress, Certificate,
 )
+from core import signed_urls
 
 
 class CMECreditSerializer(serializers.ModelSerializer):
@@ -33,7 +34,7 @@ class COREProgressSerializer(serializers.ModelSerializer):
     specialty_name = serializers.CharField(source='specialty.name', read_only=True)
     specialty_icon = serializers.ImageField(source='specialty.icon', read_only=True)
     specialty_slug = serializers.CharField(source='specialty.slug', read_only=True)
-    progress_percentage = serializers.IntegerField(read_only=True)
+    progress_percentage = serializers.SerializerMethodField()
     correct_percentage = serializers.IntegerField(read_only=True)
 
     class Meta:
@@ -45,8 +46,17 @@ class COREProgressSerializer(serializers.ModelSerializer):
             'core_quiz_unlocked',
         ]
 
+    def get_progress_percentage(self, obj):
+        # Views pass {specialty_id: question count} to skip a COUNT per badge
+        totals = self.context.get('question_totals')
+        if totals is None:
+            return round(obj.progress_percentage)
+        return round(obj.progress_percentage_of(totals.get(obj.specialty_id, 0)))
+
 
 class CertificateSerializer(serializers.ModelSerializer):
+    pdf_file = serializers.SerializerMethodField()
+
     class Meta:
         model = Certificate
         fields = [
@@ -54,6 +64,12 @@ class CertificateSerializer(serializers.ModelSerializer):
             'pdf_file', 'credit_year', 'issued_at',
         ]
 
+    def get_pdf_file(self, obj):
+        # Certificates are only listed to their owner; the URL expires
+        if not obj.pdf_file:
+            return None
+        return signed_urls.signed_url(obj.pdf_file.name, self.context.get('request'))
+
 
 class CMESubmissionCreateSerializer(serializers.Serializer):
     """Submit earned credits to an accreditation body."""
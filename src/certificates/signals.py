@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from certificates.models import CMEActivity, CMECreditLedger, UserCMECredit
+
+
+def _activity_type(credit, activity_id):
+    """Type of the activity a credit state points at ('' without one)."""
+    if not activity_id:
+        return ''
+    if activity_id == credit.activity_id:
+        # The related object is usually cached already (admin forms, seeds)
+        return credit.activity.activity_type
+    return (
+        CMEActivity.objects.filter(pk=activity_id)
+        .values_list('activity_type', flat=True).first()
+    ) or ''
+
+
+def _apply(credit, states):
+    """Apply signed ledger states — [(sign, LEDGER_FIELDS values)] — of one credit."""
+    deltas = {}
+    for sign, (user_id, year, activity_id, status, credits) in states:
+        key = (year, _activity_type(credit, activity_id))
+        amounts = CMECreditLedger.contribution(status, credits)
+        user_deltas = deltas.setdefault(user_id, {})
+        current = user_deltas.get(key, (0, 0, 0))
+        user_deltas[key] = tuple(c + sign * a for c, a in zip(current, amounts))
+    for user_id, user_deltas in deltas.items():
+        CMECreditLedger.apply(user_id, user_deltas)
+
+
+def _origin_model(origin):
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+@receiver(pre_save, sender=UserCMECredit)
+def remember_ledger_contribution(sender, instance, raw=False, **kwargs):
+    """Keep the stored row's values so post_save can apply the difference."""
+    instance._ledger_previous = None
+    if raw or instance._state.adding:
+        return
+    previous = getattr(instance, '_ledger_state', None)
+    if previous is None:
+        # Built by hand or loaded with deferred fields: read the stored row
+        previous = UserCMECredit.objects.filter(pk=instance.pk).values_list(
+            *UserCMECredit.LEDGER_FIELDS,
+        ).first()
+    instance._ledger_previous = previous
+
+
+@receiver(post_save, sender=UserCMECredit)
+def update_ledger_on_save(sender, instance, raw=False, **kwargs):
+    """Single-row saves (admin, seeds); bulk paths update the ledger themselves."""
+    if raw:
+        return
+    previous = getattr(instance, '_ledger_previous', None)
+    states = [(1, instance.remember_ledger_state(previous))]
+    if previous is not None:
+        states.append((-1, previous))
+    _apply(instance, states)
+
+
+@receiver(post_delete, sender=UserCMECredit)
+def update_ledger_on_delete(sender, instance, origin=None, **kwargs):
+    if _origin_model(origin) in (CMEActivity, get_user_model()):
+        # Cascades: the activity's pre_delete subtracted its credits in
+        # bulk, and a user's ledger rows are deleted along with theirs
+        return
+    state = getattr(instance, '_ledger_state', None) or tuple(
+        getattr(instance, field) for field in UserCMECredit.LEDGER_FIELDS
+    )
+    _apply(instance, [(-1, state)])
+
+
+@receiver(post_save, sender=CMEActivity)
+def move_ledger_on_activity_type_change(sender, instance, created=False, raw=False, **kwargs):
+    """Credits are filed under their activity's type: move them with it."""
+    previous = getattr(instance, '_loaded_activity_type', None)
+    instance._loaded_activity_type = instance.activity_type
+    if raw or created or previous is None or previous == instance.activity_type:
+        return
+    CMECreditLedger.move_activity(instance.pk, previous, instance.activity_type)
+
+
+@receiver(pre_delete, sender=CMEActivity)
+def remove_activity_from_ledger(sender, instance, **kwargs):
+    """Its credits are deleted in the same cascade: subtract them in one pass."""
+    CMECreditLedger.move_activity(
+        instance.pk, getattr(instance, '_loaded_activity_type', None) or instance.activity_type,
+    )
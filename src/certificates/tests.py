@@ -1,3 +1,393 @@
-from django.test import TestCase
+from decimal import Decimal
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from pypdf import PdfReader
+from rest_framework.test import APIClient
+
+from books.models import Book, Specialty
+from certificates import accrual, rendering
+from certificates.models import (
+    CMEActivity, CMECreditLedger, CMESubmission, UserCMECredit, UserCOREProgress,
+)
+from questions.models import Question, UserQuestionAttempt
+
+
+class LedgerAssertionsMixin:
+
+    def assertLedgerReconciled(self):
+        out = StringIO()
+        call_command('reconcile_cme_ledger', stdout=out)
+        self.assertIn('Ledger matches credits', out.getvalue())
+
+    def ledger(self, user, year=2026):
+        """{activity_type: (total, submitted, verified)} for one of a user's years."""
+        return {
+            row.activity_type: (row.total_credits, row.submitted_credits, row.verified_credits)
+            for row in CMECreditLedger.objects.filter(user=user, credit_year=year)
+            if any((row.total_credits, row.submitted_credits, row.verified_credits))
+        }
+
+
+class LedgerSignalTests(LedgerAssertionsMixin, TestCase):
+    """Single-row credit and activity writes keep the ledger equal to the credits."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='cme@example.com', password='pass12345',
+        )
+        cls.activity = CMEActivity.objects.create(
+            title='Quiz', activity_type=CMEActivity.ActivityType.QUIZ, credits=Decimal('1.00'),
+        )
+
+    def _credit(self, **fields):
+        return UserCMECredit.objects.create(
+            user=self.user, activity=self.activity, credits_earned=Decimal('1.50'), **fields,
+        )
+
+    def test_create(self):
+        self._credit()
+        self._credit(credit_year=2025)
+        self.assertEqual(self.ledger(self.user), {'quiz': (Decimal('1.50'), 0, 0)})
+        self.assertLedgerReconciled()
+
+    def test_status_move_on_loaded_credit(self):
+        credit = UserCMECredit.objects.get(pk=self._credit().pk)
+        credit.status = UserCMECredit.Status.SUBMITTED
+        credit.save()
+        self.assertEqual(
+            self.ledger(self.user), {'quiz': (Decimal('1.50'), Decimal('1.50'), 0)},
+        )
+        # A second save of the same instance starts from what it saved
+        credit.status = UserCMECredit.Status.VERIFIED
+        credit.credits_earned = Decimal('2.00')
+        credit.save()
+        self.assertEqual(
+            self.ledger(self.user), {'quiz': (Decimal('2.00'), 0, Decimal('2.00'))},
+        )
+        self.assertLedgerReconciled()
+
+    def test_loaded_credit_is_not_read_again_on_save(self):
+        credit = UserCMECredit.objects.select_related('activity').get(pk=self._credit().pk)
+        credit.status = UserCMECredit.Status.SUBMITTED
+        # UPDATE of the credit and of its one ledger row
+        with self.assertNumQueries(2):
+            credit.save()
+        self.assertLedgerReconciled()
+
+    def test_deferred_credit_reads_stored_row(self):
+        credit = UserCMECredit.objects.only('id', 'status').get(pk=self._credit().pk)
+        credit.status = UserCMECredit.Status.VERIFIED
+        credit.save()
+        self.assertLedgerReconciled()
+
+    def test_move_year_and_activity(self):
+        credit = self._credit()
+        other = CMEActivity.objects.create(
+            title='Reading', activity_type=CMEActivity.ActivityType.SYLLABUS,
+            credits=Decimal('1.00'),
+        )
+        credit.activity = other
+        credit.credit_year = 2025
+        credit.save()
+        self.assertEqual(self.ledger(self.user), {})
+        self.assertEqual(
+            self.ledger(self.user, 2025), {'syllabus': (Decimal('1.50'), 0, 0)},
+        )
+        self.assertLedgerReconciled()
+
+    def test_delete(self):
+        self._credit()
+        self._credit(status=UserCMECredit.Status.SUBMITTED).delete()
+        UserCMECredit.objects.filter(credit_year=2026).first().delete()
+        self.assertEqual(self.ledger(self.user), {})
+        self.assertLedgerReconciled()
+
+    def test_activity_type_change(self):
+        self._credit()
+        self._credit(status=UserCMECredit.Status.VERIFIED)
+        activity = CMEActivity.objects.get(pk=self.activity.pk)
+        activity.activity_type = CMEActivity.ActivityType.BOARD_BASICS
+        activity.save()
+        self.assertEqual(
+            self.ledger(self.user),
+            {'board_basics': (Decimal('3.00'), 0, Decimal('1.50'))},
+        )
+        self.assertLedgerReconciled()
+
+    def test_activity_delete(self):
+        self._credit()
+        UserCMECredit.objects.create(
+            user=self.user, credits_earned=Decimal('0.25'),
+        )
+        CMEActivity.objects.filter(pk=self.activity.pk).delete()
+        self.assertEqual(self.ledger(self.user), {'': (Decimal('0.25'), 0, 0)})
+        self.assertLedgerReconciled()
+
+
+class LedgerApplyTests(TestCase):
+    """CMECreditLedger.apply / move_status keep running sums per year and type."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='ledger@example.com', password='pass12345',
+        )
+
+    def _row(self, year=2026, activity_type='quiz'):
+        row = CMECreditLedger.objects.get(
+            user=self.user, credit_year=year, activity_type=activity_type,
+        )
+        return row.total_credits, row.submitted_credits, row.verified_credits
+
+    def test_apply_creates_then_increments(self):
+        CMECreditLedger.apply(self.user.id, {(2026, 'quiz'): (Decimal('1'), 0, 0)})
+        CMECreditLedger.apply(self.user.id, {
+            (2026, 'quiz'): (Decimal('0.5'), Decimal('0.5'), 0),
+            (2025, 'quiz'): (Decimal('2'), 0, 0),
+        })
+        self.assertEqual(self._row(), (Decimal('1.5'), Decimal('0.5'), 0))
+        self.assertEqual(self._row(2025), (Decimal('2'), 0, 0))
+
+    def test_apply_skips_subtracting_from_missing_row(self):
+        CMECreditLedger.apply(self.user.id, {(2026, 'quiz'): (Decimal('-1'), 0, 0)})
+        self.assertFalse(CMECreditLedger.objects.filter(user=self.user).exists())
+
+    def test_move_status(self):
+        activity = CMEActivity.objects.create(
+            title='Quiz', activity_type=CMEActivity.ActivityType.QUIZ, credits=Decimal('1'),
+        )
+        for year in (2025, 2026, 2026):
+            UserCMECredit.objects.create(
+                user=self.user, activity=activity, credits_earned=Decimal('1'),
+                credit_year=year,
+            )
+        moved = CMECreditLedger.move_status(
+            self.user.id,
+            UserCMECredit.objects.filter(user=self.user, credit_year=2026),
+            UserCMECredit.Status.SUBMITTED,
+        )
+        self.assertEqual(moved, 2)
+        self.assertEqual(self._row(), (Decimal('2'), Decimal('2'), 0))
+        self.assertEqual(self._row(2025), (Decimal('1'), 0, 0))
+
+        CMECreditLedger.move_status(
+            self.user.id,
+            UserCMECredit.objects.filter(user=self.user, credit_year=2026),
+            UserCMECredit.Status.VERIFIED,
+        )
+        self.assertEqual(self._row(), (Decimal('2'), 0, Decimal('2')))
+
+
+class AccrualTests(LedgerAssertionsMixin, TestCase):
+    """Question credits: 50% yearly accuracy, the yearly cap, idempotent re-runs."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='accrual@example.com', password='pass12345',
+        )
+        book = Book.objects.create(product_id='cardio', title='Cardiology', slug='cardiology')
+        specialty = Specialty.objects.create(book=book, name='Valves', slug='valves')
+        cls.questions = [
+            Question.objects.create(
+                book=book, specialty=specialty, question_text=f'Question {n}?',
+                option_a='A', option_b='B', option_c='C', option_d='D',
+                correct_answer='A',
+            )
+            for n in range(4)
+        ]
+        cls.activity = CMEActivity.objects.create(
+            title='Individual Question', activity_type=CMEActivity.ActivityType.QUESTION,
+            credits=Decimal('0.25'),
+        )
+        cls.year = timezone.localtime().year
+
+    def _answer(self, question, is_correct):
+        UserQuestionAttempt.objects.create(
+            user=self.user, question=question,
+            selected_answer='A' if is_correct else 'B', is_correct=is_correct,
+        )
+
+    def _credits(self):
+        return UserCMECredit.objects.filter(user=self.user, question__isnull=False).count()
+
+    def test_credits_correct_answers_once(self):
+        self._answer(self.questions[0], True)
+        self._answer(self.questions[0], True)
+        self._answer(self.questions[1], True)
+        self._answer(self.questions[2], False)
+        self.assertEqual(accrual.accrue_for_user(self.user.id), 2)
+        self.assertEqual(
+            CMECreditLedger.year_summary(self.user, self.year)[0], Decimal('0.50'),
+        )
+
+        # Re-running (full scan or scoped) inserts nothing more
+        self.assertEqual(accrual.accrue_for_user(self.user.id), 0)
+        self.assertEqual(
+            accrual.accrue_for_user(self.user.id, question_ids=[self.questions[0].id]), 0,
+        )
+        self.assertEqual(self._credits(), 2)
+        self.assertLedgerReconciled()
+
+    def test_below_passing_accuracy_earns_nothing(self):
+        self._answer(self.questions[0], True)
+        for question in self.questions[1:]:
+            self._answer(question, False)
+        self.assertEqual(accrual.accrue_for_user(self.user.id), 0)
+
+        # Accuracy is per year: once it reaches 50% the credit is earned
+        self._answer(self.questions[1], True)
+        self._answer(self.questions[2], True)
+        self.assertEqual(accrual.accrue_for_user(self.user.id), 3)
+        self.assertLedgerReconciled()
+
+    def test_other_years_do_not_count_towards_accuracy(self):
+        for question in self.questions:
+            self._answer(question, False)
+        UserQuestionAttempt.objects.filter(user=self.user).update(
+            attempted_at=timezone.now().replace(year=self.year - 1),
+        )
+        self._answer(self.questions[0], True)
+        self.assertEqual(accrual.accrue_for_user(self.user.id), 1)
+
+    def test_yearly_cap(self):
+        UserCMECredit.objects.create(
+            user=self.user, credits_earned=accrual.YEARLY_CAP - Decimal('0.25'),
+            credit_year=self.year,
+        )
+        for question in self.questions[:2]:
+            self._answer(question, True)
+        self.assertEqual(accrual.accrue_for_user(self.user.id), 1)
+        self.assertEqual(
+            CMECreditLedger.year_summary(self.user, self.year)[0], accrual.YEARLY_CAP,
+        )
+
+        # At the cap nothing more is credited
+        self._answer(self.questions[2], True)
+        self.assertEqual(accrual.accrue_for_user(self.user.id), 0)
+        self.assertLedgerReconciled()
+
+
+class ClaimTests(LedgerAssertionsMixin, TestCase):
+    """POST /api/v1/cme/submit/ claims EARNED credits exactly once."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='claim@example.com', password='pass12345',
+        )
+        activity = CMEActivity.objects.create(
+            title='Quiz', activity_type=CMEActivity.ActivityType.QUIZ, credits=Decimal('1'),
+        )
+        cls.credits = [
+            UserCMECredit.objects.create(
+                user=cls.user, activity=activity, credits_earned=Decimal('1'),
+            )
+            for _ in range(2)
+        ]
+
+    def setUp(self):
+        settings.ALLOWED_HOSTS.append('testserver')
+        self.addCleanup(settings.ALLOWED_HOSTS.remove, 'testserver')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _submit(self, credits):
+        return self.client.post('/api/v1/cme/submit/', {
+            'accreditation_body': CMESubmission.AccreditationBody.AMA,
+            'credit_ids': [str(credit.id) for credit in credits],
+        }, format='json')
+
+    def test_double_claim_is_rejected(self):
+        response = self._submit(self.credits)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Decimal(str(response.data['credits_claimed'])), Decimal('2'))
+
+        response = self._submit(self.credits)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(CMESubmission.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(
+            CMECreditLedger.objects.get(user=self.user).submitted_credits, Decimal('2'),
+        )
+        self.assertLedgerReconciled()
+
+    def test_claim_skips_already_submitted_credits(self):
+        self.assertEqual(self._submit(self.credits[:1]).status_code, 201)
+        response = self._submit(self.credits)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Decimal(str(response.data['credits_claimed'])), Decimal('1'))
+        self.assertLedgerReconciled()
+
+
+class COREWindowTests(TestCase):
+    """UserCOREProgress.apply_answer keeps a rolling window of the last 30 answers."""
+
+    def setUp(self):
+        self.progress = UserCOREProgress()
+        self.now = timezone.now()
+
+    def _answer(self, is_correct, previous=(0, None)):
+        self.progress.apply_answer(is_correct, previous, self.now)
+
+    def test_badge_needs_a_full_window(self):
+        for _ in range(UserCOREProgress.WINDOW_SIZE - 1):
+            self._answer(True)
+        self.assertFalse(self.progress.core_quiz_unlocked)
+        self.assertEqual(self.progress.badge_status, UserCOREProgress.BadgeStatus.IN_PROGRESS)
+
+        self._answer(True)
+        self.assertTrue(self.progress.core_quiz_unlocked)
+        self.assertEqual(self.progress.badge_status, UserCOREProgress.BadgeStatus.COMPLETED)
+        self.assertEqual(self.progress.badge_earned_at, self.now)
+
+    def test_window_drops_oldest_answers(self):
+        for _ in range(UserCOREProgress.WINDOW_SIZE):
+            self._answer(False)
+        for _ in range(14):
+            self._answer(True)
+        self.assertEqual(self.progress.last_30_total, 30)
+        self.assertEqual(self.progress.last_30_correct, 14)
+        self.assertFalse(self.progress.core_quiz_unlocked)
+
+        self._answer(True)
+        self.assertEqual(self.progress.last_30_correct, 15)
+        self.assertTrue(self.progress.core_quiz_unlocked)
+
+        # Later answers move the window but keep the completed badge
+        for _ in range(UserCOREProgress.WINDOW_SIZE):
+            self._answer(False)
+        self.assertEqual(self.progress.last_30_correct, 0)
+        self.assertEqual(self.progress.badge_status, UserCOREProgress.BadgeStatus.COMPLETED)
+
+    def test_repeat_answers_keep_distinct_counts(self):
+        self._answer(True)
+        self._answer(False, previous=(1, True))
+        self.assertEqual(self.progress.questions_answered, 1)
+        self.assertEqual(self.progress.questions_correct, 0)
+        self.assertEqual(self.progress.last_30_total, 2)
+        self.assertEqual(self.progress.last_30_correct, 1)
+
+
+class RenderingTests(SimpleTestCase):
+    """The PDF /Title reads back as the payload title, non-ASCII included."""
+
+    PAYLOAD = {
+        'subtitle': 'Certificate of Completion', 'recipient': 'Dr. Zoë Adams',
+        'issued_on': 'October 17, 2026', 'reference': 'ABC123',
+    }
+
+    def _title(self, title):
+        pdf = rendering.render_certificate(dict(self.PAYLOAD, title=title))
+        return PdfReader(BytesIO(pdf)).metadata.title
+
+    def test_ascii_title(self):
+        self.assertEqual(self._title('CME Certificate (2026)'), 'CME Certificate (2026)')
+
+    def test_non_ascii_title(self):
+        self.assertEqual(self._title('CME Certificate — 2026 ™'), 'CME Certificate — 2026 ™')
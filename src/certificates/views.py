@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 from django.db.models import Sum, Count
 from django.utils import timezone
 from rest_framework import generics, status
@@ -5,9 +6,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from books.models import Specialty
+from core.file_serving import serve_file
+from questions import bank_stats
 from certificates.models import (
     CMEActivity, UserCMECredit, CMESubmission,
-    UserCOREProgress, Certificate,
+    UserCOREProgress, Certificate, CMECreditLedger,
 )
 from .serializers import (
     CMECreditSerializer,
@@ -27,22 +30,16 @@ class COREDashboardView(APIView):
     def get(self, request):
         user = request.user
 
-        # Get or create progress for all CORE specialties
-        core_specialties = Specialty.objects.filter(
-            is_core_specialty=True,
-        ).order_by('core_display_order')
-
-        badges = []
-        for spec in core_specialties:
-            progress, _ = UserCOREProgress.objects.get_or_create(
-                user=user, specialty=spec,
-            )
-            badges.append(progress)
+        # Progress for all CORE specialties (missing rows created in bulk)
+        badges = UserCOREProgress.for_user(user)
 
         completed = sum(1 for b in badges if b.badge_status == UserCOREProgress.BadgeStatus.COMPLETED)
         total = len(badges)
 
-        serializer = COREProgressSerializer(badges, many=True)
+        serializer = COREProgressSerializer(
+            badges, many=True,
+            context={'question_totals': bank_stats.specialty_totals()},
+        )
 
         return Response({
             'overall_progress': {
@@ -75,12 +72,13 @@ class CORESpecialtyDetailView(APIView):
         )
 
         # Recently answered questions for this specialty (Figma §4.7.2)
-        from questions.models import UserQuestionAttempt
-        recent_attempts = UserQuestionAttempt.objects.filter(
+        from questions.models import UserQuestionState
+        recent_attempts = UserQuestionState.objects.filter(
             user=request.user,
             question__specialty=spec,
-        ).select_related('question', 'question__specialty').order_by(
-            '-attempted_at'
+            attempt_count__gt=0,
+        ).select_related('question').order_by(
+            '-last_attempted_at'
         )[:10]
 
         recently_answered = [
@@ -94,7 +92,7 @@ class CORESpecialtyDetailView(APIView):
                     'care_type': a.question.get_care_type_display() if a.question.care_type else None,
                     'patient_demographic': a.question.get_patient_demographic_display() if a.question.patient_demographic else None,
                 },
-                'attempted_at': a.attempted_at,
+                'attempted_at': a.last_attempted_at,
             }
             for a in recent_attempts
         ]
@@ -111,7 +109,9 @@ class CORESpecialtyDetailView(APIView):
             'last_30_correct': progress.last_30_correct,
             'last_30_total': progress.last_30_total,
             'core_quiz_unlocked': progress.core_quiz_unlocked,
-            'progress_percentage': progress.progress_percentage,
+            'progress_percentage': progress.progress_percentage_of(
+                bank_stats.specialty_totals().get(spec.id, 0),
+            ),
             'correct_percentage': progress.correct_percentage,
             'recently_answered': recently_answered,
         })
@@ -180,19 +180,15 @@ class CMEDashboardView(APIView):
         year = timezone.now().year
 
         credits = UserCMECredit.objects.filter(user=user, credit_year=year)
-        total_earned = credits.aggregate(
-            total=Sum('credits_earned')
-        )['total'] or 0
 
-        # Credits by type
-        by_type = {}
-        for at in CMEActivity.ActivityType.choices:
-            type_credits = credits.filter(
-                activity__activity_type=at[0],
-            ).aggregate(t=Sum('credits_earned'))['t'] or 0
-            by_type[at[0]] = round(float(type_credits), 2)
+        # Yearly total and credits by type from the ledger (one query)
+        total_earned, ledger_by_type = CMECreditLedger.year_summary(user, year)
+        by_type = {
+            at[0]: round(float(ledger_by_type.get(at[0], 0)), 2)
+            for at in CMEActivity.ActivityType.choices
+        }
 
-        recent = credits.order_by('-earned_at')[:10]
+        recent = credits.select_related('activity').order_by('-earned_at')[:10]
 
         return Response({
             'earned_credits': round(float(total_earned), 2),
@@ -226,6 +222,33 @@ class CMECreditHistoryView(generics.ListAPIView):
 
         return qs
 
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+
+        # Totals for the same year / type filters, read from the ledger
+        ledger = CMECreditLedger.objects.filter(user=request.user)
+        year = request.query_params.get('year')
+        if year:
+            ledger = ledger.filter(credit_year=int(year))
+        activity_type = request.query_params.get('type')
+        if activity_type:
+            ledger = ledger.filter(activity_type=activity_type)
+        totals = ledger.aggregate(
+            total=Sum('total_credits'),
+            submitted=Sum('submitted_credits'),
+            verified=Sum('verified_credits'),
+        )
+        total = totals['total'] or 0
+        submitted = totals['submitted'] or 0
+        verified = totals['verified'] or 0
+        response.data['totals'] = {
+            'earned_credits': round(float(total), 2),
+            'available_credits': round(float(total - submitted - verified), 2),
+            'submitted_credits': round(float(submitted), 2),
+            'verified_credits': round(float(verified), 2),
+        }
+        return response
+
 
 # ═════════════════════════════════════════════
 # 11.3  Submit CME Credits
@@ -238,21 +261,15 @@ class SubmitCMECreditsView(APIView):
         serializer.is_valid(raise_exception=True)
         d = serializer.validated_data
 
-        credits = UserCMECredit.objects.filter(
-            user=request.user, id__in=d['credit_ids'],
-        )
-        total = credits.aggregate(t=Sum('credits_earned'))['t'] or 0
-
-        submission = CMESubmission.objects.create(
-            user=request.user,
-            accreditation_body=d['accreditation_body'],
-            credits_claimed=total,
-            credit_year=timezone.now().year,
-        )
-        submission.credits.set(credits)
-
-        # Mark credits as submitted
-        credits.update(status=UserCMECredit.Status.SUBMITTED)
+        try:
+            submission = CMESubmission.claim(
+                request.user, d['credit_ids'], d['accreditation_body'],
+            )
+        except ValidationError as e:
+            return Response(
+                {'detail': e.messages[0]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         return Response(
             CMESubmissionSerializer(submission).data,
@@ -276,18 +293,17 @@ class CertificateDownloadView(APIView):
     """GET /api/v1/certificates/{cert_id}/download/"""
 
     def get(self, request, cert_id):
-        from django.http import FileResponse
         cert = Certificate.objects.filter(
             id=cert_id, user=request.user,
         ).first()
-        if not cert or not cert.pdf_file:
+        if not cert or not cert.pdf_file or not cert.pdf_file.storage.exists(cert.pdf_file.name):
             return Response(
                 {'detail': 'Certificate not found.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        return FileResponse(
-            cert.pdf_file.open('rb'),
-            content_type='application/pdf',
-            as_attachment=True,
+        return serve_file(
+            request, cert.pdf_file.path, 'application/pdf',
             filename=f'{cert.title}.pdf',
+            disposition='attachment',
+            name=cert.pdf_file.name,
         )
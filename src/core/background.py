@@ -0,0 +1,48 @@
+"""
+Run follow-up work after the current transaction commits, off the request thread.
+
+Used for work that must not add latency to a request, e.g. CME credit
+accrual after an answer is submitted. Jobs run on a small per-process
+thread pool; each job closes its database connection when it finishes.
+Set BACKGROUND_TASKS_INLINE = True (tests, management commands, SQLite
+development) to run jobs synchronously right after commit instead.
+Jobs must be idempotent: a job lost on process shutdown is picked up by
+the matching catch-up management command.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'BACKGROUND_TASKS_WORKERS', 2),
+            thread_name_prefix='background',
+        )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Background task %s failed', getattr(func, '__name__', func))
+    finally:
+        connection.close()
+
+
+def run_after_commit(func, *args, **kwargs):
+    """Schedule `func(*args, **kwargs)` to run once the transaction commits."""
+    if getattr(settings, 'BACKGROUND_TASKS_INLINE', False):
+        transaction.on_commit(lambda: func(*args, **kwargs))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run, func, args, kwargs))
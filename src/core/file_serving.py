@@ -0,0 +1,230 @@
+"""
+Serve protected files with HTTP range and conditional request support.
+
+Readers such as PDF.js fetch a PDF lazily: a HEAD / small GET first, then
+byte ranges for the pages being viewed. serve_file() answers
+  - Range: bytes=… with 206 Partial Content (single range) or a
+    multipart/byteranges body (several ranges), 416 when unsatisfiable,
+  - If-Range, so a client never splices ranges from two file versions,
+  - If-None-Match / If-Modified-Since with 304, If-Match with 412,
+using a strong ETag derived from the file's identity (name, size, mtime).
+Cache-Control defaults to `private, no-cache`: shared caches must not store
+the file, while the browser may keep it and revalidate on every use.
+
+How the bytes leave the process is chosen by FILE_DELIVERY_BACKEND:
+  python   — Django sends the file (default). Full responses are a
+             FileResponse, which the server hands to wsgi.file_wrapper
+             when it has one: gunicorn sends them with os.sendfile() (no
+             copy through Python, but a sync worker still waits for the
+             client). Range responses are streamed in chunks: file_wrapper
+             sends a file to its end, and not every server stops at
+             Content-Length.
+  nginx    — the view only checks access and returns X-Accel-Redirect;
+             nginx sends the file (ranges / conditionals included) and the
+             worker is free within milliseconds. nginx needs an internal
+             location mapping FILE_DELIVERY_INTERNAL_URL to MEDIA_ROOT:
+                 location /protected-media/ {
+                     internal;
+                     alias /path/to/media/;
+                 }
+  apache   — same with X-Sendfile (mod_xsendfile, XSendFilePath MEDIA_ROOT).
+"""
+import hashlib
+import os
+import re
+import uuid
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+CHUNK_SIZE = 64 * 1024
+MAX_RANGES = 32
+
+BACKENDS = ('python', 'nginx', 'apache')
+
+_RANGE_SPEC = re.compile(r'^\s*(\d*)\s*-\s*(\d*)\s*$')
+
+
+def file_etag(name, size, mtime_ns):
+    """Strong ETag that changes whenever the file is replaced or modified."""
+    digest = hashlib.sha1(f'{name}:{size}:{mtime_ns}'.encode()).hexdigest()[:24]
+    return f'"{digest}"'
+
+
+def parse_range_header(header, size):
+    """
+    Parse a `Range: bytes=…` header into sorted, merged (start, end) pairs
+    (inclusive). Returns None when the header should be ignored (not bytes,
+    malformed, too many ranges) and [] when no range is satisfiable.
+    """
+    unit, _, specs = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not specs:
+        return None
+    parts = specs.split(',')
+    if len(parts) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for part in parts:
+        match = _RANGE_SPEC.match(part)
+        if not match:
+            return None
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if last and end < start:
+                return None
+        elif last:
+            # Suffix range: the final N bytes
+            start, end = max(size - int(last), 0), size - 1
+            if int(last) == 0:
+                continue
+        else:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.META.get('HTTP_IF_RANGE')
+    if value is None:
+        return True
+    value = value.strip()
+    if value.startswith(('"', 'W/')):
+        return value == etag  # strong comparison only
+    return parse_http_date_safe(value) == last_modified
+
+
+def _read_ranges(path, ranges, parts=None):
+    """Yield the bytes of each range, preceded by its multipart header if given."""
+    with open(path, 'rb') as fh:
+        for index, (start, end) in enumerate(ranges):
+            if parts:
+                yield parts[index]
+            fh.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = fh.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+        if parts:
+            yield parts[-1]
+
+
+def delivery_backend():
+    backend = getattr(settings, 'FILE_DELIVERY_BACKEND', 'python')
+    if backend not in BACKENDS:
+        raise ImproperlyConfigured(
+            f'FILE_DELIVERY_BACKEND must be one of {", ".join(BACKENDS)}, not {backend!r}.'
+        )
+    return backend
+
+
+def _offload(backend, path, name, content_type):
+    """Empty response telling the front-end server to send the file itself."""
+    response = HttpResponse(content_type=content_type)
+    if backend == 'nginx':
+        if name is None:
+            name = os.path.relpath(path, settings.MEDIA_ROOT)
+        prefix = settings.FILE_DELIVERY_INTERNAL_URL.rstrip('/')
+        response['X-Accel-Redirect'] = f'{prefix}/{quote(name)}'
+    else:
+        response['X-Sendfile'] = os.path.abspath(path)
+    return response
+
+
+def serve_file(request, path, content_type, filename=None,
+               disposition='inline', cache_control='private, no-cache',
+               name=None):
+    """
+    Build the response for a GET/HEAD of the file at `path`.
+    `name` is the file's storage name (relative to MEDIA_ROOT): it
+    identifies the file in its ETag, so moving the media root does not
+    invalidate caches, and is the path used for X-Accel-Redirect.
+    """
+    def finish(response):
+        response['Cache-Control'] = cache_control
+        if filename and response.status_code != 304:
+            response['Content-Disposition'] = content_disposition_header(
+                disposition == 'attachment', filename,
+            )
+        return response
+
+    backend = delivery_backend()
+    if backend in ('nginx', 'apache'):
+        # The server validates ranges and conditionals against the file
+        return finish(_offload(backend, path, name, content_type))
+
+    stat = os.stat(path)
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    etag = file_etag(name or path, size, stat.st_mtime_ns)
+
+    def finish_file(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Accept-Ranges'] = 'bytes'
+        return finish(response)
+
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified,
+    )
+    if conditional is not None:
+        return finish_file(conditional)
+
+    header = request.META.get('HTTP_RANGE')
+    ranges = None
+    if header and _if_range_matches(request, etag, last_modified):
+        ranges = parse_range_header(header, size)
+
+    if ranges is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+        return finish_file(response)
+
+    if not ranges:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return finish_file(response)
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response = StreamingHttpResponse(
+            _read_ranges(path, ranges), status=206, content_type=content_type,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        return finish_file(response)
+
+    boundary = uuid.uuid4().hex
+    parts = [
+        (
+            f'\r\n--{boundary}\r\nContent-Type: {content_type}\r\n'
+            f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n'
+        ).encode('ascii')
+        for start, end in ranges
+    ]
+    parts.append(f'\r\n--{boundary}--\r\n'.encode('ascii'))
+    length = sum(map(len, parts)) + sum(end - start + 1 for start, end in ranges)
+    response = StreamingHttpResponse(
+        _read_ranges(path, ranges, parts), status=206,
+        content_type=f'multipart/byteranges; boundary={boundary}',
+    )
+    response['Content-Length'] = str(length)
+    return finish_file(response)
@@ -0,0 +1,46 @@
+"""
+Public endpoint for signed media URLs (see core/signed_urls.py).
+The signature is the authorization: no session, token or database lookup.
+"""
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.signing import BadSignature, SignatureExpired
+from django.http import JsonResponse
+from django.utils._os import safe_join
+from django.views import View
+
+from core import signed_urls
+from core.file_serving import serve_file
+
+
+class SignedMediaView(View):
+    """GET /signed-media/{name}?expires=…&signature=…"""
+
+    def get(self, request, name):
+        try:
+            remaining = signed_urls.verify(
+                name, request.GET.get('expires'), request.GET.get('signature'),
+            )
+            path = safe_join(settings.MEDIA_ROOT, name)
+        except SignatureExpired as e:
+            return JsonResponse({'detail': str(e)}, status=403)
+        except (BadSignature, SuspiciousFileOperation):
+            return JsonResponse({'detail': 'Invalid or tampered link.'}, status=403)
+
+        if not os.path.isfile(path):
+            # Topic/specialty slices are minted before they are built
+            from books import slicing
+            if not slicing.slice_for_name(name):
+                return JsonResponse({'detail': 'File not found.'}, status=404)
+
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        # The URL is the credential: browsers may reuse it until it expires
+        return serve_file(
+            request, path, content_type,
+            filename=os.path.basename(path),
+            cache_control=f'private, max-age={remaining}',
+            name=name,
+        )
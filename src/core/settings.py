@@ -65,6 +65,7 @@ INSTALLED_APPS = [
     'certificates',
     'webhooks',
     'support',
+    'search',
 ]
 
 # Allow iframes for Unfold
@@ -448,6 +449,33 @@ DATABASES = {
     )
 }
 
+# ─────────────────────────────────────────────
+# Cache — per-process memory by default. Point DJANGO_CACHE_BACKEND /
+# DJANGO_CACHE_LOCATION at a shared backend (memcached, database) when
+# running several workers so cache invalidations reach every process.
+# ─────────────────────────────────────────────
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'medigest-default'),
+    }
+}
+
+# ─────────────────────────────────────────────
+# Background tasks (core/background.py) — thread pool by default;
+# inline after commit when BACKGROUND_TASKS_INLINE is set.
+# ─────────────────────────────────────────────
+BACKGROUND_TASKS_INLINE = os.environ.get(
+    'BACKGROUND_TASKS_INLINE', 'False'
+).lower() in ('true', '1', 'yes')
+BACKGROUND_TASKS_WORKERS = int(os.environ.get('BACKGROUND_TASKS_WORKERS', '2'))
+
+# Certificate PDF rendering (certificates/issuing.py) — process pool size;
+# 0 renders inline in the calling thread.
+CERTIFICATE_RENDER_WORKERS = int(os.environ.get('CERTIFICATE_RENDER_WORKERS', '2'))
+
 # ─────────────────────────────────────────────
 # Custom User Model
 # ─────────────────────────────────────────────
@@ -489,6 +517,22 @@ STORAGES = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Protected file delivery (core/file_serving.py): access is checked in
+# Django, then the bytes are sent by
+#   'python'   — sent by Django (default; works everywhere). Full responses
+#                go through wsgi.file_wrapper, i.e. os.sendfile() under
+#                gunicorn; ranges are streamed,
+#   'nginx'    — X-Accel-Redirect to FILE_DELIVERY_INTERNAL_URL + file name,
+#   'apache'   — X-Sendfile with the absolute path (mod_xsendfile).
+FILE_DELIVERY_BACKEND = os.environ.get('FILE_DELIVERY_BACKEND', 'python')
+FILE_DELIVERY_INTERNAL_URL = os.environ.get('FILE_DELIVERY_INTERNAL_URL', '/protected-media/')
+
+# Signed media URLs (core/signed_urls.py). Give the static tier its own key
+# rather than SECRET_KEY if it validates the signatures itself.
+SIGNED_MEDIA_KEY = os.environ.get('SIGNED_MEDIA_KEY', '')
+SIGNED_MEDIA_TTL_SECONDS = int(os.environ.get('SIGNED_MEDIA_TTL_SECONDS', '300'))
+SIGNED_MEDIA_BUCKET_SECONDS = 60
+
 # ─────────────────────────────────────────────
 # Default Primary Key
 # ─────────────────────────────────────────────
@@ -0,0 +1,69 @@
+"""
+HMAC-signed, expiring URLs for protected media (book PDFs, topic slices,
+certificates).
+
+A signed URL carries its own authorization, so it can be checked without
+the database — by core.media_views.SignedMediaView, or by a static tier
+(CDN edge function, nginx njs/Lua) that shares SIGNED_MEDIA_KEY:
+
+    /signed-media/<name>?expires=<unix time>&signature=<sig>
+    sig = base64url(HMAC-SHA256(SIGNED_MEDIA_KEY, "<expires>:<name>")), no padding
+
+`name` is the file's storage name relative to MEDIA_ROOT. Expiry times are
+rounded up to SIGNED_MEDIA_BUCKET_SECONDS so repeated requests get the same
+URL (and browser cache entry) for a while. Entitlement is enforced when the
+URL is minted: only serializers that have checked access call signed_url().
+"""
+import base64
+import hashlib
+import hmac
+import time
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core.signing import BadSignature, SignatureExpired
+
+URL_PREFIX = '/signed-media/'
+
+
+def _key():
+    key = getattr(settings, 'SIGNED_MEDIA_KEY', '') or settings.SECRET_KEY
+    return key.encode('utf-8')
+
+
+def signature(name, expires):
+    digest = hmac.new(_key(), f'{expires}:{name}'.encode('utf-8'), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
+
+
+def sign(name, ttl=None, now=None):
+    """(expires, signature) for `name`, valid for at least `ttl` seconds."""
+    ttl = ttl if ttl is not None else getattr(settings, 'SIGNED_MEDIA_TTL_SECONDS', 300)
+    bucket = getattr(settings, 'SIGNED_MEDIA_BUCKET_SECONDS', 60)
+    deadline = int(now if now is not None else time.time()) + ttl
+    expires = -(-deadline // bucket) * bucket
+    return expires, signature(name, expires)
+
+
+def signed_url(name, request=None, ttl=None):
+    """Signed URL for a storage name; absolute when `request` is given."""
+    expires, sig = sign(name, ttl)
+    url = f'{URL_PREFIX}{quote(name)}?' + urlencode({'expires': expires, 'signature': sig})
+    return request.build_absolute_uri(url) if request else url
+
+
+def verify(name, expires, sig, now=None):
+    """
+    Check a signed URL's parameters. Returns the seconds left until expiry;
+    raises BadSignature (or its subclass SignatureExpired).
+    """
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        raise BadSignature('Invalid expiry.')
+    if not sig or not hmac.compare_digest(signature(name, expires), sig):
+        raise BadSignature('Invalid signature.')
+    remaining = expires - int(now if now is not None else time.time())
+    if remaining <= 0:
+        raise SignatureExpired('This link has expired.')
+    return remaining
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.file_serving import serve_file
+
+
+class RangeResponseTests(SimpleTestCase):
+    """206 bodies must match Content-Length; offloaded backends send none."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.media_root = tmp.name
+        self.path = os.path.join(self.media_root, 'book.pdf')
+        with open(self.path, 'wb') as fh:
+            fh.write(bytes(range(256)) * 24)
+
+    def _get(self, range_header, backend='python'):
+        request = RequestFactory().get('/', HTTP_RANGE=range_header)
+        with override_settings(FILE_DELIVERY_BACKEND=backend, MEDIA_ROOT=self.media_root):
+            response = serve_file(request, self.path, 'application/pdf', name='book.pdf')
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_single_range(self):
+        response, body = self._get('bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/6144')
+        self.assertEqual(int(response['Content-Length']), len(body))
+        self.assertEqual(body, bytes(range(10, 20)))
+
+    def test_multiple_ranges(self):
+        response, body = self._get('bytes=0-9,100-109')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(int(response['Content-Length']), len(body))
+
+    def test_nginx_offload(self):
+        response, body = self._get('bytes=0-9', backend='nginx')
+        self.assertEqual(body, b'')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/book.pdf')
+
+    def test_apache_offload(self):
+        response, body = self._get('bytes=0-9', backend='apache')
+        self.assertEqual(body, b'')
+        self.assertEqual(response['X-Sendfile'], os.path.abspath(self.path))
@@ -0,0 +1,23 @@
+"""
+Plain-text helpers for rich (CKEditor) content.
+"""
+import html
+import re
+
+from django.utils.html import strip_tags
+
+_BLOCK_TAGS = re.compile(r'<\s*(?:br|/p|/div|/li|/h\d|/tr|/td|/th)\b[^>]*>', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def plain_text(*parts):
+    """Join HTML fragments into one line of plain text (tags removed, entities decoded)."""
+    texts = []
+    for part in parts:
+        if not part:
+            continue
+        text = strip_tags(_BLOCK_TAGS.sub(' ', str(part)))
+        text = _WHITESPACE.sub(' ', html.unescape(text)).strip()
+        if text:
+            texts.append(text)
+    return ' '.join(texts)
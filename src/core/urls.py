@@ -6,6 +6,7 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from core.admin_views import ImportDemoDataView, UploadFigmaDataView
+from core.media_views import SignedMediaView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -26,6 +27,10 @@ urlpatterns = [
     path('api/v1/', include('certificates.urls')),
     path('api/v1/', include('webhooks.urls')),
     path('api/v1/help/', include('support.urls')),
+    path('api/v1/', include('search.urls')),
+
+    # ── Signed, expiring media URLs (core/signed_urls.py) ──
+    path('signed-media/<path:name>', SignedMediaView.as_view(), name='signed_media'),
 ]
 
 # Serve media files in development
@@ -19,7 +19,7 @@ class FlashcardAdmin(ModelAdmin):
     list_display_links = ('front_preview',)
     list_filter = ('is_active', 'specialty__book', 'specialty')
     list_editable = ('is_active',)
-    search_fields = ('front_text', 'back_text', 'specialty__name', 'topic__title')
+    search_fields = ('search_text', 'specialty__name', 'topic__title')
     list_per_page = 25
     ordering = ('specialty__name', '-created_at')
 
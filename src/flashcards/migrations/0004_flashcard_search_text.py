@@ -0,0 +1,54 @@
+# Generated by Django 6.0.2 on 2026-10-17 17:40
+
+import html
+import re
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+# Copy of core.text.plain_text as of this migration, so later changes to
+# the helper cannot change what this migration does
+_BLOCK_TAGS = re.compile(r'<\s*(?:br|/p|/div|/li|/h\d|/tr|/td|/th)\b[^>]*>', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def plain_text(*parts):
+    texts = []
+    for part in parts:
+        if not part:
+            continue
+        text = strip_tags(_BLOCK_TAGS.sub(' ', str(part)))
+        text = _WHITESPACE.sub(' ', html.unescape(text)).strip()
+        if text:
+            texts.append(text)
+    return ' '.join(texts)
+
+
+SEARCH_FIELDS = ('front_text', 'back_text')
+
+
+def backfill_search_text(apps, schema_editor):
+    """Plain text of the rich-text fields, for search."""
+    Flashcard = apps.get_model('flashcards', 'Flashcard')
+    changed = []
+    for obj in Flashcard.objects.only('pk', *SEARCH_FIELDS).iterator(chunk_size=500):
+        obj.search_text = plain_text(*(getattr(obj, name) for name in SEARCH_FIELDS))
+        if obj.search_text:
+            changed.append(obj)
+    Flashcard.objects.bulk_update(changed, ['search_text'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flashcards', '0003_delete_usercustomflashcard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flashcard',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,8 @@ from django.db import models
 from django.conf import settings
 from django_ckeditor_5.fields import CKEditor5Field
 
+from core.text import plain_text
+
 
 class Flashcard(models.Model):
     """
@@ -52,10 +54,15 @@ class Flashcard(models.Model):
         help_text='Order within the deck. Determines position in "2/215 Flashcards" counter.'
     )
 
+    # Plain text of front and back, for search (see search/)
+    search_text = models.TextField(blank=True, editable=False)
+
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    SEARCH_FIELDS = ('front_text', 'back_text')
+
     class Meta:
         verbose_name = 'Flashcard'
         verbose_name_plural = 'Flashcards'
@@ -66,6 +73,16 @@ class Flashcard(models.Model):
         clean = re.sub(r'<[^>]+>', '', self.front_text or '')
         return clean[:80] + '...' if len(clean) > 80 else clean
 
+    def build_search_text(self):
+        return plain_text(*(getattr(self, name) for name in self.SEARCH_FIELDS))
+
+    def save(self, *args, **kwargs):
+        self.search_text = self.build_search_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(self.SEARCH_FIELDS):
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
+        super().save(*args, **kwargs)
+
 
 class UserFlashcardProgress(models.Model):
     """
@@ -1,3 +1,67 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from books.models import Book, Specialty
+from flashcards.models import Flashcard, UserFlashcardProgress
+from learning.models import UserDailyActivity
+
+
+class ReviewGoalTests(TestCase):
+    """Today's flashcard goal counts distinct cards reviewed that day."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='cards@example.com', password='pass12345',
+        )
+        book = Book.objects.create(product_id='cardio', title='Cardiology', slug='cardiology')
+        specialty = Specialty.objects.create(book=book, name='Valves', slug='valves')
+        cls.cards = [
+            Flashcard.objects.create(
+                book=book, specialty=specialty,
+                front_text=f'Front {n}', back_text=f'Back {n}',
+            )
+            for n in range(2)
+        ]
+
+    def setUp(self):
+        settings.ALLOWED_HOSTS.append('testserver')
+        self.addCleanup(settings.ALLOWED_HOSTS.remove, 'testserver')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _review(self, card):
+        response = self.client.post(
+            f'/api/v1/flashcards/{card.id}/review/', {'confidence': 3}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def _reviewed_today(self):
+        return UserDailyActivity.objects.get(
+            user=self.user, date=self.user.local_date(),
+        ).flashcards_reviewed
+
+    def test_repeat_reviews_count_once(self):
+        self._review(self.cards[0])
+        response = self._review(self.cards[0])
+        self.assertEqual(response.data['times_reviewed'], 2)
+        self.assertEqual(self._reviewed_today(), 1)
+
+        self._review(self.cards[1])
+        self.assertEqual(self._reviewed_today(), 2)
+
+    def test_card_reviewed_on_an_earlier_day_counts_again(self):
+        self._review(self.cards[0])
+        UserFlashcardProgress.objects.filter(user=self.user).update(
+            last_reviewed_at=timezone.now() - timedelta(days=1),
+        )
+        UserDailyActivity.objects.filter(user=self.user).delete()
 
-# Create your tests here.
+        self._review(self.cards[0])
+        self.assertEqual(self._reviewed_today(), 1)
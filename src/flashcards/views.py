@@ -7,6 +7,7 @@ from rest_framework.views import APIView
 from books.models import Book, UserBookAccess
 from books.views import _build_stats
 from flashcards.models import Flashcard, UserFlashcardProgress
+from learning.events import study_activity
 from .serializers import FlashcardDetailSerializer, ReviewFlashcardSerializer
 
 
@@ -122,21 +123,28 @@ class ReviewFlashcardView(APIView):
         serializer = ReviewFlashcardSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        now = timezone.now()
         progress, created = UserFlashcardProgress.objects.get_or_create(
             user=request.user,
             flashcard=flashcard,
             defaults={
                 'confidence': serializer.validated_data['confidence'],
                 'times_reviewed': 1,
-                'last_reviewed_at': timezone.now(),
+                'last_reviewed_at': now,
             },
         )
 
+        # The daily goal counts distinct cards: only a card's first review
+        # of the user's day adds to it
+        first_today = created or progress.last_reviewed_at is None or (
+            request.user.local_date(progress.last_reviewed_at) != request.user.local_date(now)
+        )
         if not created:
             progress.confidence = serializer.validated_data['confidence']
             progress.times_reviewed += 1
-            progress.last_reviewed_at = timezone.now()
+            progress.last_reviewed_at = now
             progress.save()
+        study_activity(request.user, now, flashcards_reviewed=int(first_today))
 
         return Response({
             'flashcard_id': str(flashcard.id),
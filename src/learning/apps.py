@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class LearningConfig(AppConfig):
     name = 'learning'
+
+    def ready(self):
+        from learning import signals  # noqa: F401
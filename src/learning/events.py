@@ -0,0 +1,46 @@
+"""
+Study events: every write path that counts as studying for the day calls
+study_activity() — a recorded session, an answered question, a reviewed
+flashcard, a completed topic.
+
+The streak fields on User (current_study_streak, longest_study_streak,
+last_study_date) are updated with one conditional UPDATE the first time
+the user studies on a local day (User.time_zone); later events that day
+cost nothing. Streaks that were not continued are reset in bulk by
+python manage.py reset_broken_streaks.
+
+Events that count towards a daily goal also increment that day's
+UserDailyActivity row ("Today's Goals").
+"""
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from learning.models import UserDailyActivity, UserStatsSnapshot
+
+STREAK_FIELDS = ['current_study_streak', 'longest_study_streak', 'last_study_date']
+
+
+def study_activity(user, at=None, topics_completed=0, questions_answered=0,
+                   flashcards_reviewed=0):
+    """
+    Record that `user` studied at `at` (default: now), adding the given
+    goal counts to that day. Returns True when this started a new study
+    day, i.e. the streak fields changed.
+    """
+    now = timezone.now()
+    day = user.local_date(min(at, now) if at else now)
+    UserDailyActivity.add(
+        user, day,
+        topics_completed=topics_completed,
+        questions_answered=questions_answered,
+        flashcards_reviewed=flashcards_reviewed,
+    )
+
+    # The in-memory user can lag behind the database but never lead it
+    if user.last_study_date is not None and user.last_study_date >= day:
+        return False
+    if not get_user_model().objects.record_study_day(user.pk, day):
+        return False
+    user.refresh_from_db(fields=STREAK_FIELDS)
+    UserStatsSnapshot.invalidate(user.pk)
+    return True
@@ -0,0 +1,47 @@
+"""
+Fold raw study sessions into daily rollups and delete old raw sessions.
+Usage: python manage.py compact_study_sessions [--keep-days 90]
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from learning.models import UserStatsSnapshot, UserStudyDay, UserStudySession
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Roll up pending study sessions into UserStudyDay and prune old raw sessions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            default=90,
+            help="Keep raw sessions started within this many days (default: 90).",
+        )
+
+    def handle(self, *args, **options):
+        if options['keep_days'] < 1:
+            raise CommandError('--keep-days must be at least 1.')
+
+        rolled, user_ids = UserStudyDay.roll_up_pending(batch_size=BATCH_SIZE)
+        for user_id in user_ids:
+            UserStatsSnapshot.invalidate(user_id)
+        self.stdout.write(f"  Rolled up {rolled} pending sessions for {len(user_ids)} users")
+
+        # Rolled-up sessions are already counted: deleting them changes no totals
+        cutoff = timezone.now() - timedelta(days=options['keep_days'])
+        old = UserStudySession.objects.filter(is_rolled_up=True, started_at__lt=cutoff)
+        deleted = 0
+        while True:
+            ids = list(old.values_list('pk', flat=True)[:BATCH_SIZE])
+            if not ids:
+                break
+            deleted += UserStudySession.objects.filter(pk__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Compacted study sessions: {rolled} rolled up, {deleted} raw sessions deleted."
+        ))
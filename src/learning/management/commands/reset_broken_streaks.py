@@ -0,0 +1,48 @@
+"""
+Reset the study streak of users who missed a day (run nightly, or hourly so
+each time zone is reset soon after its midnight).
+Usage: python manage.py reset_broken_streaks [--batch-size 1000]
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from learning.models import UserStatsSnapshot
+
+
+class Command(BaseCommand):
+    help = "Set current_study_streak to 0 for users whose last study day was before yesterday."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Users updated per UPDATE statement (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        User = get_user_model()
+        now = timezone.now()
+        time_zones = (
+            User.objects.filter(current_study_streak__gt=0)
+            .values_list('time_zone', flat=True).distinct()
+        )
+        reset = 0
+        for time_zone in time_zones:
+            # "Yesterday" depends on the user's time zone
+            today = User(time_zone=time_zone).local_date(now)
+            broken = User.objects.broken_streaks(time_zone, today)
+            while True:
+                ids = list(broken.values_list('pk', flat=True)[:batch_size])
+                if not ids:
+                    break
+                # Re-check the condition: a user may have studied meanwhile
+                reset += broken.filter(pk__in=ids).update(current_study_streak=0)
+                UserStatsSnapshot.objects.filter(pk__in=ids).update(is_stale=True)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Reset {reset} broken study streaks."))
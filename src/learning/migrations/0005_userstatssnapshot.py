@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-17 18:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_remove_user_daily_reading_goal_minutes_and_more'),
+        ('learning', '0004_remove_usertopicprogress_last_page_read_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStatsSnapshot',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats_snapshot', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('completed_topics', models.PositiveIntegerField(default=0)),
+                ('total_topics', models.PositiveIntegerField(default=0, help_text='Topics across the books the user owns.')),
+                ('quiz_average', models.PositiveSmallIntegerField(default=0, help_text='Average score of the last 10 completed quizzes.')),
+                ('weekly_study_seconds', models.PositiveIntegerField(default=0)),
+                ('weekly_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('study_streak', models.PositiveIntegerField(default=0)),
+                ('is_stale', models.BooleanField(default=True)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'User Stats Snapshot',
+                'verbose_name_plural': 'User Stats Snapshots',
+            },
+        ),
+    ]
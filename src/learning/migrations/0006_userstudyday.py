@@ -0,0 +1,95 @@
+# Generated by Django 6.0.2 on 2026-10-17 18:50
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_study_days(apps, schema_editor):
+    """Roll existing sessions up into days and mark them as counted."""
+    UserStudySession = apps.get_model('learning', 'UserStudySession')
+    UserStudyDay = apps.get_model('learning', 'UserStudyDay')
+    UserStatsSnapshot = apps.get_model('learning', 'UserStatsSnapshot')
+    totals = {}
+    sessions = UserStudySession.objects.values_list(
+        'user_id', 'started_at', 'session_type', 'specialty_id',
+        'topic__specialty_id', 'duration_seconds',
+    )
+    for row in sessions.iterator(chunk_size=2000):
+        user_id, started_at, session_type, specialty_id, topic_specialty_id, seconds = row
+        key = (
+            user_id, timezone.localdate(started_at), session_type,
+            specialty_id or topic_specialty_id,
+        )
+        total, count = totals.get(key, (0, 0))
+        totals[key] = (total + seconds, count + 1)
+    UserStudyDay.objects.bulk_create([
+        UserStudyDay(
+            user_id=user_id, date=date, session_type=session_type,
+            specialty_id=specialty_id, total_seconds=total, session_count=count,
+        )
+        for (user_id, date, session_type, specialty_id), (total, count) in totals.items()
+    ], batch_size=500)
+    UserStudySession.objects.update(is_rolled_up=True)
+    UserStatsSnapshot.objects.update(is_stale=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0007_book_ingestion'),
+        ('learning', '0005_userstatssnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStudyDay',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField(help_text='Day the sessions started on.')),
+                ('session_type', models.CharField(choices=[('reading', 'Syllabus Reading'), ('quiz', 'Question Bank / Quiz'), ('flashcard', 'Flashcard Review'), ('board_basics', 'Board Basics'), ('core', 'CORE Practice')], max_length=15)),
+                ('total_seconds', models.PositiveIntegerField(default=0)),
+                ('session_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Study Day',
+                'verbose_name_plural': 'Study Days',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='userstudysession',
+            name='is_rolled_up',
+            field=models.BooleanField(default=False, help_text='Counted in UserStudyDay. Rolled-up sessions may be deleted by compact_study_sessions.'),
+        ),
+        migrations.AddIndex(
+            model_name='userstudysession',
+            index=models.Index(fields=['is_rolled_up', 'started_at'], name='learning_us_is_roll_c662e0_idx'),
+        ),
+        migrations.AddField(
+            model_name='userstudyday',
+            name='specialty',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='study_days', to='books.specialty'),
+        ),
+        migrations.AddField(
+            model_name='userstudyday',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='study_days', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='userstudyday',
+            index=models.Index(fields=['user', 'date'], name='learning_us_user_id_06137b_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='userstudyday',
+            constraint=models.UniqueConstraint(condition=models.Q(('specialty__isnull', False)), fields=('user', 'date', 'session_type', 'specialty'), name='unique_study_day_specialty'),
+        ),
+        migrations.AddConstraint(
+            model_name='userstudyday',
+            constraint=models.UniqueConstraint(condition=models.Q(('specialty__isnull', True)), fields=('user', 'date', 'session_type'), name='unique_study_day_no_specialty'),
+        ),
+        migrations.RunPython(backfill_study_days, migrations.RunPython.noop),
+    ]
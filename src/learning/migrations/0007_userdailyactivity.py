@@ -0,0 +1,89 @@
+# Generated by Django 6.0.2 on 2026-10-17 19:55
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from zoneinfo import ZoneInfo
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+# (model, timestamp field, counter, extra filter)
+SOURCES = (
+    (('learning', 'UserTopicProgress'), 'updated_at', 'topics_completed', {'is_completed': True}),
+    (('questions', 'UserQuestionAttempt'), 'attempted_at', 'questions_answered', {}),
+    (('flashcards', 'UserFlashcardProgress'), 'last_reviewed_at', 'flashcards_reviewed', {}),
+)
+
+
+def backfill_daily_activity(apps, schema_editor):
+    """
+    Counters from existing history, per user's local day. Flashcards only
+    keep their last review, so earlier days are undercounted.
+    """
+    User = apps.get_model('accounts', 'User')
+    UserDailyActivity = apps.get_model('learning', 'UserDailyActivity')
+    rows = {}
+    for time_zone in User.objects.values_list('time_zone', flat=True).distinct():
+        tzinfo = ZoneInfo(time_zone)
+        for model, field, counter, extra in SOURCES:
+            counts = (
+                apps.get_model(*model).objects
+                .filter(user__time_zone=time_zone, **{f'{field}__isnull': False}, **extra)
+                .annotate(day=TruncDate(field, tzinfo=tzinfo))
+                .values('user_id', 'day').annotate(n=Count('pk'))
+            )
+            for c in counts:
+                row = rows.setdefault((c['user_id'], c['day']), {})
+                row[counter] = c['n']
+    goals = {
+        pk: (topics, flashcards, questions)
+        for pk, topics, flashcards, questions in User.objects.values_list(
+            'pk', 'daily_topics_goal', 'daily_flashcard_goal', 'daily_questions_goal',
+        )
+    }
+    UserDailyActivity.objects.bulk_create([
+        UserDailyActivity(
+            user_id=user_id, date=day, **counters,
+            topics_goal=goals[user_id][0],
+            flashcards_goal=goals[user_id][1],
+            questions_goal=goals[user_id][2],
+        )
+        for (user_id, day), counters in rows.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_user_time_zone'),
+        ('flashcards', '0004_flashcard_search_text'),
+        ('learning', '0006_userstudyday'),
+        ('questions', '0008_question_search_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDailyActivity',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('topics_completed', models.PositiveIntegerField(default=0)),
+                ('questions_answered', models.PositiveIntegerField(default=0)),
+                ('flashcards_reviewed', models.PositiveIntegerField(default=0)),
+                ('topics_goal', models.PositiveIntegerField(default=0)),
+                ('questions_goal', models.PositiveIntegerField(default=0)),
+                ('flashcards_goal', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activity', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Daily Activity',
+                'verbose_name_plural': 'Daily Activity',
+                'ordering': ['-date'],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_activity, migrations.RunPython.noop),
+    ]
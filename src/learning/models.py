@@ -1,6 +1,10 @@
 import uuid
+from datetime import timedelta
+
 from django.db import models
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 
 
 class UserTopicProgress(models.Model):
@@ -34,6 +38,17 @@ class UserTopicProgress(models.Model):
         status = '✓' if self.is_completed else '○'
         return f'{status} {self.user.email} — {self.topic.title}'
 
+    def save(self, *args, **kwargs):
+        newly_completed = self.is_completed and (
+            self._state.adding
+            or not UserTopicProgress.objects.filter(pk=self.pk, is_completed=True).exists()
+        )
+        super().save(*args, **kwargs)
+        if newly_completed:
+            # Counted once, when the topic becomes completed
+            from learning.events import study_activity
+            study_activity(self.user, topics_completed=1)
+
 
 class UserHighlight(models.Model):
     """
@@ -238,16 +253,246 @@ class UserStudySession(models.Model):
 
     started_at = models.DateTimeField()
     ended_at = models.DateTimeField(null=True, blank=True)
+    is_rolled_up = models.BooleanField(
+        default=False,
+        help_text='Counted in UserStudyDay. Rolled-up sessions may be deleted by compact_study_sessions.',
+    )
 
     class Meta:
         verbose_name = 'Study Session'
         verbose_name_plural = 'Study Sessions'
         ordering = ['-started_at']
+        indexes = [models.Index(fields=['is_rolled_up', 'started_at'])]
 
     def __str__(self):
         hours = self.duration_seconds / 3600
         return f'{self.user.email} — {self.session_type} ({hours:.1f}h)'
 
+    @property
+    def rollup_specialty_id(self):
+        if self.specialty_id or not self.topic_id:
+            return self.specialty_id
+        return self.topic.specialty_id
+
+
+class UserStudyDay(models.Model):
+    """
+    Study time per user, local day (User.time_zone), session type and
+    specialty, rolled up from UserStudySession as sessions are recorded
+    (learning/signals.py; bulk paths via compact_study_sessions). Weekly
+    totals and study-time charts read these rows only, so their cost
+    follows days, not sessions. Deleting or editing a raw session does
+    not change its rollup.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name='study_days'
+    )
+    date = models.DateField(help_text='Day the sessions started on.')
+    session_type = models.CharField(
+        max_length=15, choices=UserStudySession.SessionType.choices
+    )
+    specialty = models.ForeignKey(
+        'books.Specialty', on_delete=models.CASCADE, null=True, blank=True,
+        related_name='study_days'
+    )
+    total_seconds = models.PositiveIntegerField(default=0)
+    session_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Study Day'
+        verbose_name_plural = 'Study Days'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'date', 'session_type', 'specialty'],
+                condition=models.Q(specialty__isnull=False),
+                name='unique_study_day_specialty',
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'date', 'session_type'],
+                condition=models.Q(specialty__isnull=True),
+                name='unique_study_day_no_specialty',
+            ),
+        ]
+        indexes = [models.Index(fields=['user', 'date'])]
+
+    def __str__(self):
+        return f'{self.user_id} {self.date} {self.session_type}: {self.total_seconds}s'
+
+    @classmethod
+    def add(cls, user_id, date, session_type, specialty_id, seconds, count=1):
+        """Add time to a rollup row with a database-side increment, creating it if needed."""
+        key = {
+            'user_id': user_id, 'date': date,
+            'session_type': session_type, 'specialty_id': specialty_id,
+        }
+        increments = {
+            'total_seconds': models.F('total_seconds') + seconds,
+            'session_count': models.F('session_count') + count,
+        }
+        if cls.objects.filter(**key).update(**increments):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(**key, total_seconds=seconds, session_count=count)
+        except IntegrityError:
+            cls.objects.filter(**key).update(**increments)
+
+    @classmethod
+    def record(cls, session):
+        """Roll one new session up into its day (idempotent)."""
+        with transaction.atomic():
+            if not UserStudySession.objects.filter(
+                pk=session.pk, is_rolled_up=False,
+            ).update(is_rolled_up=True):
+                return
+            cls.add(
+                session.user_id, session.user.local_date(session.started_at),
+                session.session_type, session.rollup_specialty_id,
+                session.duration_seconds,
+            )
+        session.is_rolled_up = True
+
+    @classmethod
+    def roll_up_pending(cls, batch_size=1000):
+        """
+        Roll up sessions written without save() (bulk imports, seeds).
+        Returns (sessions rolled up, affected user IDs).
+        """
+        rolled = 0
+        user_ids = set()
+        while True:
+            with transaction.atomic():
+                sessions = list(
+                    UserStudySession.objects.select_for_update()
+                    .filter(is_rolled_up=False)
+                    .select_related('topic', 'user')
+                    .order_by('started_at')[:batch_size]
+                )
+                if not sessions:
+                    return rolled, user_ids
+                totals = {}
+                for session in sessions:
+                    key = (
+                        session.user_id, session.user.local_date(session.started_at),
+                        session.session_type, session.rollup_specialty_id,
+                    )
+                    seconds, count = totals.get(key, (0, 0))
+                    totals[key] = (seconds + session.duration_seconds, count + 1)
+                for key, (seconds, count) in totals.items():
+                    cls.add(*key, seconds, count)
+                UserStudySession.objects.filter(
+                    pk__in=[session.pk for session in sessions],
+                ).update(is_rolled_up=True)
+            rolled += len(sessions)
+            user_ids.update(session.user_id for session in sessions)
+
+    @classmethod
+    def week_seconds(cls, user, today=None):
+        """Study seconds of the last 7 days, today included."""
+        today = today or user.local_date()
+        return cls.objects.filter(
+            user=user, date__gt=today - timedelta(days=7), date__lte=today,
+        ).aggregate(total=models.Sum('total_seconds'))['total'] or 0
+
+
+class UserDailyActivity(models.Model):
+    """
+    Daily goal counters per user and local day (User.time_zone): topics
+    completed, questions answered and flashcards reviewed. Incremented by
+    the write paths through learning.events.study_activity(), so "Today's
+    Goals" reads one row by key. The user's goals are copied on every
+    increment: past rows keep the targets that applied that day.
+    """
+
+    GOALS = (
+        # (goal key, counter field, target field, User goal field)
+        ('topics', 'topics_completed', 'topics_goal', 'daily_topics_goal'),
+        ('flashcards', 'flashcards_reviewed', 'flashcards_goal', 'daily_flashcard_goal'),
+        ('questions', 'questions_answered', 'questions_goal', 'daily_questions_goal'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name='daily_activity'
+    )
+    date = models.DateField()
+    topics_completed = models.PositiveIntegerField(default=0)
+    questions_answered = models.PositiveIntegerField(default=0)
+    flashcards_reviewed = models.PositiveIntegerField(default=0)
+    topics_goal = models.PositiveIntegerField(default=0)
+    questions_goal = models.PositiveIntegerField(default=0)
+    flashcards_goal = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Daily Activity'
+        verbose_name_plural = 'Daily Activity'
+        unique_together = ['user', 'date']
+        ordering = ['-date']
+
+    def __str__(self):
+        return f'{self.user_id} {self.date}'
+
+    @classmethod
+    def add(cls, user, date, **counts):
+        """Increment counters (e.g. questions_answered=3) with database-side increments."""
+        increments = {
+            name: models.F(name) + count for name, count in counts.items() if count
+        }
+        if not increments:
+            return
+        targets = {target: getattr(user, goal) for _, _, target, goal in cls.GOALS}
+        if cls.objects.filter(user=user, date=date).update(**increments, **targets):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(user=user, date=date, **counts, **targets)
+        except IntegrityError:
+            cls.objects.filter(user=user, date=date).update(**increments, **targets)
+
+    def goals(self, user=None):
+        """
+        {'topics': {'target', 'completed', 'met'}, 'flashcards': …, 'questions': …},
+        with met None for goals without a target. Targets come from `user`
+        when given (today's live goals), else from the row.
+        """
+        result = {}
+        for key, counter, target, goal in self.GOALS:
+            value = getattr(user, goal) if user else getattr(self, target)
+            completed = getattr(self, counter)
+            # No target (0) is neither met nor missed
+            met = completed >= value if value else None
+            result[key] = {'target': value, 'completed': completed, 'met': met}
+        return result
+
+    @classmethod
+    def today(cls, user):
+        """Today's goals for the Dashboard: one keyed read."""
+        day = user.local_date()
+        row = cls.objects.filter(user=user, date=day).first() or cls(user=user, date=day)
+        return row.goals(user)
+
+    @classmethod
+    def history(cls, user, start, end):
+        """Rows for every day from start to end; days without activity are unsaved zero rows."""
+        rows = {
+            row.date: row
+            for row in cls.objects.filter(user=user, date__gte=start, date__lte=end)
+        }
+        days = []
+        day = start
+        while day <= end:
+            days.append(rows.get(day) or cls(
+                user=user, date=day,
+                **{target: getattr(user, goal) for _, _, target, goal in cls.GOALS},
+            ))
+            day += timedelta(days=1)
+        return days
+
 
 class RecentActivity(models.Model):
     """
@@ -289,3 +534,104 @@ class RecentActivity(models.Model):
 
     def __str__(self):
         return f'{self.activity_type}: {self.title}'
+
+
+class UserStatsSnapshot(models.Model):
+    """
+    Materialized stats block shown on the Dashboard, My Books and Flashcards
+    pages (books.views._build_stats), so each page reads one row by primary key.
+
+    Write paths that change an input mark the row stale (invalidate*()); the
+    next read recomputes it. The weekly study time covers the last 7 days
+    (UserStudyDay rollups) and the streak lapses when a day is missed:
+    both move at the user's local midnight, so weekly_expires_at is the
+    next one, after which the row is recomputed as well.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        primary_key=True, related_name='stats_snapshot',
+    )
+    completed_topics = models.PositiveIntegerField(default=0)
+    total_topics = models.PositiveIntegerField(
+        default=0, help_text='Topics across the books the user owns.',
+    )
+    quiz_average = models.PositiveSmallIntegerField(
+        default=0, help_text='Average score of the last 10 completed quizzes.',
+    )
+    weekly_study_seconds = models.PositiveIntegerField(default=0)
+    weekly_expires_at = models.DateTimeField(null=True, blank=True)
+    study_streak = models.PositiveIntegerField(default=0)
+    is_stale = models.BooleanField(default=True)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'User Stats Snapshot'
+        verbose_name_plural = 'User Stats Snapshots'
+
+    def __str__(self):
+        return f'Stats of {self.user_id}'
+
+    @classmethod
+    def invalidate(cls, user_id):
+        cls.objects.filter(pk=user_id).update(is_stale=True)
+
+    @classmethod
+    def invalidate_book_owners(cls, book_id):
+        """Topics of a book were added or removed: every owner's totals change."""
+        from books.models import UserBookAccess
+
+        cls.objects.filter(
+            pk__in=UserBookAccess.objects.filter(book_id=book_id).values('user_id'),
+        ).update(is_stale=True)
+
+    @classmethod
+    def for_user(cls, user):
+        """The user's current snapshot, recomputed if stale."""
+        snapshot = cls.objects.filter(pk=user.pk).first()
+        if snapshot and not snapshot.is_stale and (
+            snapshot.weekly_expires_at is None
+            or snapshot.weekly_expires_at > timezone.now()
+        ):
+            return snapshot
+        return cls.recompute(user)
+
+    @classmethod
+    def recompute(cls, user):
+        from books.models import Topic, UserBookAccess
+        from questions.models import QuizSession
+
+        # Clear the flag first: an invalidation that races with the
+        # computation leaves the row stale, so it is recomputed again
+        if not cls.objects.filter(pk=user.pk).update(is_stale=False):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(user=user, is_stale=False)
+            except IntegrityError:
+                cls.objects.filter(pk=user.pk).update(is_stale=False)
+
+        owned_book_ids = UserBookAccess.objects.filter(
+            user=user,
+        ).values_list('book_id', flat=True)
+        now = timezone.now()
+        weekly_seconds = UserStudyDay.week_seconds(user, user.local_date(now))
+        study_streak = user.active_study_streak
+
+        values = {
+            'completed_topics': UserTopicProgress.objects.filter(
+                user=user, topic__specialty__book_id__in=owned_book_ids,
+                is_completed=True,
+            ).count(),
+            'total_topics': Topic.objects.filter(
+                specialty__book_id__in=owned_book_ids,
+            ).count(),
+            'quiz_average': QuizSession.recent_average_score(user),
+            'weekly_study_seconds': weekly_seconds,
+            'weekly_expires_at': (
+                user.next_local_midnight(now) if weekly_seconds or study_streak else None
+            ),
+            'study_streak': study_streak,
+            'computed_at': now,
+        }
+        cls.objects.filter(pk=user.pk).update(**values)
+        return cls(user=user, is_stale=False, **values)
@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from books.models import Specialty, Topic, UserBookAccess
+from learning.events import STREAK_FIELDS, study_activity
+from learning.models import (
+    UserStatsSnapshot, UserStudyDay, UserStudySession, UserTopicProgress,
+)
+from questions.models import QuizSession
+
+# User fields the stats snapshot depends on
+SNAPSHOT_USER_FIELDS = {*STREAK_FIELDS, 'time_zone'}
+
+
+@receiver(post_save, sender=UserStudySession)
+def roll_up_study_session(sender, instance, created=False, raw=False, **kwargs):
+    """Single-row creates; bulk paths are rolled up by compact_study_sessions."""
+    if created and not raw and not instance.is_rolled_up:
+        UserStudyDay.record(instance)
+        UserStatsSnapshot.invalidate(instance.user_id)
+        study_activity(instance.user, instance.started_at)
+
+
+@receiver(post_save, sender=UserTopicProgress)
+@receiver(post_delete, sender=UserTopicProgress)
+@receiver(post_save, sender=UserBookAccess)
+@receiver(post_delete, sender=UserBookAccess)
+def invalidate_user_stats(sender, instance, **kwargs):
+    """Completion or owned books changed for this user."""
+    UserStatsSnapshot.invalidate(instance.user_id)
+
+
+@receiver(post_delete, sender=QuizSession)
+def invalidate_quiz_stats(sender, instance, **kwargs):
+    """Completed quizzes are also picked up by QuizSession.record_answers / finalize."""
+    if instance.is_completed:
+        UserStatsSnapshot.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+def invalidate_owner_stats(sender, instance, **kwargs):
+    """Topic totals changed for everyone who owns the book."""
+    # The specialty may already be gone when a book is deleted in cascade
+    book_id = Specialty.objects.filter(
+        pk=instance.specialty_id,
+    ).values_list('book_id', flat=True).first()
+    if book_id:
+        UserStatsSnapshot.invalidate_book_owners(book_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_streak(sender, instance, created=False, update_fields=None, **kwargs):
+    # Skip saves that cannot touch the streak (e.g. last_login on sign-in)
+    if created or (update_fields is not None and not SNAPSHOT_USER_FIELDS & set(update_fields)):
+        return
+    UserStatsSnapshot.invalidate(instance.pk)
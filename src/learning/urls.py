@@ -7,6 +7,8 @@ from .views import (
     AddLearningPlanTopicView,
     RemoveLearningPlanTopicView,
     RecordStudySessionView,
+    StudyTimeView,
+    DailyGoalsHistoryView,
 )
 
 app_name = 'learning'
@@ -23,4 +25,8 @@ urlpatterns = [
 
     # ── Study Sessions ──────────────────────────────────
     path('users/me/study-sessions/', RecordStudySessionView.as_view(), name='record-session'),
+    path('users/me/study-time/', StudyTimeView.as_view(), name='study-time'),
+
+    # ── Daily Goals ─────────────────────────────────────
+    path('users/me/daily-goals/', DailyGoalsHistoryView.as_view(), name='daily-goals'),
 ]
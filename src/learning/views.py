@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import date, timedelta
 
 from django.db.models import Sum
 from django.utils import timezone
@@ -6,11 +6,11 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from books.models import Book, Topic, UserBookAccess
+from books.models import Book, Specialty, Topic, UserBookAccess
 from books.views import _build_stats
 from learning.models import (
-    RecentActivity, UserTopicProgress, UserLearningPlanTopic,
-    UserStudySession,
+    RecentActivity, UserDailyActivity, UserTopicProgress,
+    UserLearningPlanTopic, UserStudyDay, UserStudySession,
 )
 from .serializers import (
     LearningPlanTopicSerializer,
@@ -100,35 +100,7 @@ class DashboardView(APIView):
             flashcard_action['resume'] = None
 
         # ── Today's Goals ────────────────────────────────
-        today = timezone.now().date()
-        today_topics_completed = UserTopicProgress.objects.filter(
-            user=user, updated_at__date=today, is_completed=True
-        ).count()
-
-        from questions.models import UserQuestionAttempt
-        today_questions = UserQuestionAttempt.objects.filter(
-            user=user, attempted_at__date=today,
-        ).count()
-
-        from flashcards.models import UserFlashcardProgress
-        today_flashcards = UserFlashcardProgress.objects.filter(
-            user=user, last_reviewed_at__date=today,
-        ).count()
-
-        goals = {
-            'topics': {
-                'target': user.daily_topics_goal,
-                'completed': today_topics_completed,
-            },
-            'flashcards': {
-                'target': user.daily_flashcard_goal,
-                'completed': today_flashcards,
-            },
-            'questions': {
-                'target': user.daily_questions_goal,
-                'completed': today_questions,
-            },
-        }
+        goals = UserDailyActivity.today(user)
 
         # ── Continue Learning ────────────────────────────
         # Recent in-progress topics
@@ -160,28 +132,22 @@ class DashboardView(APIView):
         board_basics = MyBookSerializer(books, many=True, context={'request': request}).data
 
         # ── CORE Progress Sumary ─────────────────────────
-        from books.models import Specialty
         from certificates.models import UserCOREProgress
         from certificates.serializers import COREProgressSerializer
-        
-        core_specialties = Specialty.objects.filter(
-            is_core_specialty=True,
-        ).order_by('core_display_order')
-        
-        badges = []
-        for spec in core_specialties:
-            progress, _ = UserCOREProgress.objects.get_or_create(
-                user=user, specialty=spec,
-            )
-            badges.append(progress)
-            
+        from questions import bank_stats
+
+        badges = UserCOREProgress.for_user(user)
+
         completed = sum(1 for b in badges if b.badge_status == UserCOREProgress.BadgeStatus.COMPLETED)
         total_badges = len(badges)
         
         core_progress = {
             'completed_badges': completed,
             'total_badges': total_badges,
-            'badges': COREProgressSerializer(badges[:2], many=True).data,
+            'badges': COREProgressSerializer(
+                badges[:2], many=True,
+                context={'question_totals': bank_stats.specialty_totals()},
+            ).data,
             'url': '/core/',
         }
 
@@ -283,3 +249,161 @@ class RecordStudySessionView(generics.CreateAPIView):
 
     serializer_class = StudySessionSerializer
 
+
+
+# ═════════════════════════════════════════════
+# 12.5  Study Time
+# ═════════════════════════════════════════════
+class StudyTimeView(APIView):
+    """
+    GET /api/v1/users/me/study-time/?period=daily|weekly|monthly&start=&end=
+    Study time per day, week (Monday start) or month, read from the daily
+    rollups (UserStudyDay) rather than raw sessions.
+    """
+
+    DEFAULT_BUCKETS = {'daily': 7, 'weekly': 8, 'monthly': 6}
+    MAX_BUCKETS = 400
+
+    @staticmethod
+    def _bucket(day, period):
+        if period == 'weekly':
+            return day - timedelta(days=day.weekday())
+        if period == 'monthly':
+            return day.replace(day=1)
+        return day
+
+    @staticmethod
+    def _next(bucket, period):
+        if period == 'weekly':
+            return bucket + timedelta(days=7)
+        if period == 'monthly':
+            return date(bucket.year + bucket.month // 12, bucket.month % 12 + 1, 1)
+        return bucket + timedelta(days=1)
+
+    def _parse_date(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        return date.fromisoformat(value)
+
+    def get(self, request):
+        period = request.query_params.get('period', 'daily')
+        if period not in self.DEFAULT_BUCKETS:
+            return Response(
+                {'detail': 'period must be daily, weekly or monthly.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            end = self._parse_date('end') or request.user.local_date()
+            start = self._parse_date('start')
+        except ValueError:
+            return Response(
+                {'detail': 'start and end must be dates (YYYY-MM-DD).'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # ── Buckets, oldest first ────────────────────────
+        last = self._bucket(end, period)
+        if start is None:
+            first = last
+            for _ in range(self.DEFAULT_BUCKETS[period] - 1):
+                first = self._bucket(first - timedelta(days=1), period)
+        else:
+            first = self._bucket(start, period)
+        if first > last:
+            return Response(
+                {'detail': 'start must not be after end.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        buckets = []
+        bucket = first
+        while bucket <= last:
+            buckets.append(bucket)
+            if len(buckets) > self.MAX_BUCKETS:
+                return Response(
+                    {'detail': f'At most {self.MAX_BUCKETS} buckets per request.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            bucket = self._next(bucket, period)
+        start = start or first
+
+        # ── Totals ───────────────────────────────────────
+        series = {
+            b: {'total_seconds': 0, 'by_type': {}} for b in buckets
+        }
+        by_type = {}
+        by_specialty = {}
+        rows = UserStudyDay.objects.filter(
+            user=request.user, date__gte=start, date__lte=end,
+        ).values_list('date', 'session_type', 'specialty_id', 'total_seconds')
+        for day, session_type, specialty_id, seconds in rows:
+            entry = series[self._bucket(day, period)]
+            entry['total_seconds'] += seconds
+            entry['by_type'][session_type] = entry['by_type'].get(session_type, 0) + seconds
+            by_type[session_type] = by_type.get(session_type, 0) + seconds
+            if specialty_id:
+                by_specialty[specialty_id] = by_specialty.get(specialty_id, 0) + seconds
+
+        names = dict(
+            Specialty.objects.filter(pk__in=by_specialty).values_list('pk', 'name')
+        ) if by_specialty else {}
+
+        return Response({
+            'period': period,
+            'start': start,
+            'end': end,
+            'total_seconds': sum(by_type.values()),
+            'by_type': by_type,
+            'series': [
+                {'date': b, **series[b]} for b in buckets
+            ],
+            'by_specialty': sorted(
+                (
+                    {'id': pk, 'name': names.get(pk, ''), 'total_seconds': seconds}
+                    for pk, seconds in by_specialty.items()
+                ),
+                key=lambda item: -item['total_seconds'],
+            ),
+        })
+
+
+# ═════════════════════════════════════════════
+# 12.6  Daily Goals History
+# ═════════════════════════════════════════════
+class DailyGoalsHistoryView(APIView):
+    """
+    GET /api/v1/users/me/daily-goals/?days=7
+    Goal attainment for each of the last `days` days (today included).
+    """
+
+    MAX_DAYS = 90
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get('days', 7))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= self.MAX_DAYS:
+            return Response(
+                {'detail': f'days must be a number from 1 to {self.MAX_DAYS}.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        end = request.user.local_date()
+        start = end - timedelta(days=days - 1)
+        history = [
+            {'date': row.date, **row.goals()}
+            for row in UserDailyActivity.history(request.user, start, end)
+        ]
+        keys = [key for key, *_ in UserDailyActivity.GOALS]
+
+        def all_met(day):
+            results = [day[key]['met'] for key in keys if day[key]['met'] is not None]
+            return bool(results) and all(results)
+
+        return Response({
+            'start': start,
+            'end': end,
+            'days_all_met': sum(1 for day in history if all_met(day)),
+            'history': history,
+        })
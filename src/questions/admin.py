@@ -21,7 +21,7 @@ class QuestionAdmin(ModelAdmin):
     list_display_links = ('question_preview',)
     list_filter = ('difficulty', 'is_active', 'specialty__book', 'specialty')
     list_editable = ('is_active',)
-    search_fields = ('question_text', 'explanation', 'specialty__name', 'topic__title')
+    search_fields = ('search_text', 'specialty__name', 'topic__title')
     list_per_page = 25
     ordering = ('specialty__name', '-created_at')
 
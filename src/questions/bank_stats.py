@@ -0,0 +1,103 @@
+"""
+Per-book question counts for the question bank pages.
+
+Both the book totals (active questions per book) and a user's per-book
+answered / correct / incorrect counts come from one GROUP BY query each,
+so the pages cost a constant number of queries however many books a user
+owns. Results are cached under the question pool versions from
+`questions.pool`: saving a question bumps the pool version and every
+answer or save bumps the user's version, so a submission is reflected on
+the next request. The TTLs only bound staleness when the cache backend
+is not shared between processes.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from questions import pool
+
+TOTALS_KEY = 'questions:bank:totals:{}'
+SPECIALTY_TOTALS_KEY = 'questions:bank:specialty-totals:{}'
+USER_COUNTS_KEY = 'questions:bank:user:{}:{}:{}'
+TOTALS_TTL_SECONDS = 300
+USER_COUNTS_TTL_SECONDS = 60
+
+EMPTY_COUNTS = {'answered': 0, 'correct': 0, 'incorrect': 0}
+
+
+def _book_totals(pool_version):
+    """{book_id: active question count}"""
+    key = TOTALS_KEY.format(pool_version)
+    totals = cache.get(key)
+    if totals is None:
+        from questions.models import Question
+
+        totals = dict(
+            Question.objects.filter(is_active=True)
+            .values_list('specialty__book_id')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        cache.set(key, totals, TOTALS_TTL_SECONDS)
+    return totals
+
+
+def specialty_totals():
+    """{specialty_id: active question count}, cached per pool version."""
+    key = SPECIALTY_TOTALS_KEY.format(pool.current_pool_version())
+    totals = cache.get(key)
+    if totals is None:
+        from questions.models import Question
+
+        totals = dict(
+            Question.objects.filter(is_active=True)
+            .values_list('specialty_id')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        cache.set(key, totals, TOTALS_TTL_SECONDS)
+    return totals
+
+
+def _user_book_counts(user_id, pool_version, user_version):
+    """{book_id: {'answered', 'correct', 'incorrect'}} from the latest answers."""
+    key = USER_COUNTS_KEY.format(user_id, pool_version, user_version)
+    counts = cache.get(key)
+    if counts is None:
+        from questions.models import UserQuestionState
+
+        rows = (
+            UserQuestionState.objects.filter(
+                user_id=user_id, attempt_count__gt=0, question__is_active=True,
+            )
+            .values('question__specialty__book_id')
+            .annotate(
+                answered=Count('id'),
+                correct=Count('id', filter=Q(is_correct=True)),
+                incorrect=Count('id', filter=Q(is_correct=False)),
+            )
+            .order_by()
+        )
+        counts = {
+            row['question__specialty__book_id']: {
+                'answered': row['answered'],
+                'correct': row['correct'],
+                'incorrect': row['incorrect'],
+            }
+            for row in rows
+        }
+        cache.set(key, counts, USER_COUNTS_TTL_SECONDS)
+    return counts
+
+
+def book_summaries(user_id):
+    """
+    Per-book counts for a user: {book_id: {'total', 'answered', 'correct',
+    'incorrect'}}, for every book that has active questions.
+    """
+    pool_version, user_version = pool.current_versions(user_id)
+    totals = _book_totals(pool_version)
+    counts = _user_book_counts(user_id, pool_version, user_version)
+    return {
+        book_id: {'total': total, **counts.get(book_id, EMPTY_COUNTS)}
+        for book_id, total in totals.items()
+    }
@@ -0,0 +1,70 @@
+"""
+Rebuild the per-user UserQuestionState table from UserQuestionAttempt history.
+Usage: python manage.py rebuild_question_states [--batch-size 1000]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from questions.models import UserQuestionAttempt, UserQuestionState
+
+
+class Command(BaseCommand):
+    help = "Recompute each user's latest question state from the attempt history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of state rows inserted per query (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # Newest attempt first within each (user, question) pair
+        attempts = (
+            UserQuestionAttempt.objects
+            .order_by('user_id', 'question_id', '-attempted_at')
+            .values_list(
+                'user_id', 'question_id', 'selected_answer', 'is_correct',
+                'is_saved', 'time_spent_seconds', 'attempted_at',
+            )
+        )
+
+        total = 0
+        batch = []
+        current = None
+        state = None
+
+        with transaction.atomic():
+            UserQuestionState.objects.all().delete()
+
+            for user_id, question_id, answer, correct, saved, spent, at in attempts.iterator(chunk_size=batch_size):
+                if (user_id, question_id) != current:
+                    current = (user_id, question_id)
+                    state = UserQuestionState(
+                        user_id=user_id,
+                        question_id=question_id,
+                        selected_answer=answer,
+                        is_correct=correct,
+                        last_time_spent_seconds=spent,
+                        last_attempted_at=at,
+                        attempt_count=0,
+                    )
+                    batch.append(state)
+                state.attempt_count += 1
+                state.is_saved = state.is_saved or saved
+
+                if len(batch) > batch_size:
+                    # Keep the last (possibly incomplete) state for further attempts
+                    UserQuestionState.objects.bulk_create(batch[:-1])
+                    total += len(batch) - 1
+                    batch = batch[-1:]
+
+            UserQuestionState.objects.bulk_create(batch)
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Rebuilt {total} question states."
+        ))
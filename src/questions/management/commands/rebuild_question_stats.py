@@ -0,0 +1,49 @@
+"""
+Rebuild the denormalized QuestionStats table from UserQuestionAttempt history.
+Usage: python manage.py rebuild_question_stats [--batch-size 1000]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+
+from questions.models import QuestionStats, UserQuestionAttempt
+
+
+class Command(BaseCommand):
+    help = "Recompute per-question answer statistics from the attempt history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of stats rows inserted per query (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        aggregates = {
+            'total_attempts': Count('id'),
+            'correct_count': Count('id', filter=Q(is_correct=True)),
+            'incorrect_count': Count('id', filter=Q(is_correct=False)),
+        }
+        for key, field in QuestionStats.OPTION_FIELDS.items():
+            aggregates[field] = Count('id', filter=Q(selected_answer=key))
+
+        rows = (
+            UserQuestionAttempt.objects.order_by()
+            .values('question_id')
+            .annotate(**aggregates)
+        )
+
+        with transaction.atomic():
+            QuestionStats.objects.all().delete()
+            created = QuestionStats.objects.bulk_create(
+                (QuestionStats(**row) for row in rows.iterator()),
+                batch_size=batch_size,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Rebuilt stats for {len(created)} questions."
+        ))
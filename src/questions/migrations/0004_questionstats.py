@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-17 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0003_question_book_question_related_topic'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionStats',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='questions.question')),
+                ('total_attempts', models.PositiveIntegerField(default=0)),
+                ('option_a_count', models.PositiveIntegerField(default=0)),
+                ('option_b_count', models.PositiveIntegerField(default=0)),
+                ('option_c_count', models.PositiveIntegerField(default=0)),
+                ('option_d_count', models.PositiveIntegerField(default=0)),
+                ('option_e_count', models.PositiveIntegerField(default=0)),
+                ('correct_count', models.PositiveIntegerField(default=0)),
+                ('incorrect_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Question Stats',
+                'verbose_name_plural': 'Question Stats',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.2 on 2026-10-17 10:05
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0004_questionstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserQuestionState',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('selected_answer', models.CharField(blank=True, choices=[('A', 'A'), ('B', 'B'), ('C', 'C'), ('D', 'D'), ('E', 'E')], help_text='Answer selected in the latest attempt.', max_length=1)),
+                ('is_correct', models.BooleanField(blank=True, help_text='Correctness of the latest attempt (null = never answered).', null=True)),
+                ('is_saved', models.BooleanField(default=False, help_text='User bookmarked/saved this question.')),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('last_time_spent_seconds', models.PositiveIntegerField(default=0)),
+                ('last_attempted_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_states', to='questions.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Question State',
+                'verbose_name_plural': 'Question States',
+                'indexes': [models.Index(fields=['user', 'is_correct'], name='questions_u_user_id_102dc5_idx'), models.Index(fields=['user', 'is_saved'], name='questions_u_user_id_287976_idx'), models.Index(fields=['user', '-last_attempted_at'], name='questions_u_user_id_ce2fd0_idx')],
+                'unique_together': {('user', 'question')},
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-17 11:00
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0005_userquestionstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizItem',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('position', models.PositiveIntegerField(help_text='1-indexed order of this question within the quiz.')),
+                ('answered_at', models.DateTimeField(blank=True, help_text='When the question was first answered within this quiz.', null=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_items', to='questions.question')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='questions.quizsession')),
+            ],
+            options={
+                'verbose_name': 'Quiz Item',
+                'verbose_name_plural': 'Quiz Items',
+                'ordering': ['session', 'position'],
+                'unique_together': {('session', 'position'), ('session', 'question')},
+            },
+        ),
+    ]
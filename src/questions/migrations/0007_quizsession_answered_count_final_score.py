@@ -0,0 +1,59 @@
+# Generated by Django 6.0.2 on 2026-10-17 12:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_session_scores(apps, schema_editor):
+    """Fill answered_count, and final_score for completed sessions, from attempts."""
+    QuizSession = apps.get_model('questions', 'QuizSession')
+    UserQuestionAttempt = apps.get_model('questions', 'UserQuestionAttempt')
+
+    totals = (
+        UserQuestionAttempt.objects.filter(quiz_session__isnull=False)
+        .values('quiz_session')
+        .annotate(
+            attempts=Count('id'),
+            correct=Count('id', filter=Q(is_correct=True)),
+            answered=Count('question', distinct=True),
+        )
+    )
+    by_session = {row['quiz_session']: row for row in totals}
+
+    sessions = list(QuizSession.objects.filter(id__in=by_session))
+    for session in sessions:
+        row = by_session[session.id]
+        session.answered_count = row['answered']
+        if session.is_completed:
+            session.final_score = round((row['correct'] / row['attempts']) * 100)
+    QuizSession.objects.bulk_update(
+        sessions, ['answered_count', 'final_score'], batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0005_remove_topic_estimated_tasks'),
+        ('questions', '0006_quizitem'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizsession',
+            name='answered_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of distinct quiz questions answered so far.'),
+        ),
+        migrations.AddField(
+            model_name='quizsession',
+            name='final_score',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Score percentage (correct / answered) stored when the quiz is finalized.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='quizsession',
+            index=models.Index(fields=['user', 'is_completed', '-completed_at'], name='questions_q_user_id_92ab1c_idx'),
+        ),
+        migrations.RunPython(backfill_session_scores, migrations.RunPython.noop),
+    ]
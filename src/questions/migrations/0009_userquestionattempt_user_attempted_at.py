@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-17 20:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0008_question_search_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userquestionattempt',
+            index=models.Index(fields=['user', 'attempted_at'], name='questions_u_user_id_75e3ef_idx'),
+        ),
+    ]
@@ -1,8 +1,13 @@
 import uuid
 from django.db import models
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from django_ckeditor_5.fields import CKEditor5Field
 
+from core.text import plain_text
+from questions import pool
+
 
 class Question(models.Model):
     """
@@ -124,10 +129,18 @@ class Question(models.Model):
         help_text='Patient demographic tag (e.g., "Age ≥65 y").'
     )
 
+    # Plain text of the fields above, for search (see search/)
+    search_text = models.TextField(blank=True, editable=False)
+
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    SEARCH_FIELDS = (
+        'question_text', 'option_a', 'option_b', 'option_c', 'option_d', 'option_e',
+        'explanation', 'educational_objective', 'key_point',
+    )
+
     class Meta:
         verbose_name = 'Question'
         verbose_name_plural = 'Questions'
@@ -140,6 +153,16 @@ class Question(models.Model):
         clean = re.sub(r'<[^>]+>', '', text)
         return f'Q: {clean[:80]}...' if len(clean) > 80 else f'Q: {clean}'
 
+    def build_search_text(self):
+        return plain_text(*(getattr(self, name) for name in self.SEARCH_FIELDS))
+
+    def save(self, *args, **kwargs):
+        self.search_text = self.build_search_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(self.SEARCH_FIELDS):
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
+        super().save(*args, **kwargs)
+
 
 class UserQuestionAttempt(models.Model):
     """
@@ -177,6 +200,7 @@ class UserQuestionAttempt(models.Model):
         verbose_name = 'Question Attempt'
         verbose_name_plural = 'Question Attempts'
         ordering = ['-attempted_at']
+        indexes = [models.Index(fields=['user', 'attempted_at'])]
 
     def __str__(self):
         status = '✓' if self.is_correct else '✗'
@@ -217,9 +241,16 @@ class QuizSession(models.Model):
         help_text='Specialties included in this quiz.'
     )
     total_questions = models.PositiveIntegerField(default=0)
+    answered_count = models.PositiveIntegerField(
+        default=0, help_text='Number of distinct quiz questions answered so far.'
+    )
     correct_count = models.PositiveIntegerField(default=0)
     total_time_seconds = models.PositiveIntegerField(default=0)
     is_completed = models.BooleanField(default=False)
+    final_score = models.PositiveSmallIntegerField(
+        null=True, blank=True,
+        help_text='Score percentage (correct / answered) stored when the quiz is finalized.'
+    )
 
     # ── Figma Part 2: Timing options (untimed, 60s/q, 90s/q) ───────
     time_limit_per_question = models.PositiveIntegerField(
@@ -240,6 +271,9 @@ class QuizSession(models.Model):
         verbose_name = 'Quiz Session'
         verbose_name_plural = 'Quiz Sessions'
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['user', 'is_completed', '-completed_at']),
+        ]
 
     def __str__(self):
         name = self.title or self.mode
@@ -250,3 +284,381 @@ class QuizSession(models.Model):
         if self.total_questions == 0:
             return 0
         return round((self.correct_count / self.total_questions) * 100, 1)
+
+    @classmethod
+    def record_answers(cls, session_id, answered, correct, time_seconds):
+        """
+        Add answers to the session counters with database-side increments,
+        then finalize the session once every question has been answered.
+        `answered` / `correct` only count first answers to a quiz item.
+        """
+        cls.objects.filter(pk=session_id).update(
+            answered_count=models.F('answered_count') + answered,
+            correct_count=models.F('correct_count') + correct,
+            total_time_seconds=models.F('total_time_seconds') + time_seconds,
+        )
+        if answered:
+            finalized = cls._finalize(
+                cls.objects.filter(
+                    pk=session_id, answered_count__gte=models.F('total_questions'),
+                )
+            )
+            if finalized:
+                cls._invalidate_stats(
+                    cls.objects.filter(pk=session_id).values_list('user_id', flat=True).first()
+                )
+
+    @classmethod
+    def _finalize(cls, queryset):
+        """Mark open sessions completed and store their rounded score."""
+        answered = models.F('answered_count')
+        return queryset.filter(is_completed=False).update(
+            is_completed=True,
+            completed_at=timezone.now(),
+            final_score=models.Case(
+                models.When(answered_count=0, then=models.Value(0)),
+                # round(100 * correct / answered) in integer arithmetic
+                default=(models.F('correct_count') * 200 + answered) / (answered * 2),
+            ),
+        )
+
+    @staticmethod
+    def _invalidate_stats(user_id):
+        # A newly completed quiz changes the "last 10 quizzes" average
+        from learning.models import UserStatsSnapshot
+        UserStatsSnapshot.invalidate(user_id)
+
+    def finalize(self):
+        """Complete the session (idempotent) and refresh its stored score."""
+        finalized = self._finalize(type(self).objects.filter(pk=self.pk))
+        if finalized:
+            self._invalidate_stats(self.user_id)
+        self.refresh_from_db(fields=[
+            'answered_count', 'correct_count', 'total_time_seconds',
+            'is_completed', 'completed_at', 'final_score',
+        ])
+        return bool(finalized)
+
+    @classmethod
+    def recent_average_score(cls, user, limit=10):
+        """Average stored score of the user's last `limit` completed quizzes."""
+        scores = list(
+            cls.objects.filter(
+                user=user, is_completed=True, final_score__isnull=False,
+            ).order_by('-completed_at').values_list('final_score', flat=True)[:limit]
+        )
+        return round(sum(scores) / len(scores)) if scores else 0
+
+    @classmethod
+    def create_with_questions(cls, user, question_ids, specialty_ids=None, **fields):
+        """Create a session and its ordered quiz items in one transaction."""
+        with transaction.atomic():
+            session = cls.objects.create(
+                user=user, total_questions=len(question_ids), **fields,
+            )
+            QuizItem.objects.bulk_create([
+                QuizItem(session=session, question_id=question_id, position=position)
+                for position, question_id in enumerate(question_ids, start=1)
+            ])
+            if specialty_ids:
+                session.specialties.set(specialty_ids)
+        return session
+
+
+class QuizItem(models.Model):
+    """
+    One question slot in a quiz session, in the order it was sampled.
+    Written in a single bulk insert when the session is created so the
+    client (and the server) can walk the quiz without re-sampling.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    session = models.ForeignKey(
+        QuizSession, on_delete=models.CASCADE, related_name='items'
+    )
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name='quiz_items'
+    )
+    position = models.PositiveIntegerField(
+        help_text='1-indexed order of this question within the quiz.'
+    )
+    answered_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text='When the question was first answered within this quiz.'
+    )
+
+    class Meta:
+        verbose_name = 'Quiz Item'
+        verbose_name_plural = 'Quiz Items'
+        ordering = ['session', 'position']
+        unique_together = [['session', 'position'], ['session', 'question']]
+
+    def __str__(self):
+        return f'{self.session_id} #{self.position} Q:{self.question_id}'
+
+
+class QuestionStats(models.Model):
+    """
+    Denormalized answer statistics for a question.
+    One row per question, updated in the same transaction as each
+    UserQuestionAttempt insert so the answer path and the question detail
+    read a single row instead of aggregating the full attempt history.
+    Rebuild from history with: python manage.py rebuild_question_stats
+    """
+
+    OPTION_FIELDS = {
+        'A': 'option_a_count',
+        'B': 'option_b_count',
+        'C': 'option_c_count',
+        'D': 'option_d_count',
+        'E': 'option_e_count',
+    }
+
+    question = models.OneToOneField(
+        Question, on_delete=models.CASCADE, primary_key=True,
+        related_name='stats'
+    )
+    total_attempts = models.PositiveIntegerField(default=0)
+    option_a_count = models.PositiveIntegerField(default=0)
+    option_b_count = models.PositiveIntegerField(default=0)
+    option_c_count = models.PositiveIntegerField(default=0)
+    option_d_count = models.PositiveIntegerField(default=0)
+    option_e_count = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+    incorrect_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Question Stats'
+        verbose_name_plural = 'Question Stats'
+
+    def __str__(self):
+        return f'Q:{self.question_id} — {self.correct_count}/{self.total_attempts} correct'
+
+    @classmethod
+    def record(cls, question_id, selected_answer, is_correct, count=1):
+        """
+        Atomically add `count` answers for one option to a question's stats.
+        Uses a database-side increment, creating the row on first use.
+        """
+        changes = {
+            'total_attempts': models.F('total_attempts') + count,
+            cls.OPTION_FIELDS[selected_answer]: models.F(cls.OPTION_FIELDS[selected_answer]) + count,
+        }
+        if is_correct:
+            changes['correct_count'] = models.F('correct_count') + count
+        else:
+            changes['incorrect_count'] = models.F('incorrect_count') + count
+        changes['updated_at'] = timezone.now()
+
+        if cls.objects.filter(question_id=question_id).update(**changes):
+            return
+        cls.objects.get_or_create(question_id=question_id)
+        cls.objects.filter(question_id=question_id).update(**changes)
+
+    @classmethod
+    def record_many(cls, answers):
+        """
+        Add a batch of answers, given as (question_id, selected_answer, is_correct)
+        tuples. Answers are grouped by (option, correctness) so the batch costs
+        at most ten UPDATE statements regardless of its size.
+        """
+        groups = {}
+        for question_id, selected_answer, is_correct in answers:
+            groups.setdefault((selected_answer, is_correct), {}).setdefault(question_id, 0)
+            groups[(selected_answer, is_correct)][question_id] += 1
+        if not groups:
+            return
+
+        question_ids = {qid for counts in groups.values() for qid in counts}
+        cls.objects.bulk_create(
+            [cls(question_id=qid) for qid in question_ids],
+            ignore_conflicts=True,
+        )
+
+        now = timezone.now()
+        for (selected_answer, is_correct), counts in groups.items():
+            # Split by count so each UPDATE applies a single increment
+            by_count = {}
+            for qid, count in counts.items():
+                by_count.setdefault(count, []).append(qid)
+            option_field = cls.OPTION_FIELDS[selected_answer]
+            result_field = 'correct_count' if is_correct else 'incorrect_count'
+            for count, qids in by_count.items():
+                cls.objects.filter(question_id__in=qids).update(**{
+                    'total_attempts': models.F('total_attempts') + count,
+                    option_field: models.F(option_field) + count,
+                    result_field: models.F(result_field) + count,
+                    'updated_at': now,
+                })
+
+    def peer_stats(self):
+        """Percentage of answers per option, e.g. {'A': 5, 'B': 68, ...}."""
+        total = self.total_attempts
+        return {
+            key: round((getattr(self, field) / total) * 100) if total else 0
+            for key, field in self.OPTION_FIELDS.items()
+        }
+
+
+class UserQuestionState(models.Model):
+    """
+    The latest state of a question for a user: last answer, correctness,
+    saved flag and attempt count. One row per (user, question), maintained
+    on answer submission and on toggle-save, so the question bank lists and
+    filters join this table instead of scanning the attempt history.
+    Rebuild from history with: python manage.py rebuild_question_states
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name='question_states'
+    )
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name='user_states'
+    )
+    selected_answer = models.CharField(
+        max_length=1, choices=Question.CORRECT_CHOICES, blank=True,
+        help_text='Answer selected in the latest attempt.'
+    )
+    is_correct = models.BooleanField(
+        null=True, blank=True,
+        help_text='Correctness of the latest attempt (null = never answered).'
+    )
+    is_saved = models.BooleanField(
+        default=False, help_text='User bookmarked/saved this question.'
+    )
+    attempt_count = models.PositiveIntegerField(default=0)
+    last_time_spent_seconds = models.PositiveIntegerField(default=0)
+    last_attempted_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Question State'
+        verbose_name_plural = 'Question States'
+        unique_together = ['user', 'question']
+        indexes = [
+            models.Index(fields=['user', 'is_correct']),
+            models.Index(fields=['user', 'is_saved']),
+            models.Index(fields=['user', '-last_attempted_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} — Q:{self.question_id} ({self.attempt_count} attempts)'
+
+    @classmethod
+    def _upsert(cls, user_id, question_id, changes, defaults):
+        """Apply `changes` to the row, creating it from `defaults` if missing."""
+        if cls.objects.filter(user_id=user_id, question_id=question_id).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(user_id=user_id, question_id=question_id, **defaults)
+        except IntegrityError:
+            # A concurrent request created the row first
+            cls.objects.filter(user_id=user_id, question_id=question_id).update(**changes)
+
+    @classmethod
+    def record_attempt(cls, user_id, question_id, selected_answer, is_correct,
+                       time_spent_seconds, attempted_at):
+        """
+        Fold a new attempt into the user's state for this question.
+        Returns the previous (attempt_count, is_correct), or (0, None) for a
+        first attempt, so callers can maintain distinct-question counters.
+        """
+        values = {
+            'selected_answer': selected_answer,
+            'is_correct': is_correct,
+            'last_time_spent_seconds': time_spent_seconds,
+            'last_attempted_at': attempted_at,
+        }
+        with transaction.atomic():
+            previous = (
+                cls.objects.select_for_update()
+                .filter(user_id=user_id, question_id=question_id)
+                .values_list('attempt_count', 'is_correct')
+                .first()
+            )
+            cls._upsert(
+                user_id, question_id,
+                changes={
+                    **values,
+                    'attempt_count': models.F('attempt_count') + 1,
+                    'updated_at': timezone.now(),
+                },
+                defaults={**values, 'attempt_count': 1},
+            )
+        pool.invalidate_user(user_id)
+        return previous or (0, None)
+
+    @classmethod
+    def record_attempts(cls, user_id, attempts):
+        """
+        Fold a batch of attempts (one per question) into the user's states:
+        one locked read, one bulk update and one bulk insert. Returns the
+        previous (attempt_count, is_correct) per question, as record_attempt.
+        """
+        if not attempts:
+            return {}
+        by_question = {attempt.question_id: attempt for attempt in attempts}
+        previous = dict.fromkeys(by_question, (0, None))
+        now = timezone.now()
+
+        with transaction.atomic():
+            existing = list(
+                cls.objects.select_for_update()
+                .filter(user_id=user_id, question_id__in=by_question)
+            )
+            for state in existing:
+                previous[state.question_id] = (state.attempt_count, state.is_correct)
+                attempt = by_question.pop(state.question_id)
+                state.selected_answer = attempt.selected_answer
+                state.is_correct = attempt.is_correct
+                state.last_time_spent_seconds = attempt.time_spent_seconds
+                state.last_attempted_at = attempt.attempted_at
+                state.attempt_count = models.F('attempt_count') + 1
+                state.updated_at = now
+            cls.objects.bulk_update(existing, [
+                'selected_answer', 'is_correct', 'last_time_spent_seconds',
+                'last_attempted_at', 'attempt_count', 'updated_at',
+            ])
+
+            new_states = [
+                cls(
+                    user_id=user_id, question_id=question_id,
+                    selected_answer=attempt.selected_answer,
+                    is_correct=attempt.is_correct,
+                    last_time_spent_seconds=attempt.time_spent_seconds,
+                    last_attempted_at=attempt.attempted_at,
+                    attempt_count=1,
+                )
+                for question_id, attempt in by_question.items()
+            ]
+            try:
+                with transaction.atomic():
+                    cls.objects.bulk_create(new_states)
+            except IntegrityError:
+                # A concurrent request created some of the rows first
+                for attempt in by_question.values():
+                    previous[attempt.question_id] = cls.record_attempt(
+                        user_id, attempt.question_id,
+                        selected_answer=attempt.selected_answer,
+                        is_correct=attempt.is_correct,
+                        time_spent_seconds=attempt.time_spent_seconds,
+                        attempted_at=attempt.attempted_at,
+                    )
+        pool.invalidate_user(user_id)
+        return previous
+
+    @classmethod
+    def toggle_saved(cls, user_id, question_id):
+        """Flip the saved flag and return its new value."""
+        with transaction.atomic():
+            state, _ = cls.objects.select_for_update().get_or_create(
+                user_id=user_id, question_id=question_id,
+            )
+            state.is_saved = not state.is_saved
+            state.save(update_fields=['is_saved', 'updated_at'])
+        pool.invalidate_user(user_id)
+        return state.is_saved
@@ -0,0 +1,240 @@
+"""
+Process-local index of the active question pool, used to build quizzes.
+
+The index holds every active question ID in sorted order, with arrays of
+positions per specialty and per book, and per-user bitsets for answered /
+correct / incorrect / saved questions. Quiz building becomes set algebra on
+integers plus a random sample, instead of materializing the question table
+and running attempt subqueries on every request.
+
+Both levels are versioned through the Django cache:
+  - the pool version is bumped whenever a Question is saved or deleted,
+  - a user's version is bumped whenever their question state changes.
+Every process compares its copy against the shared versions on each use
+and rebuilds lazily. POOL_TTL_SECONDS bounds staleness when the cache
+backend is not shared between processes or a bulk update skipped signals.
+"""
+import random
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import transaction
+
+POOL_VERSION_KEY = 'questions:pool:version'
+USER_VERSION_KEY = 'questions:pool:user:{}'
+POOL_TTL_SECONDS = 300
+MAX_CACHED_USERS = 512
+
+# Bit positions set in each byte value, for fast bitset → positions decoding
+_BYTE_BITS = [tuple(i for i in range(8) if value >> i & 1) for value in range(256)]
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def _bump(key):
+    cache.set(key, _new_version(), None)
+
+
+def invalidate_pool():
+    """Mark the question pool as changed (after the current transaction commits)."""
+    transaction.on_commit(lambda: _bump(POOL_VERSION_KEY))
+
+
+def invalidate_user(user_id):
+    """Mark a user's answered/saved bitsets as changed (after commit)."""
+    transaction.on_commit(lambda: _bump(USER_VERSION_KEY.format(user_id)))
+
+
+def current_versions(user_id):
+    """Shared (pool version, user version) pair, creating missing keys."""
+    user_key = USER_VERSION_KEY.format(user_id)
+    versions = cache.get_many([POOL_VERSION_KEY, user_key])
+    for key in (POOL_VERSION_KEY, user_key):
+        if key not in versions:
+            cache.add(key, _new_version(), None)
+            versions[key] = cache.get(key)
+    return versions[POOL_VERSION_KEY], versions[user_key]
+
+
+def current_pool_version():
+    """Shared pool version, creating the key if missing."""
+    version = cache.get(POOL_VERSION_KEY)
+    if version is None:
+        cache.add(POOL_VERSION_KEY, _new_version(), None)
+        version = cache.get(POOL_VERSION_KEY)
+    return version
+
+
+def _mask(positions):
+    mask = 0
+    for pos in positions:
+        mask |= 1 << pos
+    return mask
+
+
+def _positions(mask):
+    """Decode a bitset into its sorted list of set positions."""
+    out = []
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+    for byte_index, value in enumerate(data):
+        if value:
+            base = byte_index * 8
+            out.extend(base + bit for bit in _BYTE_BITS[value])
+    return out
+
+
+class UserBits:
+    """Compact bitsets of a user's question states, aligned to a pool index."""
+
+    __slots__ = ('answered', 'correct', 'incorrect', 'saved')
+
+    def __init__(self, index, user_id):
+        from questions.models import UserQuestionState
+
+        self.answered = self.correct = self.incorrect = self.saved = 0
+        rows = UserQuestionState.objects.filter(user_id=user_id).values_list(
+            'question_id', 'attempt_count', 'is_correct', 'is_saved',
+        )
+        position = index.position
+        for question_id, attempt_count, is_correct, is_saved in rows:
+            pos = position.get(question_id)
+            if pos is None:
+                continue  # inactive or deleted question
+            bit = 1 << pos
+            if attempt_count:
+                self.answered |= bit
+                if is_correct:
+                    self.correct |= bit
+                elif is_correct is False:
+                    self.incorrect |= bit
+            if is_saved:
+                self.saved |= bit
+
+
+class QuestionPoolIndex:
+    """Sorted active question IDs with per-specialty / per-book position arrays."""
+
+    def __init__(self, version):
+        from questions.models import Question
+
+        self.version = version
+        self.built_at = time.monotonic()
+
+        rows = list(
+            Question.objects.filter(is_active=True)
+            .order_by('id')
+            .values_list('id', 'specialty_id', 'specialty__book_id')
+        )
+        self.ids = [row[0] for row in rows]
+        self.position = {qid: pos for pos, qid in enumerate(self.ids)}
+
+        by_specialty = {}
+        by_book = {}
+        for pos, (_, specialty_id, book_id) in enumerate(rows):
+            by_specialty.setdefault(specialty_id, array('I')).append(pos)
+            by_book.setdefault(book_id, array('I')).append(pos)
+        self.specialty_positions = by_specialty
+        self.book_positions = by_book
+
+        self.all_mask = (1 << len(self.ids)) - 1
+        self.specialty_masks = {k: _mask(v) for k, v in by_specialty.items()}
+        self.book_masks = {k: _mask(v) for k, v in by_book.items()}
+
+        self._users = OrderedDict()
+        self._users_lock = threading.Lock()
+
+    @property
+    def is_expired(self):
+        return time.monotonic() - self.built_at > POOL_TTL_SECONDS
+
+    def user_bits(self, user_id, user_version):
+        with self._users_lock:
+            cached = self._users.get(user_id)
+            if cached and cached[0] == user_version:
+                self._users.move_to_end(user_id)
+                return cached[1]
+
+        bits = UserBits(self, user_id)
+        with self._users_lock:
+            self._users[user_id] = (user_version, bits)
+            self._users.move_to_end(user_id)
+            while len(self._users) > MAX_CACHED_USERS:
+                self._users.popitem(last=False)
+        return bits
+
+    def candidates(self, bits, specialty_ids=None, book_ids=None,
+                   answer_status='all', saved_only=False):
+        """Bitset of questions matching the content and answer filters."""
+        mask = self.all_mask
+        if specialty_ids:
+            area = 0
+            for specialty_id in specialty_ids:
+                area |= self.specialty_masks.get(specialty_id, 0)
+            mask &= area
+        if book_ids:
+            area = 0
+            for book_id in book_ids:
+                area |= self.book_masks.get(book_id, 0)
+            mask &= area
+
+        if answer_status == 'incorrect':
+            mask &= bits.incorrect
+        elif answer_status == 'correct':
+            mask &= bits.correct
+        elif answer_status == 'unanswered':
+            mask &= ~bits.answered
+
+        if saved_only:
+            mask &= bits.saved
+        return mask
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _get_index(pool_version):
+    global _index
+    index = _index
+    if index is not None and index.version == pool_version and not index.is_expired:
+        return index
+    with _index_lock:
+        index = _index
+        if index is None or index.version != pool_version or index.is_expired:
+            index = _index = QuestionPoolIndex(pool_version)
+    return index
+
+
+def sample_questions(user_id, count, specialty_ids=None, book_ids=None,
+                     answer_status='all', saved_only=False):
+    """
+    Randomly pick up to `count` active question IDs for a user.
+    Filters mirror the custom quiz builder: content areas (specialties),
+    books, answer status (all / unanswered / correct / incorrect) and saved.
+    """
+    pool_version, user_version = current_versions(user_id)
+    index = _get_index(pool_version)
+
+    needs_user = answer_status != 'all' or saved_only
+    bits = index.user_bits(user_id, user_version) if needs_user else None
+
+    mask = index.candidates(
+        bits,
+        specialty_ids=specialty_ids,
+        book_ids=book_ids,
+        answer_status=answer_status,
+        saved_only=saved_only,
+    )
+    available = mask.bit_count()
+    if not available:
+        return []
+
+    positions = _positions(mask)
+    picked = random.sample(positions, min(count, available))
+    return [index.ids[pos] for pos in picked]
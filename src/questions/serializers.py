@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from questions.models import Question, UserQuestionAttempt, QuizSession
+from questions.models import Question, QuizItem, QuizSession, UserQuestionState
 
 
 # ─────────────────────────────────────────────
@@ -18,19 +18,21 @@ class QuestionRowSerializer(serializers.ModelSerializer):
             'id', 'educational_objective', 'is_correct', 'is_saved', 'tags',
         ]
 
-    def _attempt(self, obj):
+    def _state(self, obj):
+        """(is_correct, is_saved) from the annotated join, or one lookup."""
+        if hasattr(obj, 'state_is_correct'):
+            return obj.state_is_correct, bool(obj.state_is_saved)
         user = self.context['request'].user
-        return UserQuestionAttempt.objects.filter(
+        state = UserQuestionState.objects.filter(
             user=user, question=obj,
-        ).order_by('-attempted_at').first()
+        ).values_list('is_correct', 'is_saved').first()
+        return state if state else (None, False)
 
     def get_is_correct(self, obj):
-        a = self._attempt(obj)
-        return a.is_correct if a else None
+        return self._state(obj)[0]
 
     def get_is_saved(self, obj):
-        a = self._attempt(obj)
-        return a.is_saved if a else False
+        return self._state(obj)[1]
 
     def get_tags(self, obj):
         return {
@@ -76,31 +78,63 @@ class QuestionDetailSerializer(serializers.ModelSerializer):
                 opts.append({'key': key, 'text': text})
         return opts
 
+    def _user_state(self, obj):
+        if not hasattr(self, '_cached_state'):
+            user = self.context['request'].user
+            self._cached_state = UserQuestionState.objects.filter(
+                user=user, question=obj,
+            ).first()
+        return self._cached_state
+
     def get_is_saved(self, obj):
-        user = self.context['request'].user
-        return UserQuestionAttempt.objects.filter(
-            user=user, question=obj, is_saved=True,
-        ).exists()
+        state = self._user_state(obj)
+        return state.is_saved if state else False
 
     def get_user_attempt(self, obj):
-        user = self.context['request'].user
-        attempt = UserQuestionAttempt.objects.filter(
-            user=user, question=obj,
-        ).order_by('-attempted_at').first()
-        if not attempt:
+        state = self._user_state(obj)
+        if not state or not state.attempt_count:
             return None
         return {
-            'selected_answer': attempt.selected_answer,
-            'is_correct': attempt.is_correct,
-            'time_spent_seconds': attempt.time_spent_seconds,
-            'attempted_at': attempt.attempted_at,
+            'selected_answer': state.selected_answer,
+            'is_correct': state.is_correct,
+            'time_spent_seconds': state.last_time_spent_seconds,
+            'attempted_at': state.last_attempted_at,
         }
 
     def get_total_correct(self, obj):
-        return obj.attempts.filter(is_correct=True).count()
+        stats = getattr(obj, 'stats', None)
+        return stats.correct_count if stats else 0
 
     def get_total_incorrect(self, obj):
-        return obj.attempts.filter(is_correct=False).count()
+        stats = getattr(obj, 'stats', None)
+        return stats.incorrect_count if stats else 0
+
+
+# ─────────────────────────────────────────────
+# Quiz items (prefetched question bundle)
+# ─────────────────────────────────────────────
+class QuizQuestionSerializer(QuestionDetailSerializer):
+    """Question payload for quiz walking — stem, options and lab values only."""
+
+    class Meta:
+        model = Question
+        fields = [
+            'id', 'educational_objective', 'tags',
+            'question_text', 'question_image', 'lab_values',
+            'options',
+        ]
+
+
+class QuizItemSerializer(serializers.ModelSerializer):
+    question = QuizQuestionSerializer(read_only=True)
+    is_answered = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QuizItem
+        fields = ['position', 'is_answered', 'question']
+
+    def get_is_answered(self, obj):
+        return obj.answered_at is not None
 
 
 # ─────────────────────────────────────────────
@@ -112,6 +146,22 @@ class SubmitAnswerSerializer(serializers.Serializer):
     quiz_session_id = serializers.UUIDField(required=False, allow_null=True)
 
 
+class BatchAnswerSerializer(serializers.Serializer):
+    question_id = serializers.UUIDField()
+    selected_answer = serializers.ChoiceField(choices=['A', 'B', 'C', 'D', 'E'])
+    time_spent_seconds = serializers.IntegerField(min_value=0, default=0)
+
+
+class SubmitQuizAnswersSerializer(serializers.Serializer):
+    answers = BatchAnswerSerializer(many=True, allow_empty=False, max_length=200)
+
+    def validate_answers(self, value):
+        question_ids = [a['question_id'] for a in value]
+        if len(set(question_ids)) != len(question_ids):
+            raise serializers.ValidationError('Each question can only be answered once per request.')
+        return value
+
+
 # ─────────────────────────────────────────────
 # Quiz session
 # ─────────────────────────────────────────────
@@ -123,15 +173,14 @@ class QuizSessionSerializer(serializers.ModelSerializer):
         model = QuizSession
         fields = [
             'id', 'title', 'mode', 'total_questions',
-            'correct_count', 'progress_percentage',
-            'last_accessed', 'is_completed',
+            'answered_count', 'correct_count', 'progress_percentage',
+            'last_accessed', 'is_completed', 'final_score',
         ]
 
     def get_progress_percentage(self, obj):
         if obj.total_questions == 0:
             return 0
-        answered = obj.attempts.count()
-        return round((answered / obj.total_questions) * 100)
+        return round((obj.answered_count / obj.total_questions) * 100)
 
 
 class CreateQuizSerializer(serializers.Serializer):
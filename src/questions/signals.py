@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from questions import pool
+from questions.models import Question
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_pool(sender, **kwargs):
+    """Active question set changed — rebuild the quiz pool index lazily."""
+    pool.invalidate_pool()
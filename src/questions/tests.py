@@ -1,3 +1,209 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from books.models import Book, Specialty
+from questions import pool
+from questions.models import Question, QuizItem, QuizSession, UserQuestionState
+
+
+class QuestionFixtureMixin:
+    """A user and a small active question pool across two books."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='quiz@example.com', password='pass12345',
+        )
+        cls.book = Book.objects.create(
+            product_id='cardio', title='Cardiology', slug='cardiology',
+        )
+        cls.other_book = Book.objects.create(
+            product_id='nephro', title='Nephrology', slug='nephrology',
+        )
+        cls.specialty = Specialty.objects.create(
+            book=cls.book, name='Heart Failure', slug='heart-failure',
+        )
+        cls.other_specialty = Specialty.objects.create(
+            book=cls.other_book, name='Kidney Injury', slug='kidney-injury',
+        )
+        cls.questions = [
+            cls._question(cls.book, cls.specialty, n) for n in range(3)
+        ] + [
+            cls._question(cls.other_book, cls.other_specialty, n) for n in range(3, 5)
+        ]
+
+    @staticmethod
+    def _question(book, specialty, n):
+        return Question.objects.create(
+            book=book, specialty=specialty,
+            question_text=f'Question {n}?',
+            option_a='A', option_b='B', option_c='C', option_d='D',
+            correct_answer='A',
+        )
+
+
+class SampleQuestionsTests(QuestionFixtureMixin, TestCase):
+    """pool.sample_questions applies the custom quiz builder filters."""
+
+    def setUp(self):
+        # Fresh pool / user versions so no index from another test is reused
+        cache.clear()
+
+    def _sample(self, **filters):
+        return set(pool.sample_questions(self.user.id, 50, **filters))
+
+    def _attempt(self, question, is_correct):
+        with self.captureOnCommitCallbacks(execute=True):
+            UserQuestionState.record_attempt(
+                self.user.id, question.id,
+                selected_answer='A' if is_correct else 'B',
+                is_correct=is_correct,
+                time_spent_seconds=10,
+                attempted_at=question.created_at,
+            )
+
+    def test_all_active_questions(self):
+        inactive = self.questions[0]
+        Question.objects.filter(pk=inactive.pk).update(is_active=False)
+        self.assertEqual(self._sample(), {q.id for q in self.questions[1:]})
+
+    def test_count_limits_sample(self):
+        picked = pool.sample_questions(self.user.id, 2)
+        self.assertEqual(len(picked), 2)
+        self.assertEqual(len(set(picked)), 2)
+
+    def test_specialty_and_book_filters(self):
+        self.assertEqual(
+            self._sample(specialty_ids=[self.specialty.id]),
+            {q.id for q in self.questions[:3]},
+        )
+        self.assertEqual(
+            self._sample(book_ids=[self.other_book.id]),
+            {q.id for q in self.questions[3:]},
+        )
+        self.assertEqual(
+            self._sample(specialty_ids=[self.specialty.id], book_ids=[self.other_book.id]),
+            set(),
+        )
+
+    def test_answer_status_filters(self):
+        correct, incorrect = self.questions[0], self.questions[3]
+        self._attempt(correct, True)
+        self._attempt(incorrect, False)
+
+        self.assertEqual(self._sample(answer_status='correct'), {correct.id})
+        self.assertEqual(self._sample(answer_status='incorrect'), {incorrect.id})
+        self.assertEqual(
+            self._sample(answer_status='unanswered'),
+            {q.id for q in self.questions} - {correct.id, incorrect.id},
+        )
+        self.assertEqual(
+            self._sample(answer_status='unanswered', specialty_ids=[self.specialty.id]),
+            {q.id for q in self.questions[1:3]},
+        )
+
+    def test_saved_only(self):
+        saved = self.questions[2]
+        with self.captureOnCommitCallbacks(execute=True):
+            UserQuestionState.toggle_saved(self.user.id, saved.id)
+        self.assertEqual(self._sample(saved_only=True), {saved.id})
+        self.assertEqual(
+            self._sample(saved_only=True, book_ids=[self.other_book.id]), set(),
+        )
+
+
+class QuizSessionCounterTests(QuestionFixtureMixin, TestCase):
+    """Session counters only move on first answers and finalize once complete."""
+
+    def test_create_with_questions_writes_ordered_items(self):
+        ids = [q.id for q in self.questions[:3]]
+        session = QuizSession.create_with_questions(
+            self.user, ids, specialty_ids=[self.specialty.id],
+        )
+        self.assertEqual(session.total_questions, 3)
+        self.assertEqual(
+            list(session.items.order_by('position').values_list('question_id', flat=True)),
+            ids,
+        )
+        self.assertEqual(list(session.specialties.all()), [self.specialty])
+
+    def test_record_answers_finalizes_when_all_answered(self):
+        session = QuizSession.create_with_questions(
+            self.user, [q.id for q in self.questions[:2]],
+        )
+        QuizSession.record_answers(session.id, answered=1, correct=1, time_seconds=10)
+        session.refresh_from_db()
+        self.assertEqual((session.answered_count, session.correct_count), (1, 1))
+        self.assertFalse(session.is_completed)
+
+        QuizSession.record_answers(session.id, answered=1, correct=0, time_seconds=5)
+        session.refresh_from_db()
+        self.assertEqual(session.total_time_seconds, 15)
+        self.assertTrue(session.is_completed)
+        self.assertEqual(session.final_score, 50)
+
+    def test_finalize_is_idempotent(self):
+        session = QuizSession.create_with_questions(
+            self.user, [q.id for q in self.questions[:4]],
+        )
+        QuizSession.record_answers(session.id, answered=1, correct=1, time_seconds=0)
+        self.assertTrue(session.finalize())
+        self.assertTrue(session.is_completed)
+        self.assertEqual(session.final_score, 100)
+        completed_at = session.completed_at
+
+        self.assertFalse(session.finalize())
+        self.assertEqual(session.completed_at, completed_at)
+
+
+class SubmitAnswerSessionTests(QuestionFixtureMixin, TestCase):
+    """POST .../answer/ with a quiz_session_id moves the session counters."""
+
+    def setUp(self):
+        settings.ALLOWED_HOSTS.append('testserver')
+        self.addCleanup(settings.ALLOWED_HOSTS.remove, 'testserver')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _answer(self, session, question, answer):
+        return self.client.post(
+            f'/api/v1/question-bank/questions/{question.id}/answer/',
+            {'selected_answer': answer, 'quiz_session_id': str(session.id)},
+            format='json',
+        )
+
+    def test_only_first_answer_to_an_item_counts(self):
+        first, second = self.questions[:2]
+        session = QuizSession.create_with_questions(self.user, [first.id, second.id])
+
+        self._answer(session, first, 'A')
+        self._answer(session, first, 'B')
+        session.refresh_from_db()
+        self.assertEqual((session.answered_count, session.correct_count), (1, 1))
+
+        self._answer(session, second, 'B')
+        session.refresh_from_db()
+        self.assertEqual((session.answered_count, session.correct_count), (2, 1))
+        self.assertTrue(session.is_completed)
+        self.assertEqual(session.final_score, 50)
+
+    def test_legacy_session_without_items(self):
+        # Sessions created before quiz items existed have no QuizItem rows
+        first, second = self.questions[:2]
+        session = QuizSession.objects.create(user=self.user, total_questions=2)
+        self.assertFalse(QuizItem.objects.filter(session=session).exists())
+
+        self.assertEqual(self._answer(session, first, 'A').status_code, 200)
+        self._answer(session, first, 'A')
+        session.refresh_from_db()
+        self.assertEqual((session.answered_count, session.correct_count), (1, 1))
+        self.assertFalse(session.is_completed)
+
+        self._answer(session, second, 'C')
+        session.refresh_from_db()
+        self.assertEqual((session.answered_count, session.correct_count), (2, 1))
+        self.assertTrue(session.is_completed)
+        self.assertEqual(session.final_score, 50)
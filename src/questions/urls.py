@@ -9,6 +9,9 @@ from .views import (
     CustomQuizListView,
     CreateCustomQuizView,
     DeleteCustomQuizView,
+    FinalizeQuizView,
+    QuizNextQuestionsView,
+    SubmitQuizAnswersView,
     QuestionDetailView,
     SubmitAnswerView,
     ShuffleQuestionsView,
@@ -25,6 +28,9 @@ urlpatterns = [
     path('question-bank/custom-quizzes/', CustomQuizListView.as_view(), name='custom-quizzes'),
     path('question-bank/custom-quizzes/create/', CreateCustomQuizView.as_view(), name='create-quiz'),
     path('question-bank/custom-quizzes/<uuid:quiz_id>/', DeleteCustomQuizView.as_view(), name='delete-quiz'),
+    path('question-bank/custom-quizzes/<uuid:quiz_id>/next/', QuizNextQuestionsView.as_view(), name='quiz-next'),
+    path('question-bank/custom-quizzes/<uuid:quiz_id>/finalize/', FinalizeQuizView.as_view(), name='quiz-finalize'),
+    path('question-bank/custom-quizzes/<uuid:quiz_id>/answers/', SubmitQuizAnswersView.as_view(), name='quiz-submit-answers'),
     path('question-bank/questions/<uuid:question_id>/', QuestionDetailView.as_view(), name='question-detail'),
     path('question-bank/questions/<uuid:question_id>/answer/', SubmitAnswerView.as_view(), name='submit-answer'),
     path('question-bank/shuffle/', ShuffleQuestionsView.as_view(), name='shuffle'),
@@ -1,22 +1,52 @@
-import random
+import uuid
 
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Count, F, FilteredRelation, Q
 from django.utils import timezone
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from books.models import Book, UserBookAccess
-from questions.models import Question, UserQuestionAttempt, QuizSession
+from certificates import accrual, issuing
+from certificates.models import UserCOREProgress
+from core import background
+from learning.events import study_activity
+from questions import bank_stats, pool
+from questions.models import (
+    Question, UserQuestionAttempt, QuizSession, QuizItem, QuestionStats,
+    UserQuestionState,
+)
 from .serializers import (
     QuestionRowSerializer,
     QuestionDetailSerializer,
     SubmitAnswerSerializer,
+    SubmitQuizAnswersSerializer,
     QuizSessionSerializer,
     CreateQuizSerializer,
+    QuizItemSerializer,
 )
 
 
+# ─────────────────────────────────────────────
+# Helper: join the user's latest question state
+# ─────────────────────────────────────────────
+def _with_user_state(queryset, user):
+    """
+    LEFT JOIN the user's UserQuestionState onto a Question queryset.
+    Filters can use `user_state__…` predicates and QuestionRowSerializer
+    reads the annotated `state_is_correct` / `state_is_saved` columns.
+    """
+    return queryset.alias(
+        user_state=FilteredRelation(
+            'user_states', condition=Q(user_states__user=user),
+        ),
+    ).annotate(
+        state_is_correct=F('user_state__is_correct'),
+        state_is_saved=F('user_state__is_saved'),
+    )
+
+
 # ═════════════════════════════════════════════
 # 6.1  Question Bank Main Page
 # ═════════════════════════════════════════════
@@ -26,29 +56,20 @@ class QuestionBankMainView(APIView):
     def get(self, request):
         user = request.user
 
-        # Stats
-        total_attempts = UserQuestionAttempt.objects.filter(user=user)
-        answered_ids = total_attempts.values('question').distinct().count()
-        total_q = Question.objects.filter(is_active=True).count()
+        # Per-book totals and the user's answer counts (cached, grouped)
+        summaries = bank_stats.book_summaries(user.id)
+        total_q = sum(book['total'] for book in summaries.values())
+        answered_ids = sum(book['answered'] for book in summaries.values())
         pct = round((answered_ids / total_q) * 100) if total_q else 0
 
-        recent_10 = QuizSession.objects.filter(
-            user=user, is_completed=True,
-        ).order_by('-completed_at')[:10]
-        scores = []
-        for s in recent_10:
-            t = s.attempts.count()
-            c = s.attempts.filter(is_correct=True).count()
-            if t > 0:
-                scores.append(round((c / t) * 100))
-        avg_score = round(sum(scores) / len(scores)) if scores else 0
-
-        quiz_completed = QuizSession.objects.filter(
-            user=user, is_completed=True
-        ).count()
-        quiz_started = QuizSession.objects.filter(
-            user=user, is_completed=False
-        ).count()
+        avg_score = QuizSession.recent_average_score(user)
+
+        quiz_counts = QuizSession.objects.filter(user=user).aggregate(
+            completed=Count('id', filter=Q(is_completed=True)),
+            started=Count('id', filter=Q(is_completed=False)),
+        )
+        quiz_completed = quiz_counts['completed']
+        quiz_started = quiz_counts['started']
 
         # Question sets by book
         owned_ids = UserBookAccess.objects.filter(
@@ -57,12 +78,9 @@ class QuestionBankMainView(APIView):
         books = Book.objects.filter(id__in=owned_ids)
         question_sets = []
         for book in books:
-            total = Question.objects.filter(
-                specialty__book=book, is_active=True,
-            ).count()
-            answered = UserQuestionAttempt.objects.filter(
-                user=user, question__specialty__book=book,
-            ).values('question').distinct().count()
+            summary = summaries.get(book.id)
+            total = summary['total'] if summary else 0
+            answered = summary['answered'] if summary else 0
             question_sets.append({
                 'id': str(book.id),
                 'book_title': book.title,
@@ -104,23 +122,19 @@ class QuestionSetDetailView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        questions = Question.objects.filter(
-            specialty__book=book, is_active=True
-        )
-        total = questions.count()
-        attempts = UserQuestionAttempt.objects.filter(
-            user=request.user, question__specialty__book=book,
-        )
-        answered = attempts.values('question').distinct().count()
-        correct = attempts.filter(is_correct=True).values('question').distinct().count()
-        incorrect = attempts.filter(is_correct=False).values('question').distinct().count()
+        summary = bank_stats.book_summaries(request.user.id).get(book.id)
+        total = summary['total'] if summary else 0
+        answered = summary['answered'] if summary else 0
+        correct = summary['correct'] if summary else 0
+        incorrect = summary['incorrect'] if summary else 0
 
         # Recent answers
-        recent_ids = (
-            attempts.order_by('-attempted_at')
-            .values_list('question_id', flat=True)[:10]
+        recent_qs = (
+            _with_user_state(Question.objects.filter(specialty__book=book), request.user)
+            .filter(user_state__attempt_count__gt=0)
+            .select_related('specialty')
+            .order_by('-user_state__last_attempted_at')[:10]
         )
-        recent_qs = Question.objects.filter(id__in=recent_ids)
 
         return Response({
             'book_title': book.title,
@@ -144,12 +158,9 @@ class AnsweredQuestionsView(generics.ListAPIView):
     serializer_class = QuestionRowSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        answered_ids = UserQuestionAttempt.objects.filter(
-            user=user,
-        ).values_list('question_id', flat=True).distinct()
-
-        qs = Question.objects.filter(id__in=answered_ids)
+        qs = _with_user_state(
+            Question.objects.select_related('specialty'), self.request.user,
+        ).filter(user_state__attempt_count__gt=0)
 
         # Optional filters
         specialty = self.request.query_params.get('specialty')
@@ -159,15 +170,9 @@ class AnsweredQuestionsView(generics.ListAPIView):
             qs = qs.filter(specialty_id=specialty)
 
         if answer_status == 'correct':
-            correct_ids = UserQuestionAttempt.objects.filter(
-                user=user, is_correct=True,
-            ).values_list('question_id', flat=True)
-            qs = qs.filter(id__in=correct_ids)
+            qs = qs.filter(user_state__is_correct=True)
         elif answer_status == 'incorrect':
-            incorrect_ids = UserQuestionAttempt.objects.filter(
-                user=user, is_correct=False,
-            ).values_list('question_id', flat=True)
-            qs = qs.filter(id__in=incorrect_ids)
+            qs = qs.filter(user_state__is_correct=False)
 
         return qs
 
@@ -181,12 +186,9 @@ class SavedQuestionsView(generics.ListAPIView):
     serializer_class = QuestionRowSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        saved_ids = UserQuestionAttempt.objects.filter(
-            user=user, is_saved=True,
-        ).values_list('question_id', flat=True).distinct()
-
-        qs = Question.objects.filter(id__in=saved_ids)
+        qs = _with_user_state(
+            Question.objects.select_related('specialty'), self.request.user,
+        ).filter(user_state__is_saved=True)
 
         specialty = self.request.query_params.get('specialty')
         if specialty:
@@ -202,24 +204,15 @@ class ToggleSaveQuestionView(APIView):
     """POST /api/v1/question-bank/questions/{question_id}/toggle-save/"""
 
     def post(self, request, question_id):
-        attempt = UserQuestionAttempt.objects.filter(
-            user=request.user, question_id=question_id,
-        ).order_by('-attempted_at').first()
-
-        if attempt:
-            attempt.is_saved = not attempt.is_saved
-            attempt.save(update_fields=['is_saved'])
-            return Response({'is_saved': attempt.is_saved})
-
-        # No attempt yet — create a placeholder
-        question = Question.objects.filter(id=question_id).first()
-        if not question:
+        if not Question.objects.filter(id=question_id).exists():
             return Response(
                 {'detail': 'Question not found.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        return Response({'is_saved': False})
+        # Unanswered questions can be saved too — the state row is created on demand
+        is_saved = UserQuestionState.toggle_saved(request.user.id, question_id)
+        return Response({'is_saved': is_saved})
 
 
 # ═════════════════════════════════════════════
@@ -260,53 +253,26 @@ class CreateCustomQuizView(APIView):
             d['mode'] = QuizSession.Mode.RETRY_INCORRECT
             d['answer_status'] = 'incorrect'
 
-        # Build question pool
-        pool = Question.objects.filter(is_active=True)
-
-        if d.get('content_areas'):
-            pool = pool.filter(specialty_id__in=d['content_areas'])
+        # Select questions from the in-memory pool index
+        selected = pool.sample_questions(
+            request.user.id,
+            d['number_of_questions'],
+            specialty_ids=d.get('content_areas'),
+            answer_status=d.get('answer_status', 'all'),
+            saved_only=d.get('include_saved', False),
+        )
+        num = len(selected)
 
-        user = request.user
-        if d.get('answer_status') == 'incorrect':
-            incorrect_ids = UserQuestionAttempt.objects.filter(
-                user=user, is_correct=False,
-            ).values_list('question_id', flat=True).distinct()
-            pool = pool.filter(id__in=incorrect_ids)
-        elif d.get('answer_status') == 'correct':
-            correct_ids = UserQuestionAttempt.objects.filter(
-                user=user, is_correct=True,
-            ).values_list('question_id', flat=True).distinct()
-            pool = pool.filter(id__in=correct_ids)
-        elif d.get('answer_status') == 'unanswered':
-            answered_ids = UserQuestionAttempt.objects.filter(
-                user=user,
-            ).values_list('question_id', flat=True).distinct()
-            pool = pool.exclude(id__in=answered_ids)
-
-        if d.get('include_saved'):
-            saved_ids = UserQuestionAttempt.objects.filter(
-                user=user, is_saved=True,
-            ).values_list('question_id', flat=True).distinct()
-            pool = pool.filter(id__in=saved_ids)
-
-        # Select questions
-        all_ids = list(pool.values_list('id', flat=True))
-        num = min(d['number_of_questions'], len(all_ids))
-        selected = random.sample(all_ids, num) if all_ids else []
-
-        # Create session
-        session = QuizSession.objects.create(
-            user=user,
+        # Create session with its ordered quiz items
+        session = QuizSession.create_with_questions(
+            request.user, selected,
+            specialty_ids=d.get('content_areas'),
             title=d.get('title', ''),
             mode=d['mode'],
-            total_questions=num,
             time_limit_per_question=d.get('time_limit_per_question'),
             show_explanations=d.get('show_explanations', True),
         )
 
-        if d.get('content_areas'):
-            session.specialties.set(d['content_areas'])
-
         first_id = selected[0] if selected else None
 
         return Response({
@@ -315,6 +281,7 @@ class CreateCustomQuizView(APIView):
             'mode': session.mode,
             'total_questions': num,
             'first_question_id': str(first_id) if first_id else None,
+            'question_ids': [str(qid) for qid in selected],
         }, status=status.HTTP_201_CREATED)
 
 
@@ -330,6 +297,105 @@ class DeleteCustomQuizView(generics.DestroyAPIView):
         return QuizSession.objects.filter(user=self.request.user)
 
 
+# ═════════════════════════════════════════════
+# 6.8a  Finalize Custom Quiz
+# ═════════════════════════════════════════════
+class FinalizeQuizView(APIView):
+    """
+    POST /api/v1/question-bank/custom-quizzes/{quiz_id}/finalize/
+
+    Completes the quiz and stores its score (correct / answered).
+    Quizzes are finalized automatically once every question is answered;
+    this endpoint ends a quiz early. Calling it again returns the stored result.
+    """
+
+    def post(self, request, quiz_id):
+        session = QuizSession.objects.filter(
+            id=quiz_id, user=request.user,
+        ).first()
+        if not session:
+            return Response(
+                {'detail': 'Quiz not found.'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if not session.is_completed and session.answered_count == 0:
+            return Response(
+                {'detail': 'Answer at least one question before finishing the quiz.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        session.finalize()
+
+        return Response({
+            'id': str(session.id),
+            'is_completed': session.is_completed,
+            'completed_at': session.completed_at,
+            'total_questions': session.total_questions,
+            'answered_count': session.answered_count,
+            'correct_count': session.correct_count,
+            'total_time_seconds': session.total_time_seconds,
+            'score_percentage': session.final_score,
+        })
+
+
+# ═════════════════════════════════════════════
+# 6.8b  Quiz Items (next K questions)
+# ═════════════════════════════════════════════
+class QuizNextQuestionsView(APIView):
+    """
+    GET /api/v1/question-bank/custom-quizzes/{quiz_id}/next/?count=5&after=0
+
+    Returns the next `count` question payloads of a quiz in one response.
+    Without `after`, starts at the first unanswered item; with `after`,
+    returns the items following that position (for prefetching ahead).
+    """
+
+    DEFAULT_COUNT = 5
+    MAX_COUNT = 50
+
+    def get(self, request, quiz_id):
+        session = QuizSession.objects.filter(
+            id=quiz_id, user=request.user,
+        ).first()
+        if not session:
+            return Response(
+                {'detail': 'Quiz not found.'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        try:
+            count = int(request.query_params.get('count', self.DEFAULT_COUNT))
+            after = request.query_params.get('after')
+            after = int(after) if after is not None else None
+        except ValueError:
+            return Response(
+                {'detail': 'count and after must be integers.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        count = max(1, min(count, self.MAX_COUNT))
+
+        items = QuizItem.objects.filter(session=session)
+        if after is None:
+            items = items.filter(answered_at__isnull=True)
+        else:
+            items = items.filter(position__gt=after)
+
+        # Fetch one extra row to know whether more items follow
+        page = list(
+            items.select_related('question__specialty')
+            .order_by('position')[:count + 1]
+        )
+
+        return Response({
+            'quiz_session_id': str(session.id),
+            'total_questions': session.total_questions,
+            'items': QuizItemSerializer(
+                page[:count], many=True, context={'request': request},
+            ).data,
+            'has_more': len(page) > count,
+        })
+
+
 # ═════════════════════════════════════════════
 # 6.9  Get Full Question
 # ═════════════════════════════════════════════
@@ -340,7 +406,7 @@ class QuestionDetailView(generics.RetrieveAPIView):
     lookup_url_kwarg = 'question_id'
 
     def get_queryset(self):
-        return Question.objects.filter(is_active=True).select_related('specialty')
+        return Question.objects.filter(is_active=True).select_related('specialty', 'stats')
 
 
 # ═════════════════════════════════════════════
@@ -365,36 +431,69 @@ class SubmitAnswerView(APIView):
 
         is_correct = d['selected_answer'] == question.correct_answer
 
-        # Create attempt
-        attempt = UserQuestionAttempt.objects.create(
-            user=request.user,
-            question=question,
-            selected_answer=d['selected_answer'],
-            is_correct=is_correct,
-            time_spent_seconds=d['time_spent_seconds'],
-            quiz_session_id=d.get('quiz_session_id'),
-        )
-
-        # Update quiz session stats if applicable
         session = None
         if d.get('quiz_session_id'):
-            try:
-                session = QuizSession.objects.get(
-                    id=d['quiz_session_id'], user=request.user,
+            session = QuizSession.objects.filter(
+                id=d['quiz_session_id'], user=request.user,
+            ).first()
+
+        # Create attempt and update the per-question aggregate together
+        with transaction.atomic():
+            attempt = UserQuestionAttempt.objects.create(
+                user=request.user,
+                question=question,
+                selected_answer=d['selected_answer'],
+                is_correct=is_correct,
+                time_spent_seconds=d['time_spent_seconds'],
+                quiz_session=session,
+            )
+            QuestionStats.record(question.id, d['selected_answer'], is_correct)
+            previous = UserQuestionState.record_attempt(
+                request.user.id, question.id,
+                selected_answer=attempt.selected_answer,
+                is_correct=is_correct,
+                time_spent_seconds=attempt.time_spent_seconds,
+                attempted_at=attempt.attempted_at,
+            )
+            if question.specialty.is_core_specialty:
+                badge_completed = UserCOREProgress.record_answers(
+                    request.user.id,
+                    [(question.specialty_id, is_correct, previous)],
+                    answered_at=attempt.attempted_at,
                 )
-                if is_correct:
-                    session.correct_count += 1
-                session.total_time_seconds += d['time_spent_seconds']
-                session.save(update_fields=['correct_count', 'total_time_seconds'])
-            except QuizSession.DoesNotExist:
-                pass
-
-        # Peer stats (percentage per option)
-        total_attempts = question.attempts.count()
-        peer_stats = {}
-        for key in ['A', 'B', 'C', 'D', 'E']:
-            count = question.attempts.filter(selected_answer=key).count()
-            peer_stats[key] = round((count / total_attempts) * 100) if total_attempts else 0
+                if badge_completed:
+                    background.run_after_commit(
+                        issuing.issue_core_certificate, request.user.id,
+                    )
+            if is_correct:
+                background.run_after_commit(
+                    accrual.accrue_for_user, request.user.id,
+                    question_ids=[question.id],
+                )
+
+            # Update quiz session counters; only the first answer to a
+            # quiz item counts towards the score
+            if session:
+                first_answer = QuizItem.objects.filter(
+                    session=session, question=question, answered_at__isnull=True,
+                ).update(answered_at=attempt.attempted_at)
+                if not first_answer and not QuizItem.objects.filter(session=session).exists():
+                    # Sessions started before quiz items existed have none:
+                    # count the first attempt at the question in the session
+                    first_answer = int(not UserQuestionAttempt.objects.filter(
+                        quiz_session=session, question=question,
+                    ).exclude(pk=attempt.pk).exists())
+                QuizSession.record_answers(
+                    session.id,
+                    answered=first_answer,
+                    correct=first_answer if is_correct else 0,
+                    time_seconds=attempt.time_spent_seconds,
+                )
+        study_activity(request.user, attempt.attempted_at, questions_answered=1)
+
+        # Peer stats (percentage per option) from the denormalized aggregate
+        stats = QuestionStats.objects.get(question_id=question.id)
+        peer_stats = stats.peer_stats()
 
         # Related syllabus content
         related_syllabus = []
@@ -415,13 +514,139 @@ class SubmitAnswerView(APIView):
             'key_point': question.key_point,
             'references': question.references or [],
             'related_syllabus': related_syllabus,
-            'total_correct': question.attempts.filter(is_correct=True).count(),
-            'total_incorrect': question.attempts.filter(is_correct=False).count(),
+            'total_correct': stats.correct_count,
+            'total_incorrect': stats.incorrect_count,
         }
 
         return Response(response_data)
 
 
+# ═════════════════════════════════════════════
+# 6.10b  Submit Quiz Answers (Batch)
+# ═════════════════════════════════════════════
+class SubmitQuizAnswersView(APIView):
+    """
+    POST /api/v1/question-bank/custom-quizzes/{quiz_id}/answers/
+
+    Records many answers of a quiz at once (e.g. the end of an exam-mode
+    quiz, or chunks of it). Answers are validated against the quiz items;
+    items that were already answered are skipped, so retrying a chunk is
+    safe. Everything is written in one transaction.
+    """
+
+    def post(self, request, quiz_id):
+        session = QuizSession.objects.filter(
+            id=quiz_id, user=request.user,
+        ).first()
+        if not session:
+            return Response(
+                {'detail': 'Quiz not found.'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        serializer = SubmitQuizAnswersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answers = {
+            a['question_id']: a for a in serializer.validated_data['answers']
+        }
+
+        with transaction.atomic():
+            items = {
+                item.question_id: item
+                for item in QuizItem.objects.select_for_update(of=('self',))
+                .filter(session=session, question_id__in=answers)
+                .select_related('question__specialty')
+            }
+            unknown = [str(qid) for qid in answers if qid not in items]
+            if unknown:
+                return Response(
+                    {'detail': 'Some questions are not part of this quiz.',
+                     'question_ids': unknown},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            pending = sorted(
+                (item for item in items.values() if item.answered_at is None),
+                key=lambda item: item.position,
+            )
+            attempts = UserQuestionAttempt.objects.bulk_create([
+                UserQuestionAttempt(
+                    user=request.user,
+                    question_id=item.question_id,
+                    selected_answer=answers[item.question_id]['selected_answer'],
+                    is_correct=(
+                        answers[item.question_id]['selected_answer']
+                        == item.question.correct_answer
+                    ),
+                    time_spent_seconds=answers[item.question_id]['time_spent_seconds'],
+                    quiz_session=session,
+                )
+                for item in pending
+            ])
+
+            for item, attempt in zip(pending, attempts):
+                item.answered_at = attempt.attempted_at
+            QuizItem.objects.bulk_update(pending, ['answered_at'])
+
+            QuestionStats.record_many(
+                (a.question_id, a.selected_answer, a.is_correct) for a in attempts
+            )
+            previous = UserQuestionState.record_attempts(request.user.id, attempts)
+            badge_completed = UserCOREProgress.record_answers(
+                request.user.id,
+                [
+                    (item.question.specialty_id, attempt.is_correct,
+                     previous[attempt.question_id])
+                    for item, attempt in zip(pending, attempts)
+                    if item.question.specialty.is_core_specialty
+                ],
+                answered_at=attempts[0].attempted_at if attempts else None,
+            )
+            if badge_completed:
+                background.run_after_commit(
+                    issuing.issue_core_certificate, request.user.id,
+                )
+
+            correct = sum(1 for a in attempts if a.is_correct)
+            if correct:
+                background.run_after_commit(
+                    accrual.accrue_for_user, request.user.id,
+                    question_ids=[a.question_id for a in attempts if a.is_correct],
+                )
+            if attempts:
+                QuizSession.record_answers(
+                    session.id,
+                    answered=len(attempts),
+                    correct=correct,
+                    time_seconds=sum(a.time_spent_seconds for a in attempts),
+                )
+        if attempts:
+            study_activity(
+                request.user, attempts[0].attempted_at,
+                questions_answered=len(attempts),
+            )
+
+        return Response({
+            'quiz_session_id': str(session.id),
+            'submitted': len(attempts),
+            'correct': correct,
+            'skipped': [
+                str(item.question_id) for item in items.values()
+                if item not in pending
+            ],
+            'scorecard': [
+                {
+                    'position': item.position,
+                    'question_id': str(item.question_id),
+                    'selected_answer': attempt.selected_answer,
+                    'correct_answer': item.question.correct_answer,
+                    'is_correct': attempt.is_correct,
+                }
+                for item, attempt in zip(pending, attempts)
+            ],
+        })
+
+
 # ═════════════════════════════════════════════
 # 6.11  Shuffle (Random Practice)
 # ═════════════════════════════════════════════
@@ -429,33 +654,36 @@ class ShuffleQuestionsView(APIView):
     """POST /api/v1/question-bank/shuffle/"""
 
     def post(self, request):
-        book_id = request.data.get('book_id')
-        specialty_id = request.data.get('specialty_id')
-
-        pool = Question.objects.filter(is_active=True)
-        if book_id:
-            pool = pool.filter(specialty__book_id=book_id)
-        if specialty_id:
-            pool = pool.filter(specialty_id=specialty_id)
+        try:
+            book_id = request.data.get('book_id')
+            book_ids = [uuid.UUID(str(book_id))] if book_id else None
+            specialty_id = request.data.get('specialty_id')
+            specialty_ids = [uuid.UUID(str(specialty_id))] if specialty_id else None
+        except ValueError:
+            return Response(
+                {'detail': 'book_id and specialty_id must be valid UUIDs.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        all_ids = list(pool.values_list('id', flat=True))
-        if not all_ids:
+        selected = pool.sample_questions(
+            request.user.id, 50,
+            specialty_ids=specialty_ids,
+            book_ids=book_ids,
+        )
+        if not selected:
             return Response(
                 {'detail': 'No questions available.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        num = min(50, len(all_ids))
-        selected = random.sample(all_ids, num)
-
-        session = QuizSession.objects.create(
-            user=request.user,
+        session = QuizSession.create_with_questions(
+            request.user, selected,
             title='Random Practice',
             mode=QuizSession.Mode.PRACTICE,
-            total_questions=num,
         )
 
         return Response({
             'quiz_session_id': str(session.id),
             'first_question_id': str(selected[0]),
+            'question_ids': [str(qid) for qid in selected],
         })
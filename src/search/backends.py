@@ -0,0 +1,139 @@
+"""
+Full-text index over SearchEntry (title + body), per database vendor.
+
+  postgresql — a generated tsvector column (title weighted above body)
+               with a GIN index; ranked with ts_rank_cd().
+  sqlite     — an external-content FTS5 table kept in sync with the entry
+               table by triggers; ranked with bm25().
+  other      — no index: icontains over the plain text (development only).
+
+install() is run by the search migrations. On SQLite a migration that
+rebuilds search_searchentry (most AlterField / RemoveField operations)
+drops the triggers: such a migration must call uninstall() / install()
+again and then rebuild the index (rebuild_search_index).
+
+A query is reduced to at most MAX_TERMS words; every word must match and
+the last one also matches as a prefix, so results follow typing.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+TABLE = 'search_searchentry'
+FTS_TABLE = 'search_searchentry_fts'
+TEXT_CONFIG = 'english'
+MAX_TERMS = 8
+
+_WORD = re.compile(r'\w+')
+
+INSTALL = {
+    'postgresql': [
+        f"""
+        ALTER TABLE {TABLE} ADD COLUMN document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('{TEXT_CONFIG}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{TEXT_CONFIG}', coalesce(body, '')), 'B')
+        ) STORED
+        """,
+        f'CREATE INDEX {TABLE}_document_gin ON {TABLE} USING GIN (document)',
+    ],
+    'sqlite': [
+        f"""
+        CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+            title, body, content='{TABLE}', content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER {TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END
+        """,
+        f"""
+        CREATE TRIGGER {TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body)
+            VALUES ('delete', old.id, old.title, old.body);
+        END
+        """,
+        f"""
+        CREATE TRIGGER {TABLE}_au AFTER UPDATE OF title, body ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body)
+            VALUES ('delete', old.id, old.title, old.body);
+            INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END
+        """,
+        # Index rows that already exist
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+    ],
+}
+
+UNINSTALL = {
+    'postgresql': [
+        f'DROP INDEX IF EXISTS {TABLE}_document_gin',
+        f'ALTER TABLE {TABLE} DROP COLUMN IF EXISTS document',
+    ],
+    'sqlite': [
+        f'DROP TRIGGER IF EXISTS {TABLE}_ai',
+        f'DROP TRIGGER IF EXISTS {TABLE}_ad',
+        f'DROP TRIGGER IF EXISTS {TABLE}_au',
+        f'DROP TABLE IF EXISTS {FTS_TABLE}',
+    ],
+}
+
+
+def install(apps, schema_editor):
+    for sql in INSTALL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def uninstall(apps, schema_editor):
+    for sql in UNINSTALL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def terms(query):
+    """The words of a user query, lowercased, at most MAX_TERMS."""
+    return _WORD.findall((query or '').lower())[:MAX_TERMS]
+
+
+def search(query, entries, limit=20):
+    """
+    Match `query` against `entries` (a SearchEntry queryset, already
+    filtered to what the user may see). Returns [(entry_id, score)], best
+    first; higher scores are better. Cost follows the number of index
+    matches, not the size of the table.
+    """
+    words = terms(query)
+    if not words:
+        return []
+    scope_sql, scope_params = entries.values('id').query.sql_with_params()
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(words[:-1] + [f'{words[-1]}:*'])
+        sql = f"""
+            SELECT id, ts_rank_cd(document, query) AS score
+            FROM {TABLE}, to_tsquery('{TEXT_CONFIG}', %s) query
+            WHERE document @@ query AND id IN ({scope_sql})
+            ORDER BY score DESC, id
+            LIMIT %s
+        """
+        params = [tsquery, *scope_params, limit]
+    elif connection.vendor == 'sqlite':
+        match = ' '.join([f'"{w}"' for w in words[:-1]] + [f'"{words[-1]}"*'])
+        # bm25() is lower-is-better; title matches weigh 4x body matches
+        sql = f"""
+            SELECT rowid, -bm25({FTS_TABLE}, 4.0, 1.0) AS score
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s AND rowid IN ({scope_sql})
+            ORDER BY score DESC, rowid
+            LIMIT %s
+        """
+        params = [match, *scope_params, limit]
+    else:
+        for word in words:
+            entries = entries.filter(Q(title__icontains=word) | Q(body__icontains=word))
+        return [(pk, 0.0) for pk in entries.values_list('id', flat=True)[:limit]]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(pk, float(score)) for pk, score in cursor.fetchall()]
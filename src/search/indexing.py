@@ -0,0 +1,162 @@
+"""
+Build SearchEntry rows from topics, book pages, questions and flashcards.
+
+Single objects are (re)indexed by search/signals.py when they are saved;
+book pages when PDF ingestion finishes. Bulk writes that bypass save()
+(seeding, imports) are picked up by: python manage.py rebuild_search_index
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from books.models import BookPage, Topic
+from core.text import plain_text
+from flashcards.models import Flashcard
+from questions.models import Question
+from search.models import SearchEntry
+
+Kind = SearchEntry.Kind
+BATCH_SIZE = 500
+TITLE_LENGTH = 200
+
+
+def _title(text):
+    return text if len(text) <= TITLE_LENGTH else text[:TITLE_LENGTH - 1].rstrip() + '…'
+
+
+# ─────────────────────────────────────────────
+# Entry builders — None means "not searchable"
+# ─────────────────────────────────────────────
+def topic_entry(topic):
+    specialty = topic.specialty
+    return SearchEntry(
+        kind=Kind.TOPIC, object_id=str(topic.pk),
+        book_id=specialty.book_id, topic_id=topic.pk,
+        title=topic.title,
+        body=plain_text(specialty.name, *(topic.key_points or [])),
+    )
+
+
+def question_entry(question):
+    if not question.is_active:
+        return None
+    return SearchEntry(
+        kind=Kind.QUESTION, object_id=str(question.pk),
+        book_id=question.book_id or question.specialty.book_id,
+        topic_id=question.topic_id or question.related_topic_id,
+        title=_title(plain_text(question.question_text)),
+        body=question.search_text or question.build_search_text(),
+    )
+
+
+def flashcard_entry(card):
+    if not card.is_active:
+        return None
+    return SearchEntry(
+        kind=Kind.FLASHCARD, object_id=str(card.pk),
+        book_id=card.book_id or card.specialty.book_id,
+        topic_id=card.topic_id or card.related_topic_id,
+        title=_title(plain_text(card.front_text)),
+        body=card.search_text or card.build_search_text(),
+    )
+
+
+def page_entry(page):
+    # No title: the hit is shown under the topic covering the page
+    return SearchEntry(
+        kind=Kind.PAGE, object_id=f'{page.book_id}:{page.page_number}',
+        book_id=page.book_id, page_number=page.page_number,
+        body=page.text,
+    )
+
+
+BUILDERS = {
+    Topic: (Kind.TOPIC, topic_entry),
+    Question: (Kind.QUESTION, question_entry),
+    Flashcard: (Kind.FLASHCARD, flashcard_entry),
+}
+
+
+# ─────────────────────────────────────────────
+# Incremental updates
+# ─────────────────────────────────────────────
+def index_object(obj):
+    """Create, update or remove the entry of a topic, question or flashcard."""
+    kind, build = BUILDERS[type(obj)]
+    entry = build(obj)
+    existing = SearchEntry.objects.filter(kind=kind, object_id=str(obj.pk))
+    if entry is None:
+        existing.delete()
+        return
+    fields = {
+        'book_id': entry.book_id, 'topic_id': entry.topic_id,
+        'title': entry.title, 'body': entry.body, 'updated_at': timezone.now(),
+    }
+    if existing.update(**fields):
+        return
+    try:
+        with transaction.atomic():
+            entry.save()
+    except IntegrityError:
+        existing.update(**fields)
+
+
+def unindex_object(obj):
+    kind, _ = BUILDERS[type(obj)]
+    SearchEntry.objects.filter(kind=kind, object_id=str(obj.pk)).delete()
+
+
+def index_book_pages(book_id):
+    """Replace the page entries of a book with its ingested page text."""
+    pages = BookPage.objects.filter(book_id=book_id).exclude(text='')
+    with transaction.atomic():
+        SearchEntry.objects.filter(book_id=book_id, kind=Kind.PAGE).delete()
+        return _bulk_create(page_entry(page) for page in pages.iterator(chunk_size=BATCH_SIZE))
+
+
+# ─────────────────────────────────────────────
+# Full rebuild
+# ─────────────────────────────────────────────
+def _bulk_create(entries):
+    count = 0
+    batch = []
+    for entry in entries:
+        if entry is None:
+            continue
+        batch.append(entry)
+        if len(batch) >= BATCH_SIZE:
+            SearchEntry.objects.bulk_create(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        SearchEntry.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+def rebuild(book_ids=None):
+    """Re-create all entries (of the given books). Returns {kind: count}."""
+    topics = Topic.objects.select_related('specialty')
+    questions = Question.objects.select_related('specialty').filter(is_active=True)
+    cards = Flashcard.objects.select_related('specialty').filter(is_active=True)
+    pages = BookPage.objects.exclude(text='')
+    entries = SearchEntry.objects.all()
+    if book_ids is not None:
+        topics = topics.filter(specialty__book_id__in=book_ids)
+        questions = questions.filter(
+            Q(book_id__in=book_ids) | Q(book__isnull=True, specialty__book_id__in=book_ids)
+        )
+        cards = cards.filter(
+            Q(book_id__in=book_ids) | Q(book__isnull=True, specialty__book_id__in=book_ids)
+        )
+        pages = pages.filter(book_id__in=book_ids)
+        entries = entries.filter(book_id__in=book_ids)
+
+    with transaction.atomic():
+        entries.delete()
+        return {
+            Kind.TOPIC: _bulk_create(map(topic_entry, topics.iterator(chunk_size=BATCH_SIZE))),
+            Kind.PAGE: _bulk_create(map(page_entry, pages.iterator(chunk_size=BATCH_SIZE))),
+            Kind.QUESTION: _bulk_create(map(question_entry, questions.iterator(chunk_size=BATCH_SIZE))),
+            Kind.FLASHCARD: _bulk_create(map(flashcard_entry, cards.iterator(chunk_size=BATCH_SIZE))),
+        }
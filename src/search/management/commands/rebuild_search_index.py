@@ -0,0 +1,59 @@
+"""
+Rebuild the search index: plain text of questions/flashcards, then all entries.
+Usage: python manage.py rebuild_search_index [--book slug]
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from books.models import Book
+from flashcards.models import Flashcard
+from questions.models import Question
+from search import indexing
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Recompute search text and re-create the search index (e.g. after bulk imports)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--book',
+            help="Only rebuild entries of the book with this slug.",
+        )
+
+    def handle(self, *args, **options):
+        book_ids = None
+        if options['book']:
+            book_ids = list(Book.objects.filter(slug=options['book']).values_list('id', flat=True))
+            if not book_ids:
+                raise CommandError(f"No book with slug {options['book']}.")
+
+        for model in (Question, Flashcard):
+            changed = self._refresh_search_text(model)
+            self.stdout.write(f"  {model._meta.verbose_name_plural}: {changed} search texts updated")
+
+        counts = indexing.rebuild(book_ids)
+        for kind, count in counts.items():
+            self.stdout.write(f"  {kind.label}: {count} entries")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Search index rebuilt with {sum(counts.values())} entries."
+        ))
+
+    def _refresh_search_text(self, model):
+        """Bulk writes skip save(); fill in search_text where it is out of date."""
+        changed = 0
+        batch = []
+        for obj in model.objects.only('pk', 'search_text', *model.SEARCH_FIELDS).iterator(chunk_size=BATCH_SIZE):
+            text = obj.build_search_text()
+            if text != obj.search_text:
+                obj.search_text = text
+                batch.append(obj)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ['search_text'])
+                changed += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['search_text'])
+            changed += len(batch)
+        return changed
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.2 on 2026-10-17 17:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from search import backends
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('books', '0007_book_ingestion'),
+        ('flashcards', '0004_flashcard_search_text'),
+        ('questions', '0008_question_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('topic', 'Topic'), ('page', 'Book Page'), ('question', 'Question'), ('flashcard', 'Flashcard')], max_length=10)),
+                ('object_id', models.CharField(help_text='Primary key of the indexed object ("<book id>:<page>" for pages).', max_length=64)),
+                ('page_number', models.PositiveIntegerField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, max_length=500)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='books.book')),
+                ('topic', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='search_entries', to='books.topic')),
+            ],
+            options={
+                'verbose_name': 'Search Entry',
+                'verbose_name_plural': 'Search Entries',
+                'indexes': [models.Index(fields=['book', 'kind'], name='search_sear_book_id_50a24c_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        # Full-text index for the database in use (tsvector + GIN / FTS5)
+        migrations.RunPython(backends.install, backends.uninstall),
+    ]
@@ -0,0 +1,45 @@
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    One searchable document: a topic, a page of a book PDF, a question or a
+    flashcard, reduced to plain text. Kept in sync by search/signals.py.
+
+    The inverted index over title/body is created by the migration for the
+    database in use (search/backends.py): a GIN-indexed tsvector column on
+    PostgreSQL, an FTS5 table on SQLite. Neither is visible to the ORM.
+    Uses an integer key: FTS5 addresses rows by rowid.
+    """
+
+    class Kind(models.TextChoices):
+        TOPIC = 'topic', 'Topic'
+        PAGE = 'page', 'Book Page'
+        QUESTION = 'question', 'Question'
+        FLASHCARD = 'flashcard', 'Flashcard'
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    object_id = models.CharField(
+        max_length=64,
+        help_text='Primary key of the indexed object ("<book id>:<page>" for pages).',
+    )
+    book = models.ForeignKey(
+        'books.Book', on_delete=models.CASCADE, related_name='search_entries',
+    )
+    topic = models.ForeignKey(
+        'books.Topic', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='search_entries',
+    )
+    page_number = models.PositiveIntegerField(null=True, blank=True)
+    title = models.CharField(max_length=500, blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Search Entry'
+        verbose_name_plural = 'Search Entries'
+        unique_together = ['kind', 'object_id']
+        indexes = [models.Index(fields=['book', 'kind'])]
+
+    def __str__(self):
+        return f'{self.get_kind_display()}: {self.title[:80]}'
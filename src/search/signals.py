@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from books.ingestion import pdf_ingested
+from books.models import Book, Topic
+from flashcards.models import Flashcard
+from questions.models import Question
+from search import indexing
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_save, sender=Question)
+@receiver(post_save, sender=Flashcard)
+def index_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    indexing.index_object(instance)
+
+
+@receiver(post_delete, sender=Topic)
+@receiver(post_delete, sender=Question)
+@receiver(post_delete, sender=Flashcard)
+def unindex_on_delete(sender, instance, **kwargs):
+    indexing.unindex_object(instance)
+
+
+@receiver(pdf_ingested, sender=Book)
+def index_book_pages(sender, book_id, **kwargs):
+    indexing.index_book_pages(book_id)
@@ -0,0 +1,125 @@
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from books.models import Book, Specialty, Topic, UserBookAccess
+from questions.models import Question
+from search.models import SearchEntry
+
+
+class SearchFixtureMixin:
+    """A user owning one of two books, each with a topic and a question."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='search@example.com', password='pass12345',
+        )
+        cls.book = Book.objects.create(product_id='cardio', title='Cardiology', slug='cardiology')
+        cls.other_book = Book.objects.create(product_id='nephro', title='Nephrology', slug='nephrology')
+        UserBookAccess.objects.create(user=cls.user, book=cls.book)
+
+        specialty = Specialty.objects.create(book=cls.book, name='Valves', slug='valves')
+        cls.topic = Topic.objects.create(
+            specialty=specialty, title='Aortic Stenosis', slug='aortic-stenosis',
+        )
+        cls.question = cls._question(
+            specialty, '<p>Which murmur is typical of <b>aortic</b> regurgitation?</p>',
+        )
+        other_specialty = Specialty.objects.create(
+            book=cls.other_book, name='Vessels', slug='vessels',
+        )
+        cls._question(other_specialty, 'Which aortic finding suggests renal artery stenosis?')
+
+    @staticmethod
+    def _question(specialty, text):
+        return Question.objects.create(
+            book=specialty.book, specialty=specialty, question_text=text,
+            option_a='A', option_b='B', option_c='C', option_d='D',
+            correct_answer='A',
+        )
+
+    def setUp(self):
+        settings.ALLOWED_HOSTS.append('testserver')
+        self.addCleanup(settings.ALLOWED_HOSTS.remove, 'testserver')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _search(self, **params):
+        response = self.client.get('/api/v1/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return {(r['type'], r['id']) for r in response.data['results']}
+
+
+class SearchViewTests(SearchFixtureMixin, TestCase):
+    """Saved content is indexed and found, limited to the user's books."""
+
+    def test_finds_topics_and_questions_of_owned_books(self):
+        self.assertEqual(self._search(q='aortic'), {
+            ('topic', str(self.topic.id)),
+            ('question', str(self.question.id)),
+        })
+
+    def test_last_word_matches_as_prefix(self):
+        self.assertEqual(
+            self._search(q='aortic regurg', type='question'),
+            {('question', str(self.question.id))},
+        )
+
+    def test_type_filter(self):
+        self.assertEqual(
+            self._search(q='aortic', type='topic'), {('topic', str(self.topic.id))},
+        )
+
+    def test_updates_and_deletes_follow_the_index(self):
+        self.topic.title = 'Mitral Stenosis'
+        self.topic.save()
+        self.assertEqual(self._search(q='mitral'), {('topic', str(self.topic.id))})
+        self.assertNotIn(('topic', str(self.topic.id)), self._search(q='aortic'))
+
+        self.question.delete()
+        self.assertEqual(self._search(q='regurgitation'), set())
+
+    def test_short_query_is_rejected(self):
+        response = self.client.get('/api/v1/search/', {'q': 'a'})
+        self.assertEqual(response.status_code, 400)
+
+
+class RebuildSearchIndexTests(SearchFixtureMixin, TestCase):
+    """rebuild_search_index picks up rows written without save()."""
+
+    def _rebuild(self, *args):
+        out = StringIO()
+        call_command('rebuild_search_index', *args, stdout=out)
+        return out.getvalue()
+
+    def test_indexes_bulk_created_questions(self):
+        bulk = Question.objects.bulk_create([Question(
+            book=self.book, specialty=self.question.specialty,
+            question_text='Which valve lesion causes pulsus parvus et tardus?',
+            option_a='A', option_b='B', option_c='C', option_d='D',
+            correct_answer='A',
+        )])[0]
+        self.assertEqual(self._search(q='pulsus'), set())
+
+        output = self._rebuild()
+        self.assertIn('Search index rebuilt', output)
+        bulk.refresh_from_db()
+        self.assertIn('pulsus', bulk.search_text)
+        self.assertEqual(self._search(q='pulsus'), {('question', str(bulk.id))})
+        # Existing entries are re-created, not duplicated
+        self.assertEqual(
+            SearchEntry.objects.filter(object_id=str(self.question.id)).count(), 1,
+        )
+
+    def test_book_option(self):
+        SearchEntry.objects.all().delete()
+        self._rebuild('--book', self.book.slug)
+        self.assertEqual(set(SearchEntry.objects.values_list('book_id', flat=True)), {self.book.id})
+
+        with self.assertRaises(CommandError):
+            self._rebuild('--book', 'missing')
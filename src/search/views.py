@@ -0,0 +1,130 @@
+import re
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from books.models import Topic, UserBookAccess
+from search import backends
+from search.models import SearchEntry
+
+Kind = SearchEntry.Kind
+
+# ?type= values → entry kinds; topic hits include the text of their PDF pages
+TYPES = {
+    'topic': (Kind.TOPIC, Kind.PAGE),
+    'question': (Kind.QUESTION,),
+    'flashcard': (Kind.FLASHCARD,),
+}
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+SNIPPET_LENGTH = 200
+
+
+# ─────────────────────────────────────────────
+# Helpers: snippets and page → topic
+# ─────────────────────────────────────────────
+def _snippet(text, words):
+    """About SNIPPET_LENGTH characters of `text` around the first matching word."""
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, words)) + ')', re.IGNORECASE)
+    match = pattern.search(text)
+    start = max(0, match.start() - SNIPPET_LENGTH // 4) if match else 0
+    if start:
+        space = text.find(' ', start)
+        start = space + 1 if 0 <= space < start + 20 else start
+    end = start + SNIPPET_LENGTH
+    if end < len(text):
+        space = text.rfind(' ', start, end)
+        end = space if space > start else end
+    return ('…' if start else '') + text[start:end] + ('…' if end < len(text) else '')
+
+
+def _topics_for_pages(entries):
+    """{(book_id, page): topic} — the narrowest topic whose page range covers each page."""
+    pages = {(e.book_id, e.page_number) for e in entries if e.kind == Kind.PAGE}
+    if not pages:
+        return {}
+    topics = Topic.objects.filter(
+        specialty__book_id__in={book_id for book_id, _ in pages},
+        start_page__gt=0, end_page__gt=0,
+    ).select_related('specialty')
+    covering = {}
+    for topic in topics:
+        for book_id, page in pages:
+            if book_id != topic.specialty.book_id or not topic.start_page <= page <= topic.end_page:
+                continue
+            best = covering.get((book_id, page))
+            if best is None or topic.page_count < best.page_count:
+                covering[(book_id, page)] = topic
+    return covering
+
+
+# ═════════════════════════════════════════════
+# 15.1  Search
+# ═════════════════════════════════════════════
+class SearchView(APIView):
+    """GET /api/v1/search/?q=…&type=topic,question,flashcard&book={slug}&limit=20"""
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        words = backends.terms(query)
+        if not words or len(''.join(words)) < 2:
+            return Response(
+                {'detail': 'Enter at least 2 characters to search.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        types = [t for t in request.query_params.get('type', '').split(',') if t]
+        if any(t not in TYPES for t in types):
+            return Response(
+                {'detail': f'type must be one of: {", ".join(TYPES)}.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            limit = DEFAULT_LIMIT
+
+        # Only content of books the user owns
+        owned_ids = UserBookAccess.objects.filter(
+            user=request.user,
+        ).values_list('book_id', flat=True)
+        entries = SearchEntry.objects.filter(book_id__in=owned_ids)
+        if request.query_params.get('book'):
+            entries = entries.filter(book__slug=request.query_params['book'])
+        if types:
+            entries = entries.filter(kind__in=[k for t in types for k in TYPES[t]])
+
+        hits = backends.search(query, entries, limit=limit)
+        by_id = SearchEntry.objects.select_related('book', 'topic').in_bulk(
+            [pk for pk, _ in hits]
+        )
+        found = [(by_id[pk], score) for pk, score in hits if pk in by_id]
+        page_topics = _topics_for_pages([entry for entry, _ in found])
+
+        results = []
+        for entry, score in found:
+            topic = entry.topic
+            if entry.kind == Kind.PAGE:
+                topic = page_topics.get((entry.book_id, entry.page_number))
+            results.append({
+                'type': entry.kind,
+                'id': entry.object_id,
+                'title': entry.title or (topic.title if topic else f'Page {entry.page_number}'),
+                'snippet': _snippet(entry.body, words),
+                'book_slug': entry.book.slug,
+                'book_title': entry.book.title,
+                'topic_slug': topic.slug if topic else None,
+                'topic_title': topic.title if topic else None,
+                'page': entry.page_number,
+                'score': round(score, 4),
+            })
+
+        return Response({
+            'query': query,
+            'terms': words,
+            'count': len(results),
+            'results': results,
+        })